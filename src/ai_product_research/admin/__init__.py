@@ -0,0 +1,5 @@
+from .admin_server import AdminServer
+from .loop_monitor import EventLoopMonitor
+from .profiler import SamplingProfiler
+
+__all__ = ["AdminServer", "EventLoopMonitor", "SamplingProfiler"]
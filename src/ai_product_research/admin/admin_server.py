@@ -0,0 +1,92 @@
+import asyncio
+import io
+import logging
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ai_product_research.admin.http import HttpRequest, HttpResponse, start_http_server
+from ai_product_research.admin.loop_monitor import EventLoopMonitor
+from ai_product_research.admin.profiler import SamplingProfiler
+
+log = logging.getLogger(__name__)
+
+MAX_PROFILE_SECONDS = 300.0
+
+
+def format_tasks() -> str:
+    """Current asyncio tasks of the running loop with their stacks."""
+    out = io.StringIO()
+    tasks = sorted(asyncio.all_tasks(), key=lambda task: task.get_name())
+    out.write(f"{len(tasks)} task(s)\n\n")
+    for task in tasks:
+        state = "done" if task.done() else "pending"
+        out.write(f"=== {task.get_name()} [{state}] {task.get_coro()!r}\n")
+        task.print_stack(file=out)
+        out.write("\n")
+    return out.getvalue()
+
+
+class AdminServer:
+    """Optional admin HTTP endpoint for looking inside a running process.
+
+    Routes:
+        GET /tasks: asyncio tasks and their stacks
+        GET /loop: event loop lag percentiles and slow callback reports
+        GET /profile?seconds=N: sampling profile of the loop thread in folded stack format
+        GET /metrics: metrics of the registered providers
+    """
+
+    def __init__(self, host: str, port: int, profile_dir: Path, monitor: EventLoopMonitor | None = None):
+        self.host = host
+        self.port = port
+        self.monitor = monitor or EventLoopMonitor()
+        self.profiler = SamplingProfiler(profile_dir)
+        self.metrics_providers: dict[str, Callable[[], Any]] = {}
+        self._server: asyncio.Server | None = None
+
+    def register_metrics(self, name: str, provider: Callable[[], Any]) -> None:
+        self.metrics_providers[name] = provider
+
+    async def start(self) -> None:
+        self.monitor.start()
+        self._server = await start_http_server(self.handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info(f"Admin server listening on http://{self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.monitor.stop()
+
+    async def handle(self, request: HttpRequest) -> HttpResponse:
+        if request.method != "GET":
+            return HttpResponse.text("Method not allowed", status=405)
+        if request.path == "/tasks":
+            return HttpResponse.text(format_tasks())
+        if request.path == "/loop":
+            return HttpResponse.json(self.monitor.report())
+        if request.path == "/profile":
+            return await self._profile(request)
+        if request.path == "/metrics":
+            return HttpResponse.json({name: provider() for name, provider in self.metrics_providers.items()})
+        return HttpResponse.text("Not found", status=404)
+
+    async def _profile(self, request: HttpRequest) -> HttpResponse:
+        try:
+            seconds = float(request.query_param("seconds", "10"))
+        except ValueError:
+            return HttpResponse.text("seconds must be a number", status=400)
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            return HttpResponse.text(f"seconds must be in (0, {MAX_PROFILE_SECONDS:g}]", status=400)
+
+        try:
+            # Sample from a worker thread so the loop keeps running the code being profiled
+            path = await asyncio.to_thread(self.profiler.profile, self.monitor.loop_thread_id, seconds)
+        except RuntimeError as e:
+            return HttpResponse.text(str(e), status=503)
+        log.info(f"Wrote {seconds:g}s profile to {path}")
+        response = HttpResponse.text(path.read_text(encoding="utf-8"))
+        response.headers["X-Profile-Path"] = str(path)
+        return response
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+log = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class RequestTooLargeError(ValueError):
+    """The request body is over ``MAX_BODY_SIZE``."""
+
+
+@dataclass
+class HttpRequest:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes = b""
+
+    def query_param(self, name: str, default: str | None = None) -> str | None:
+        values = self.query.get(name)
+        return values[0] if values else default
+
+    def json(self) -> Any:
+        return json.loads(self.body or b"null")
+
+
+@dataclass
+class HttpResponse:
+    status: int = 200
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def text(cls, text: str, status: int = 200) -> "HttpResponse":
+        return cls(status, text.encode("utf-8"), {"Content-Type": "text/plain; charset=utf-8"})
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200) -> "HttpResponse":
+        return cls(status, json.dumps(data, default=str).encode("utf-8"), {"Content-Type": "application/json"})
+
+
+Handler = Callable[[HttpRequest], Awaitable[HttpResponse]]
+
+
+async def _read_request(reader: asyncio.StreamReader) -> HttpRequest | None:
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    if length < 0:
+        raise ValueError(f"Invalid Content-Length: {length}")
+    if length > MAX_BODY_SIZE:
+        raise RequestTooLargeError("Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    return HttpRequest(method.upper(), url.path, parse_qs(url.query), headers, body)
+
+
+async def start_http_server(handler: Handler, host: str, port: int) -> asyncio.Server:
+    """Start a minimal HTTP/1.1 server answering one request per connection.
+
+    Args:
+        handler: Coroutine turning a request into a response
+        host: Interface to bind
+        port: Port to bind, 0 picks a free port
+
+    Returns:
+        The started server
+    """
+
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = await _read_request(reader)
+            except RequestTooLargeError as e:
+                request, response = None, HttpResponse.text(str(e), status=413)
+            except ValueError as e:
+                request, response = None, HttpResponse.text(f"Malformed request: {e}", status=400)
+            else:
+                if request is None:
+                    return
+                try:
+                    response = await handler(request)
+                except Exception as e:
+                    log.error(f"Error handling {request.method} {request.path}: {e}", exc_info=True)
+                    response = HttpResponse.text("Internal server error", status=500)
+
+            headers = {"Content-Length": str(len(response.body)), "Connection": "close", **response.headers}
+            head = f"HTTP/1.1 {response.status} {REASONS.get(response.status, '')}\r\n"
+            head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            writer.write(head.encode("latin-1") + b"\r\n" + response.body)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle_connection, host, port)
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class SlowCallbackReport:
+    detected_at: datetime
+    blocked_for: float
+    stack: list[str]
+
+
+class EventLoopMonitor:
+    """Measures event loop lag and reports callbacks that block the loop.
+
+    A task on the loop wakes up every ``interval`` seconds and records how late it woke up.
+    A watchdog thread checks the heartbeat that task leaves; when the loop hasn't come back
+    for ``slow_callback_threshold`` seconds it captures the stack of the loop thread, which
+    is the code blocking the loop at that moment.
+    """
+
+    def __init__(self, interval: float = 0.1, slow_callback_threshold: float = 0.5, window: int = 3000,
+                 max_reports: int = 50):
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self.lags: deque[float] = deque(maxlen=window)
+        self.slow_callbacks: deque[SlowCallbackReport] = deque(maxlen=max_reports)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def loop_thread_id(self) -> int | None:
+        return self._loop_thread_id
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._measure_lag(), name="event-loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _measure_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stopped.wait(self.slow_callback_threshold / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.slow_callback_threshold or heartbeat == reported_heartbeat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported_heartbeat = heartbeat
+            report = SlowCallbackReport(datetime.now(), blocked_for, traceback.format_stack(frame))
+            self.slow_callbacks.append(report)
+            log.warning(f"Event loop blocked for {blocked_for:.2f}s in:\n{''.join(report.stack[-5:])}")
+
+    def lag_percentiles(self) -> dict[str, Any]:
+        if not self.lags:
+            return {"samples": 0}
+        ordered = sorted(self.lags)
+        at = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {
+            "samples": len(ordered),
+            "p50": at(0.5),
+            "p95": at(0.95),
+            "p99": at(0.99),
+            "max": ordered[-1],
+        }
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "lag": self.lag_percentiles(),
+            "slow_callbacks": [
+                {"detected_at": report.detected_at, "blocked_for": report.blocked_for, "stack": report.stack}
+                for report in self.slow_callbacks
+            ],
+        }
@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _collapse(frame: FrameType) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame).replace(";", ","))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def sample_thread(thread_id: int, duration: float, interval: float = 0.005) -> Counter[str]:
+    """Sample the stack of a thread for ``duration`` seconds.
+
+    Args:
+        thread_id: Identifier of the sampled thread, usually the event loop thread
+        duration: Sampling time in seconds
+        interval: Time between samples in seconds
+
+    Returns:
+        Collapsed stacks (root first, frames separated by ``;``) with their sample counts
+    """
+    stacks: Counter[str] = Counter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        stacks[_collapse(frame)] += 1
+        del frame
+        time.sleep(interval)
+    return stacks
+
+
+def write_folded(stacks: Counter[str], directory: Path) -> Path:
+    """Write stacks in the folded format read by flamegraph.pl, inferno and speedscope."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"profile-{datetime.now():%Y%m%d-%H%M%S}.folded"
+    with path.open("w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    return path
+
+
+class SamplingProfiler:
+    """On-demand sampling profiler of the event loop thread, one profile at a time."""
+
+    def __init__(self, directory: Path, interval: float = 0.005):
+        self.directory = directory
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def profile(self, thread_id: int, duration: float) -> Path:
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already being recorded")
+        try:
+            return write_folded(sample_thread(thread_id, duration, self.interval), self.directory)
+        finally:
+            self._lock.release()
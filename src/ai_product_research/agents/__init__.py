@@ -1,4 +1,9 @@
+from .adaptive_limiter import AimdConcurrencyLimiter
+from .batch_llm import BatchLlmRunner, BatchRequest, LocalFileBatchProvider, OpenAIBatchProvider
+from .hedged_invoker import HedgedLlmInvoker
 from .problem_retriever_agent import ProblemRetrieverAgent, BusinessProblem
 from .product_filter_agent import ProductFilterAgent
 
-__all__ = ['ProblemRetrieverAgent', 'BusinessProblem', 'ProductFilterAgent']
+__all__ = ['ProblemRetrieverAgent', 'BusinessProblem', 'ProductFilterAgent', 'HedgedLlmInvoker',
+           'AimdConcurrencyLimiter', 'BatchLlmRunner', 'BatchRequest', 'OpenAIBatchProvider',
+           'LocalFileBatchProvider']
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+DURATION_PART_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: str) -> float | None:
+    """Parse OpenAI rate limit reset durations such as "20ms", "1s" or "6m0s" into seconds."""
+    parts = DURATION_PART_PATTERN.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+class AimdConcurrencyLimiter:
+    """Adaptive concurrency limit for calls to one provider, additive increase and
+    multiplicative decrease (AIMD) like TCP congestion control.
+
+    Every healthy call raises the limit by ``increase / limit``, about ``increase`` per
+    round of calls. Rate limit errors, timeouts and latency above ``latency_tolerance``
+    times the baseline cut it by ``decrease_factor``, at most once per ``cooldown`` so one
+    burst of concurrent failures counts once. Provider rate limit headers cap the limit to
+    the remaining requests and pause new calls until the window resets when exhausted.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4.0,
+        min_limit: float = 1.0,
+        max_limit: float = 32.0,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 5.0,
+        min_remaining_tokens_ratio: float = 0.05,
+        window: int = 100,
+    ):
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.min_remaining_tokens_ratio = min_remaining_tokens_ratio
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.pauses = 0
+        self.rate_limit_headers: dict[str, str] = {}
+        self.window = window
+        self._latencies: dict[str, deque[float]] = {}
+        self._last_decrease = -math.inf
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    def baseline_latency(self, kind: str) -> float | None:
+        """Lower quartile of recent latencies of a call kind, what it takes when the provider isn't loaded."""
+        latencies = self._latencies.get(kind)
+        if latencies is None or len(latencies) < 10:
+            return None
+        return sorted(latencies)[len(latencies) // 4]
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the ``limit`` concurrent call slots."""
+        async with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    # Waiting on the condition releases it, so finishing calls aren't held up
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), pause)
+                    except TimeoutError:
+                        pass
+                elif self.in_flight < max(1, math.floor(self.limit)):
+                    break
+                else:
+                    await self._condition.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float, kind: str = "llm") -> None:
+        """Signal a completed call, latency is compared with the baseline of calls of the same kind."""
+        baseline = self.baseline_latency(kind)
+        self._latencies.setdefault(kind, deque(maxlen=self.window)).append(latency)
+        if baseline is not None and latency > self.latency_tolerance * baseline:
+            self._decrease(f"{kind} latency {latency:.1f}s is over {self.latency_tolerance:g}x "
+                           f"baseline {baseline:.1f}s")
+            return
+        self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+        self.increases += 1
+
+    def on_overload(self, reason: str, retry_after: float | None = None) -> None:
+        """Signal a rate limit error or timeout, optionally pausing for the provider's retry-after."""
+        if retry_after is not None and retry_after > 0:
+            self._pause(retry_after)
+        self._decrease(reason)
+
+    def observe_rate_limits(self, headers: Mapping[str, str]) -> None:
+        """Respect ``x-ratelimit-*`` response headers of the provider."""
+        headers = {name.lower(): value for name, value in headers.items() if name.lower().startswith("x-ratelimit-")}
+        if not headers:
+            return
+        self.rate_limit_headers = headers
+        try:
+            remaining_requests = int(headers.get("x-ratelimit-remaining-requests", -1))
+            remaining_tokens = int(headers.get("x-ratelimit-remaining-tokens", -1))
+            limit_tokens = int(headers.get("x-ratelimit-limit-tokens", -1))
+        except ValueError:
+            log.warning(f"Unexpected rate limit headers: {headers}")
+            return
+
+        if remaining_requests >= 0:
+            self.limit = max(self.min_limit, min(self.limit, remaining_requests or self.min_limit))
+            if remaining_requests == 0:
+                self._pause(parse_reset_duration(headers.get("x-ratelimit-reset-requests", "1s")) or 1.0)
+        if 0 <= remaining_tokens < self.min_remaining_tokens_ratio * limit_tokens:
+            self._pause(parse_reset_duration(headers.get("x-ratelimit-reset-tokens", "1s")) or 1.0)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "baseline_latency": {kind: self.baseline_latency(kind) for kind in self._latencies},
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "pauses": self.pauses,
+            "paused_for": max(0.0, round(self._paused_until - time.monotonic(), 2)),
+            "rate_limit_headers": self.rate_limit_headers,
+        }
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self.decreases += 1
+        log.warning(f"Lowering LLM concurrency from {previous:.1f} to {self.limit:.1f}: {reason}")
+
+    def _pause(self, seconds: float) -> None:
+        paused_until = time.monotonic() + seconds
+        if paused_until > self._paused_until:
+            self._paused_until = paused_until
+            self.pauses += 1
+            log.warning(f"Pausing new LLM calls for {seconds:.1f}s to respect the provider rate limit")
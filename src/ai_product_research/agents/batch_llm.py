@@ -0,0 +1,326 @@
+import asyncio
+import json
+import logging
+import shutil
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from langchain_core.messages import BaseMessage, convert_to_messages, convert_to_openai_messages
+from pydantic import BaseModel, ValidationError
+
+log = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+# Batch job states after which nothing changes anymore
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+# Largest input file of an OpenAI batch job is 200 MB
+MAX_BATCH_FILE_BYTES = 200_000_000
+
+
+class BatchItemError(Exception):
+    """A request of a batch job got no valid answer."""
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    schema: type[BaseModel]
+    messages: list[BaseMessage]
+
+
+@dataclass
+class BatchJob:
+    id: str
+    status: str
+    requests: int = 0
+    completed: int = 0
+    failed: int = 0
+    # Provider reference of the results, e.g. an output file id
+    output: str | None = None
+    errors: str | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+class BatchLlmProvider(Protocol):
+    """Asynchronous batch API taking OpenAI batch JSONL files of chat completion requests."""
+    # Most requests and bytes one job's input file may hold
+    max_requests: int
+    max_bytes: int
+
+    def request_line(self, request: BatchRequest) -> dict[str, Any]: ...
+
+    async def submit(self, path: Path) -> BatchJob: ...
+
+    async def retrieve(self, job_id: str) -> BatchJob: ...
+
+    async def download(self, job: BatchJob) -> list[dict[str, Any]]: ...
+
+
+def chat_completion_line(request: BatchRequest, model: str, max_completion_tokens: int) -> dict[str, Any]:
+    """Batch JSONL line of a structured output chat completion request."""
+    return {
+        "custom_id": request.custom_id,
+        "method": "POST",
+        "url": CHAT_COMPLETIONS_ENDPOINT,
+        "body": {
+            "model": model,
+            "messages": convert_to_openai_messages(request.messages),
+            "max_completion_tokens": max_completion_tokens,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": request.schema.__name__, "schema": request.schema.model_json_schema()},
+            },
+        },
+    }
+
+
+class OpenAIBatchProvider:
+    """OpenAI Batch API: half the price of synchronous calls and a separate rate limit pool."""
+
+    def __init__(self, client: Any, model: str = "gpt-5-mini", max_completion_tokens: int = 4096,
+                 completion_window: str = "24h", max_requests: int = 50_000,
+                 max_bytes: int = MAX_BATCH_FILE_BYTES):
+        self.client = client
+        self.model = model
+        self.max_completion_tokens = max_completion_tokens
+        self.completion_window = completion_window
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+
+    def request_line(self, request: BatchRequest) -> dict[str, Any]:
+        return chat_completion_line(request, self.model, self.max_completion_tokens)
+
+    async def submit(self, path: Path) -> BatchJob:
+        file = await self.client.files.create(file=path, purpose="batch")
+        batch = await self.client.batches.create(input_file_id=file.id, endpoint=CHAT_COMPLETIONS_ENDPOINT,
+                                                 completion_window=self.completion_window)
+        return self._job(batch)
+
+    async def retrieve(self, job_id: str) -> BatchJob:
+        return self._job(await self.client.batches.retrieve(job_id))
+
+    async def download(self, job: BatchJob) -> list[dict[str, Any]]:
+        lines = []
+        for file_id in (job.output, job.errors):
+            if file_id is not None:
+                content = await self.client.files.content(file_id)
+                lines.extend(json.loads(line) for line in content.text.splitlines() if line)
+        return lines
+
+    @staticmethod
+    def _job(batch: Any) -> BatchJob:
+        counts = batch.request_counts
+        return BatchJob(
+            id=batch.id,
+            status=batch.status,
+            requests=counts.total if counts else 0,
+            completed=counts.completed if counts else 0,
+            failed=counts.failed if counts else 0,
+            output=batch.output_file_id,
+            errors=batch.error_file_id,
+        )
+
+
+class LocalFileBatchProvider:
+    """File based stand-in of a batch API answering with a local chat model.
+
+    Submitted JSONL files are copied under ``directory`` and answered with ``chat_model``
+    once ``completion_seconds`` passed, into output files in the OpenAI batch format.
+    """
+
+    def __init__(self, directory: Path, chat_model: Any, schemas: Iterable[type[BaseModel]],
+                 completion_seconds: float = 0.0, max_requests: int = 50_000,
+                 max_bytes: int = MAX_BATCH_FILE_BYTES, clock: Callable[[], float] = time.time):
+        self.directory = directory
+        self.chat_model = chat_model
+        self.schemas = {schema.__name__: schema for schema in schemas}
+        self.completion_seconds = completion_seconds
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.submitted = 0
+
+    def request_line(self, request: BatchRequest) -> dict[str, Any]:
+        return chat_completion_line(request, "local", 4096)
+
+    async def submit(self, path: Path) -> BatchJob:
+        job_dir = self.directory / f"batch_{uuid.uuid4().hex[:12]}"
+        job_dir.mkdir(parents=True)
+        shutil.copyfile(path, job_dir / "input.jsonl")
+        requests = sum(1 for line in path.read_text(encoding="utf-8").splitlines() if line)
+        job = BatchJob(job_dir.name, "in_progress", requests=requests)
+        self._write_state(job_dir, job, self.clock() + self.completion_seconds)
+        self.submitted += 1
+        return job
+
+    async def retrieve(self, job_id: str) -> BatchJob:
+        job_dir = self.directory / job_id
+        state = json.loads((job_dir / "job.json").read_text(encoding="utf-8"))
+        job = BatchJob(**state["job"])
+        if job.done or self.clock() < state["completes_at"]:
+            return job
+        with (job_dir / "input.jsonl").open(encoding="utf-8") as requests, \
+                (job_dir / "output.jsonl").open("w", encoding="utf-8") as output:
+            for line in requests:
+                if line.strip():
+                    result = await self._answer(json.loads(line))
+                    job.completed += result["error"] is None
+                    job.failed += result["error"] is not None
+                    output.write(json.dumps(result) + "\n")
+        job.status, job.output = "completed", "output.jsonl"
+        self._write_state(job_dir, job, state["completes_at"])
+        return job
+
+    async def download(self, job: BatchJob) -> list[dict[str, Any]]:
+        text = (self.directory / job.id / "output.jsonl").read_text(encoding="utf-8")
+        return [json.loads(line) for line in text.splitlines() if line]
+
+    async def _answer(self, line: dict[str, Any]) -> dict[str, Any]:
+        body = line["body"]
+        schema = self.schemas[body["response_format"]["json_schema"]["name"]]
+        try:
+            output = await self.chat_model.with_structured_output(schema).ainvoke(convert_to_messages(body["messages"]))
+        except Exception as e:
+            return {"custom_id": line["custom_id"], "response": None,
+                    "error": {"code": type(e).__name__, "message": str(e)}}
+        message = {"role": "assistant", "content": output.model_dump_json()}
+        return {"custom_id": line["custom_id"], "error": None,
+                "response": {"status_code": 200, "body": {"choices": [{"index": 0, "message": message}]}}}
+
+    @staticmethod
+    def _write_state(job_dir: Path, job: BatchJob, completes_at: float) -> None:
+        (job_dir / "job.json").write_text(json.dumps({"job": asdict(job), "completes_at": completes_at}),
+                                          encoding="utf-8")
+
+
+@dataclass
+class BatchJobFiles:
+    """Requests of one named batch, written to JSONL files as they are added.
+
+    A new file is started once the current one holds ``max_requests`` lines or the next line
+    would take it past ``max_bytes``; a single line larger than that still gets a file of its own.
+    """
+    name: str
+    directory: Path
+    max_requests: int
+    request_line: Callable[[BatchRequest], dict[str, Any]]
+    max_bytes: int = MAX_BATCH_FILE_BYTES
+    schemas: dict[str, type[BaseModel]] = field(default_factory=dict)
+    paths: list[Path] = field(default_factory=list)
+    _file: Any = field(default=None, init=False, repr=False)
+    _lines: int = field(default=0, init=False, repr=False)
+    _bytes: int = field(default=0, init=False, repr=False)
+
+    def add(self, request: BatchRequest) -> None:
+        if request.custom_id in self.schemas:
+            raise ValueError(f"Duplicate batch request id: {request.custom_id}")
+        line = (json.dumps(self.request_line(request)) + "\n").encode("utf-8")
+        if (self._file is None or self._lines >= self.max_requests
+                or (self._lines and self._bytes + len(line) > self.max_bytes)):
+            self._rotate()
+        self._file.write(line)
+        self._lines += 1
+        self._bytes += len(line)
+        self.schemas[request.custom_id] = request.schema
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self.close()
+        path = self.directory / f"{self.name}-{len(self.paths):03d}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.paths.append(path)
+        self._file = path.open("wb")
+        self._lines = 0
+        self._bytes = 0
+
+
+class BatchLlmRunner:
+    """Runs structured output requests as asynchronous batch jobs instead of one call each.
+
+    Requests are streamed into JSONL files split at the provider's job size and file size, submitted,
+    polled every ``poll_interval`` seconds and their answers validated against the schema
+    of each request. Submitted job ids are kept next to the files, so a restarted backfill
+    resumes polling the same jobs instead of paying for them twice.
+    """
+
+    def __init__(self, provider: BatchLlmProvider, directory: Path, poll_interval: float = 60.0,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.provider = provider
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.sleep = sleep
+
+    def new_batch(self, name: str) -> BatchJobFiles:
+        return BatchJobFiles(name, self.directory, self.provider.max_requests, self.provider.request_line,
+                             self.provider.max_bytes)
+
+    async def run(self, batch: BatchJobFiles) -> dict[str, BaseModel | BatchItemError]:
+        """Submit the batch, wait for its jobs and return the parsed answer of every request.
+
+        Returns:
+            Parsed output by custom id, or the BatchItemError of requests without a valid answer
+        """
+        batch.close()
+        if not batch.paths:
+            return {}
+        jobs = await self._submit(batch)
+        while True:
+            jobs = [job if job.done else await self.provider.retrieve(job.id) for job in jobs]
+            completed = sum(job.completed for job in jobs)
+            log.info(f"Batch {batch.name}: {completed}/{len(batch.schemas)} request(s) completed, job states "
+                     f"{[job.status for job in jobs]}")
+            if all(job.done for job in jobs):
+                break
+            await self.sleep(self.poll_interval)
+
+        results: dict[str, BaseModel | BatchItemError] = {}
+        for job in jobs:
+            if job.status != "completed":
+                log.error(f"Batch job {job.id} of {batch.name} ended {job.status}")
+            for line in await self.provider.download(job):
+                custom_id = line["custom_id"]
+                if custom_id in batch.schemas:
+                    results[custom_id] = self._parse(line, batch.schemas[custom_id])
+        for custom_id in batch.schemas.keys() - results.keys():
+            results[custom_id] = BatchItemError("No answer in the batch output")
+        (self.directory / f"{batch.name}.jobs.json").unlink(missing_ok=True)
+        return results
+
+    async def _submit(self, batch: BatchJobFiles) -> list[BatchJob]:
+        state_path = self.directory / f"{batch.name}.jobs.json"
+        jobs = []
+        if state_path.exists():
+            job_ids = json.loads(state_path.read_text(encoding="utf-8"))
+            log.info(f"Resuming {len(job_ids)} submitted job(s) of batch {batch.name}")
+            jobs = [await self.provider.retrieve(job_id) for job_id in job_ids]
+        # Files are submitted in order, a crash mid-way leaves the ones after the recorded jobs
+        for path in batch.paths[len(jobs):]:
+            jobs.append(await self.provider.submit(path))
+            # Written after each submission, a crash mid-way must not resubmit the earlier files
+            state_path.write_text(json.dumps([job.id for job in jobs]), encoding="utf-8")
+        log.info(f"Submitted batch {batch.name}: {len(batch.schemas)} request(s) in {len(jobs)} job(s)")
+        return jobs
+
+    @staticmethod
+    def _parse(line: dict[str, Any], schema: type[BaseModel]) -> BaseModel | BatchItemError:
+        if line.get("error"):
+            return BatchItemError(f"{line['error'].get('code')}: {line['error'].get('message')}")
+        response = line.get("response") or {}
+        if response.get("status_code") != 200:
+            return BatchItemError(f"HTTP {response.get('status_code')}: {response.get('body')}")
+        content = response["body"]["choices"][0]["message"].get("content")
+        try:
+            return schema.model_validate_json(content or "")
+        except ValidationError as e:
+            return BatchItemError(f"Invalid {schema.__name__}: {e}")
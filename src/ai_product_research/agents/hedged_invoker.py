@@ -0,0 +1,223 @@
+import asyncio
+import bisect
+import logging
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.runnables import Runnable
+from openai import APITimeoutError, RateLimitError
+
+from ai_product_research.agents.adaptive_limiter import AimdConcurrencyLimiter, parse_reset_duration
+from ai_product_research.deadlines import DeadlineExceededError, remaining
+
+log = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, math.inf)
+
+
+class StructuredOutputError(ValueError):
+    """Structured output that failed to parse or validate, with the raw model message kept for repairs."""
+
+    def __init__(self, error: Exception, raw: Any):
+        super().__init__(str(error))
+        self.error = error
+        self.raw = raw
+
+
+@dataclass
+class LatencyStats:
+    window: int
+    samples: deque[float] = field(init=False)
+    bucket_counts: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    timeouts: int = 0
+    errors: int = 0
+
+    def __post_init__(self):
+        self.samples = deque(maxlen=self.window)
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "histogram": {
+                ("+Inf" if math.isinf(bound) else f"{bound:g}"): count
+                for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts)
+            },
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": self.hedge_wins / self.hedges if self.hedges else None,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+class HedgedLlmInvoker:
+    """Runs ``ainvoke`` calls with a per-call deadline and a hedged duplicate for slow calls.
+
+    Once a call has been running longer than the observed latency percentile of its kind,
+    a duplicate request is sent; whichever finishes first wins and the other is cancelled.
+    Hedging starts only after ``min_samples`` calls of that kind have been observed.
+
+    With a ``limiter``, every request (hedges included) holds one of its concurrency slots
+    and reports its outcome to it. Structured output runnables built with ``include_raw=True``
+    are unwrapped to the parsed result, and their response headers are passed to the limiter;
+    output failing the schema raises ``StructuredOutputError`` holding the raw message.
+
+    Calls made inside a ``deadline_scope`` get no more than the time left in it.
+    """
+
+    def __init__(
+        self,
+        deadline: float = 120.0,
+        hedge_percentile: float = 0.95,
+        min_samples: int = 20,
+        min_hedge_delay: float = 1.0,
+        window: int = 500,
+        limiter: AimdConcurrencyLimiter | None = None,
+    ):
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.min_hedge_delay = min_hedge_delay
+        self.window = window
+        self.limiter = limiter
+        self._stats: dict[str, LatencyStats] = {}
+
+    def stats(self, name: str) -> LatencyStats:
+        if name not in self._stats:
+            self._stats[name] = LatencyStats(window=self.window)
+        return self._stats[name]
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Latency histograms and hedge-win rates per call kind."""
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def hedge_delay(self, name: str) -> float | None:
+        stats = self.stats(name)
+        if len(stats.samples) < self.min_samples:
+            return None
+        return max(self.min_hedge_delay, stats.percentile(self.hedge_percentile))
+
+    async def ainvoke(self, llm: Runnable, messages: Any, name: str = "llm", deadline: float | None = None) -> Any:
+        """Invoke ``llm`` with ``messages``, hedging slow calls and enforcing a deadline.
+
+        Args:
+            llm: Runnable to invoke
+            messages: Input passed to ``llm.ainvoke``
+            name: Kind of the call, latency is tracked separately per kind
+            deadline: Seconds the call may take, defaults to the invoker deadline
+
+        Returns:
+            Output of the first request to succeed
+
+        Raises:
+            TimeoutError: If no request finished before the deadline
+            StructuredOutputError: If the structured output failed to parse or validate
+            DeadlineExceededError: If the enclosing deadline scope has no time left for the call
+        """
+        stats = self.stats(name)
+        stats.requests += 1
+        budget = deadline if deadline is not None else self.deadline
+        left = remaining()
+        scoped = left is not None and left < budget
+        if scoped:
+            if left <= 0:
+                stats.timeouts += 1
+                raise DeadlineExceededError(f"No time left for LLM call {name}")
+            budget = left
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            async with asyncio.timeout(budget):
+                result = await self._race(llm, messages, name, stats)
+        except TimeoutError:
+            stats.timeouts += 1
+            # Running out of the run's or post's budget says nothing about the provider's load
+            if self.limiter is not None and not scoped:
+                self.limiter.on_overload(f"{name} call exceeded its deadline")
+            log.warning(f"LLM call {name} exceeded {'scoped ' if scoped else ''}deadline "
+                        f"after {loop.time() - started:.1f}s")
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        stats.observe(loop.time() - started)
+        return result
+
+    async def _race(self, llm: Runnable, messages: Any, name: str, stats: LatencyStats) -> Any:
+        primary = asyncio.ensure_future(self._request(llm, messages, name))
+        pending = {primary}
+        hedge = None
+        try:
+            hedge_delay = self.hedge_delay(name)
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+                if not done:
+                    log.info(f"LLM call {name} is slower than {hedge_delay:.1f}s, sending hedged request")
+                    hedge = asyncio.ensure_future(self._request(llm, messages, name))
+                    pending.add(hedge)
+                    stats.hedges += 1
+
+            first_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            losers = [task for task in (primary, hedge) if task is not None and not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    async def _request(self, llm: Runnable, messages: Any, name: str) -> Any:
+        if self.limiter is None:
+            return self._unwrap(await llm.ainvoke(messages))
+
+        async with self.limiter.slot():
+            started = asyncio.get_running_loop().time()
+            try:
+                result = await llm.ainvoke(messages)
+            except RateLimitError as e:
+                self.limiter.observe_rate_limits(e.response.headers)
+                self.limiter.on_overload(f"{name} call was rate limited",
+                                         parse_reset_duration(e.response.headers.get("retry-after", "")))
+                raise
+            except APITimeoutError:
+                self.limiter.on_overload(f"{name} request timed out")
+                raise
+            self.limiter.on_success(asyncio.get_running_loop().time() - started, name)
+        return self._unwrap(result)
+
+    def _unwrap(self, result: Any) -> Any:
+        if not isinstance(result, dict) or result.keys() != {"raw", "parsed", "parsing_error"}:
+            return result
+        headers = getattr(result["raw"], "response_metadata", {}).get("headers")
+        if headers and self.limiter is not None:
+            self.limiter.observe_rate_limits(headers)
+        if result["parsing_error"] is not None:
+            raise StructuredOutputError(result["parsing_error"], result["raw"]) from result["parsing_error"]
+        return result["parsed"]
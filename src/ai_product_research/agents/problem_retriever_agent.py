@@ -1,9 +1,14 @@
-from pydantic import BaseModel, Field
-from typing import Optional
-from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Optional
+from dataclasses import dataclass
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.language_models import BaseChatModel
+import json
 import logging
-import base64
+
+from ai_product_research.agents.batch_llm import BatchRequest
+from ai_product_research.agents.hedged_invoker import HedgedLlmInvoker, StructuredOutputError
+from ai_product_research.domain import ScrapedPage, Screenshot
 
 log = logging.getLogger(__name__)
 
@@ -40,6 +45,68 @@ Example 3 (Project management platform):
 - main_pain: Team members miss deadlines because visibility into task dependencies and blockers is poor.
 - success_metric: Deliver projects 30% faster with 50% fewer missed deadlines through improved visibility."""
 
+# Same instructions for pages whose server-rendered text was extracted instead of rendered
+TEXT_SYSTEM_PROMPT = SYSTEM_PROMPT.replace("from the screenshot", "from the website text")
+
+REPAIR_SYSTEM_PROMPT = """You correct a product analysis whose answer failed validation.
+Return the same analysis with fields primary_customer, core_job, main_pain and success_metric.
+Each field must be a non-empty text of at most 512 characters.
+Keep the meaning of the previous answer and change only what the validation errors require: fill in missing
+fields from the other fields and shorten long ones to their essence."""
+# Longest previous answer quoted in a repair prompt, an answer over the field limits is rarely longer
+MAX_REPAIR_ANSWER_CHARS = 8000
+MAX_REPAIR_ERRORS_CHARS = 2000
+
+
+@dataclass
+class RepairStats:
+    invalid_outputs: int = 0
+    repair_calls: int = 0
+    repaired: int = 0
+    full_retries: int = 0
+    full_retry_successes: int = 0
+    failures: int = 0
+    # Input tokens of the original requests that repairs avoided sending again
+    input_tokens_saved: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "invalid_outputs": self.invalid_outputs,
+            "repair_calls": self.repair_calls,
+            "repaired": self.repaired,
+            "repair_success_rate": self.repaired / self.invalid_outputs if self.invalid_outputs else None,
+            "full_retries": self.full_retries,
+            "full_retry_successes": self.full_retry_successes,
+            "failures": self.failures,
+            "input_tokens_saved": self.input_tokens_saved,
+        }
+
+
+def raw_answer(raw: Any) -> str:
+    """Text of a raw structured output message, the tool call arguments or the JSON content."""
+    tool_calls = getattr(raw, "tool_calls", None)
+    if tool_calls:
+        return json.dumps(tool_calls[0]["args"], ensure_ascii=False)
+    content = getattr(raw, "content", raw)
+    return content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+
+
+def validation_errors(error: StructuredOutputError) -> str:
+    cause = error.error
+    while cause is not None and not isinstance(cause, ValidationError):
+        cause = cause.__cause__
+    if cause is None:
+        return str(error)
+    return "\n".join(
+        f"- {'.'.join(map(str, item['loc'])) or 'answer'}: {item['msg']}" for item in cause.errors(include_url=False)
+    )
+
+
+def input_tokens(raw: Any) -> int:
+    usage = getattr(raw, "usage_metadata", None) or {}
+    return usage.get("input_tokens", 0)
+
+
 class BusinessProblem(BaseModel):
     primary_customer: str = Field(description="Primary customer of this business", max_length=512, min_length=1)
     core_job: str = Field(description="Core job of this business", max_length=512, min_length=1)
@@ -48,22 +115,104 @@ class BusinessProblem(BaseModel):
 
 
 class ProblemRetrieverAgent:
+    """Retrieves the business problem of a product from its website screenshot or text.
+
+    Answers failing ``BusinessProblem`` validation are repaired with up to ``repair_attempts``
+    short text-only prompts quoting the invalid answer and its validation errors, instead of
+    sending the screenshot or page again; only if those fail is the original request retried
+    once (``full_retry``). Repair outcomes are counted per call kind, see ``repair_metrics``.
+    """
+
+    def __init__(self, chat_model: BaseChatModel, invoker: HedgedLlmInvoker | None = None,
+                 repair_attempts: int = 2, full_retry: bool = True):
+        # With the default json_schema method the OpenAI client validates the answer itself and raises
+        # before an invalid answer reaches ``parsing_error``, tool calls keep it around for the repair
+        self.llm = chat_model.with_structured_output(BusinessProblem, method="function_calling", include_raw=True)
+        self.invoker = invoker or HedgedLlmInvoker()
+        self.repair_attempts = repair_attempts
+        self.full_retry = full_retry
+        self._repair_stats: dict[str, RepairStats] = {}
+
+    def repair_metrics(self) -> dict[str, dict[str, Any]]:
+        """Repair counts and success rates per call kind."""
+        return {name: stats.snapshot() for name, stats in self._repair_stats.items()}
+
+    async def retrieve_problem(self, website_screenshot: Screenshot | bytes) -> BusinessProblem | None:
+        messages = self.screenshot_messages(website_screenshot)
+
+        # Call LLM with structured output
+        log.info("Calling LLM to analyze screenshot")
+        result = await self._invoke(messages, name="problem_retriever")
+        log.info("Retrieved business problem", extra={"payload": result})
+
+        return result
+
+    async def retrieve_problem_from_text(self, page_text: str) -> BusinessProblem | None:
+        """Retrieve the business problem from a website's extracted text instead of a screenshot."""
+        messages = self.text_messages(page_text)
+
+        log.info("Calling LLM to analyze website text")
+        result = await self._invoke(messages, name="problem_retriever_text")
+        log.info("Retrieved business problem", extra={"payload": result})
 
-    def __init__(self, chat_model: BaseChatModel):
-        self.llm = chat_model.with_structured_output(BusinessProblem)
+        return result
 
-    async def retrieve_problem(self, website_screenshot: bytes) -> BusinessProblem | None:
-        # Encode screenshot to base64
-        screenshot_base64 = base64.standard_b64encode(website_screenshot).decode("utf-8")
+    async def _invoke(self, messages: list[BaseMessage], name: str) -> BusinessProblem:
+        try:
+            return await self.invoker.ainvoke(self.llm, messages, name=name)
+        except StructuredOutputError as e:
+            first_error = error = e
+        stats = self._repair_stats.setdefault(name, RepairStats())
+        stats.invalid_outputs += 1
+        log.warning(f"Invalid {name} answer, repairing it: {error}")
+
+        for attempt in range(self.repair_attempts):
+            stats.repair_calls += 1
+            try:
+                result = await self.invoker.ainvoke(self.llm, self.repair_messages(error), name=f"{name}_repair")
+            except StructuredOutputError as e:
+                # The next repair starts from the latest answer, it is usually closer
+                error = e
+                continue
+            stats.repaired += 1
+            stats.input_tokens_saved += input_tokens(first_error.raw)
+            log.info(f"Repaired {name} answer with {attempt + 1} text-only call(s)")
+            return result
+
+        if not self.full_retry:
+            stats.failures += 1
+            raise error
+        log.warning(f"Could not repair {name} answer in {self.repair_attempts} call(s), retrying the full request")
+        stats.full_retries += 1
+        try:
+            result = await self.invoker.ainvoke(self.llm, messages, name=name)
+        except StructuredOutputError:
+            stats.failures += 1
+            raise
+        stats.full_retry_successes += 1
+        return result
 
-        # Create messages
-        messages = [
+    def batch_request(self, custom_id: str, page: ScrapedPage) -> BatchRequest:
+        """Request of a batch job retrieving the business problem of a fetched page."""
+        messages = self.text_messages(page.text) if page.text is not None else self.screenshot_messages(page.screenshot)
+        return BatchRequest(custom_id, BusinessProblem, messages)
+
+    @staticmethod
+    def screenshot_messages(website_screenshot: Screenshot | bytes) -> list[BaseMessage]:
+        # Encode screenshot to a base64 data URL straight from the spooled file
+        if isinstance(website_screenshot, bytes):
+            with Screenshot.from_bytes(website_screenshot) as screenshot:
+                screenshot_url = screenshot.to_data_url()
+        else:
+            screenshot_url = website_screenshot.to_data_url()
+
+        return [
             SystemMessage(content=SYSTEM_PROMPT),
             HumanMessage(
                 content=[
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{screenshot_base64}"},
+                        "image_url": {"url": screenshot_url},
                     },
                     {
                         "type": "text",
@@ -73,10 +222,25 @@ class ProblemRetrieverAgent:
             )
         ]
 
-        # Call LLM with structured output
-        log.info("Calling LLM to analyze screenshot")
-        result = await self.llm.ainvoke(messages)
-        log.info("Retrieved business problem: %s", result)
-
-        return result
+    @staticmethod
+    def repair_messages(error: StructuredOutputError) -> list[BaseMessage]:
+        """Text-only request correcting an invalid answer, without the screenshot or page it came from."""
+        answer = raw_answer(error.raw)[:MAX_REPAIR_ANSWER_CHARS]
+        return [
+            SystemMessage(content=REPAIR_SYSTEM_PROMPT),
+            HumanMessage(
+                content=f"Previous answer:\n{answer}\n\n"
+                        f"Validation errors:\n{validation_errors(error)[:MAX_REPAIR_ERRORS_CHARS]}\n\n"
+                        "Return the corrected analysis.",
+            ),
+        ]
 
+    @staticmethod
+    def text_messages(page_text: str) -> list[BaseMessage]:
+        return [
+            SystemMessage(content=TEXT_SYSTEM_PROMPT),
+            HumanMessage(
+                content="Analyze this website text and identify the primary customer, core job they're trying to "
+                        f"accomplish, main pain point, and success metric for this business.\n\n{page_text}",
+            ),
+        ]
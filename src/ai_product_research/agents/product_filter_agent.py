@@ -1,8 +1,9 @@
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import SystemMessage, HumanMessage
-from pydantic import BaseModel, Field
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
 
-from ai_product_research.domain import AnalyzedProduct
+from ai_product_research.agents.batch_llm import BatchRequest
+from ai_product_research.agents.hedged_invoker import HedgedLlmInvoker
+from ai_product_research.domain import AnalyzedProduct, FilterResult
 
 SYSTEM_PROMPT = """You are a product manager who specializes in filtering AI-powered software products.
 
@@ -61,20 +62,25 @@ Return the final passed value.
 """
 
 
-class FilterResult(BaseModel):
-    passed: bool = Field(description="True if provided product matches requirements, otherwise False")
-    reason: str = Field(
-        description="Brief explanation of why the product passed or failed (1-2 sentences explaining which requirements were met or not met)")
-
-
 class ProductFilterAgent:
-    def __init__(self, chat_model: BaseChatModel):
-        self.llm = chat_model.with_structured_output(FilterResult)
+    def __init__(self, chat_model: BaseChatModel, invoker: HedgedLlmInvoker | None = None):
+        self.llm = chat_model.with_structured_output(FilterResult, include_raw=True)
+        self.invoker = invoker or HedgedLlmInvoker()
 
     async def filter_product(self, product: AnalyzedProduct) -> bool:
-        messages = [
+        result = await self.evaluate_product(product)
+        return result.passed
+
+    async def evaluate_product(self, product: AnalyzedProduct) -> FilterResult:
+        return await self.invoker.ainvoke(self.llm, self.messages(product), name="product_filter")
+
+    def batch_request(self, custom_id: str, product: AnalyzedProduct) -> BatchRequest:
+        """Request of a batch job evaluating a product."""
+        return BatchRequest(custom_id, FilterResult, self.messages(product))
+
+    @staticmethod
+    def messages(product: AnalyzedProduct) -> list[BaseMessage]:
+        return [
             SystemMessage(content=SYSTEM_PROMPT),
             HumanMessage(content=product.model_dump_json())
         ]
-        result = await self.llm.ainvoke(messages)
-        return result.passed
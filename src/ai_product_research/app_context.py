@@ -1,11 +1,20 @@
 from dataclasses import dataclass
+from pathlib import Path
 
 from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 
-from ai_product_research.agents import ProblemRetrieverAgent, ProductFilterAgent
-from ai_product_research.services import AnalyzedProductTelegramChannelService
-from ai_product_research.services.product_hunt import ProductHuntService
+from ai_product_research.agents import ProblemRetrieverAgent, ProductFilterAgent, HedgedLlmInvoker, \
+    AimdConcurrencyLimiter
+from ai_product_research.services import AnalyzedProductTelegramChannelService, DomainFailureStore
+from ai_product_research.services.job_queue import SqliteJobQueue
+from ai_product_research.services.pass_probability_ranker import PassProbabilityRanker
+from ai_product_research.services.product_archive import ProductArchive
+from ai_product_research.services.product_hunt import ProductHuntService, ProductHuntSnapshotStore
+from ai_product_research.services.product_index import ProductEmbeddingIndex
+from ai_product_research.services.publishing import FileDestination, MultiDestinationPublisher, PublishRoute, \
+    TelegramDestination, WebhookDestination
+from ai_product_research.services.trend_aggregates import TrendAggregator
 from ai_product_research.services.web_site_scrapper import WebSiteScrapperService
 from ai_product_research.settings.settings import init_app_settings, AppSettings
 from ai_product_research.usecase import TelegramProductsResearchUseCase
@@ -21,35 +30,108 @@ class AppContext:
     product_filter_agent: ProductFilterAgent
     telegram_product_research_use_case: TelegramProductsResearchUseCase
     analyzed_products_telegram_channel_service: AnalyzedProductTelegramChannelService
+    # The channel service itself unless more destinations are configured
+    publisher: AnalyzedProductTelegramChannelService | MultiDestinationPublisher
+    product_index: ProductEmbeddingIndex
+    llm_invoker: HedgedLlmInvoker
+    ranker: PassProbabilityRanker
+    archive: ProductArchive
+    trends: TrendAggregator
+    job_queue: SqliteJobQueue | None
     debug: bool
 
+
+def create_publisher(
+    settings: AppSettings,
+    telegram_service: AnalyzedProductTelegramChannelService,
+) -> AnalyzedProductTelegramChannelService | MultiDestinationPublisher:
+    if not settings.telegram_extra_channels and settings.publish_webhook_url is None and settings.publish_file is None:
+        return telegram_service
+    telegram_services = [telegram_service]
+    for channel in settings.telegram_extra_channels:
+        channel_id, _, language = channel.partition(":")
+        telegram_services.append(AnalyzedProductTelegramChannelService(
+            channel_id=channel_id,
+            telegram_bot_token=settings.telegram_bot_token,
+            language=language or settings.telegram_language,
+        ))
+    routes = [PublishRoute(TelegramDestination(service), rate=settings.telegram_messages_per_second, burst=3)
+              for service in telegram_services]
+    if settings.publish_webhook_url is not None:
+        routes.append(PublishRoute(WebhookDestination(settings.publish_webhook_url), timeout=30.0))
+    if settings.publish_file is not None:
+        routes.append(PublishRoute(FileDestination(Path(settings.publish_file)), timeout=30.0))
+    return MultiDestinationPublisher(routes)
+
+
 def create_app_context() -> AppContext:
     settings = init_app_settings()
-    product_hunt_service = ProductHuntService(settings.product_hunt_dev_token)
-    scraper_service = WebSiteScrapperService(timeout=30000)
+    product_hunt_service = ProductHuntService(
+        settings.product_hunt_dev_token,
+        snapshot_store=ProductHuntSnapshotStore(Path(settings.data_dir) / "product_hunt_snapshots"),
+    )
+    scraper_service = WebSiteScrapperService(
+        timeout=30000,
+        max_retries=settings.scrape_max_retries,
+        per_host_concurrency=settings.scrape_per_host_concurrency,
+        rate_limit=settings.scrape_rate_limit,
+        fast_path=settings.scrape_fast_path,
+        min_text_words=settings.scrape_min_text_words,
+        failure_store=(DomainFailureStore.load(Path(settings.data_dir) / "domain_failures.json")
+                       if settings.scrape_failure_cache else None),
+    )
     chatgpt_5_mini = ChatOpenAI(
         model="gpt-5-mini",
         temperature=0,
         max_tokens=4096,
         max_retries=2,
+        timeout=settings.llm_request_timeout,
         api_key=settings.openai_api_key,
+        include_response_headers=True,
     )
     chatgpt_5_nano = ChatOpenAI(
         model="gpt-5-nano",
         temperature=0.3,
         max_tokens=4096,
         max_retries=2,
+        timeout=settings.llm_request_timeout,
         api_key=settings.openai_api_key,
+        include_response_headers=True,
         reasoning_effort="medium",
     )
 
-    problem_retriever_agent = ProblemRetrieverAgent(chatgpt_5_mini)
+    llm_invoker = HedgedLlmInvoker(
+        deadline=settings.llm_call_deadline,
+        hedge_percentile=settings.llm_hedge_percentile,
+        limiter=AimdConcurrencyLimiter(
+            initial_limit=settings.llm_initial_concurrency,
+            max_limit=settings.llm_max_concurrency,
+        ),
+    )
+    problem_retriever_agent = ProblemRetrieverAgent(chatgpt_5_mini, llm_invoker,
+                                                    repair_attempts=settings.problem_repair_attempts)
     analyzed_products_telegram_channel_service = AnalyzedProductTelegramChannelService(
         channel_id=settings.telegram_channel_id,
         telegram_bot_token=settings.telegram_bot_token,
+        language=settings.telegram_language,
     )
+    publisher = create_publisher(settings, analyzed_products_telegram_channel_service)
 
-    product_filter_agent = ProductFilterAgent(chatgpt_5_nano)
+    product_filter_agent = ProductFilterAgent(chatgpt_5_nano, llm_invoker)
+    product_index = ProductEmbeddingIndex.load(
+        Path(settings.data_dir) / "product_index",
+        similarity_threshold=settings.duplicate_similarity_threshold,
+    )
+    ranker = PassProbabilityRanker.load(Path(settings.data_dir) / "pass_history.json")
+    archive = ProductArchive(Path(settings.data_dir) / "archive")
+    trends = TrendAggregator.load(Path(settings.data_dir) / "trends.json")
+    job_queue = None
+    if settings.job_queue_enabled or settings.worker_mode:
+        job_queue = SqliteJobQueue(
+            Path(settings.data_dir) / "jobs.sqlite3",
+            lease_seconds=settings.job_lease_seconds,
+            max_attempts=settings.job_max_attempts,
+        )
 
     return AppContext(
         chatgpt_5_mini=chatgpt_5_mini,
@@ -61,10 +143,27 @@ def create_app_context() -> AppContext:
             product_hunt_service=product_hunt_service,
             problem_retriever_agent=problem_retriever_agent,
             scraper_service=scraper_service,
-            analyzed_products_telegram_channel_service=analyzed_products_telegram_channel_service,
+            analyzed_products_telegram_channel_service=publisher,
             product_filter_agent=product_filter_agent,
+            product_index=product_index,
+            duplicate_policy=settings.duplicate_policy,
+            ranker=ranker,
+            archive=archive,
+            trends=trends,
+            weekly_digest_enabled=settings.weekly_digest_enabled,
+            publish_mode=settings.publish_mode,
+            metadata_fallback=settings.scrape_metadata_fallback,
+            post_deadline_seconds=settings.post_deadline_seconds,
+            publish_reserve_seconds=settings.publish_reserve_seconds,
         ),
         analyzed_products_telegram_channel_service=analyzed_products_telegram_channel_service,
+        publisher=publisher,
+        product_index=product_index,
+        llm_invoker=llm_invoker,
+        ranker=ranker,
+        archive=archive,
+        trends=trends,
+        job_queue=job_queue,
         debug=settings.debug,
         product_filter_agent=product_filter_agent,
     )
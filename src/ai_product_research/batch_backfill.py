@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from openai import AsyncOpenAI
+
+from ai_product_research.agents import BatchLlmRunner, BusinessProblem, LocalFileBatchProvider, OpenAIBatchProvider
+from ai_product_research.app_context import create_app_context
+from ai_product_research.domain import FilterResult
+from ai_product_research.usecase import BatchBackfillUseCase
+
+
+async def backfill(first_day: datetime, days: int, provider_name: str) -> None:
+    ctx = create_app_context()
+    directory = Path(ctx.settings.data_dir) / "batches"
+    if provider_name == "openai":
+        provider = OpenAIBatchProvider(AsyncOpenAI(api_key=ctx.settings.openai_api_key))
+    else:
+        # Same files and polling, answered right away by the synchronous model
+        provider = LocalFileBatchProvider(directory / "local", ctx.chatgpt_5_mini, [BusinessProblem, FilterResult])
+    runner = BatchLlmRunner(provider, directory, poll_interval=ctx.settings.batch_llm_poll_seconds)
+    try:
+        await BatchBackfillUseCase(ctx.telegram_product_research_use_case, runner).execute(first_day, days)
+    finally:
+        await ctx.scraper_service.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Research past Product Hunt days with batch LLM jobs")
+    parser.add_argument("first_day", type=datetime.fromisoformat, help="First day to backfill, e.g. 2025-01-01")
+    parser.add_argument("--days", type=int, default=30, help="Number of days from the first one")
+    parser.add_argument("--provider", choices=["openai", "local"], default="openai")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.first_day, args.days, args.provider))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, time as time_of_day, timedelta
+
+# Monotonic time the current run, post or stage has to be done by
+_deadline_var: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """The time budget of the current scope ran out before the work started."""
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[float | None]:
+    """Give the code inside at most ``seconds``, a nested scope can only shorten the outer budget.
+
+    The deadline travels with the context into every coroutine and task started inside,
+    stages read what is left with ``remaining`` and size their own timeouts with ``bounded``.
+    """
+    outer = _deadline_var.get()
+    if seconds is None:
+        yield outer
+        return
+    deadline = time.monotonic() + seconds
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline_var.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline_var.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, negative once it passed, None without one."""
+    deadline = _deadline_var.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def bounded(seconds: float, floor: float = 0.0) -> float:
+    """``seconds`` capped by the time left before the current deadline, but not below ``floor``."""
+    left = remaining()
+    return seconds if left is None else max(floor, min(seconds, left))
+
+
+def seconds_until(at: time_of_day, now: datetime) -> float:
+    """Seconds from ``now`` to the next ``at`` o'clock in ``now``'s timezone."""
+    target = now.replace(hour=at.hour, minute=at.minute, second=at.second, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
@@ -1,4 +1,18 @@
 from .analyzed_product import AnalyzedProduct, BusinessProblem
+from .filter_result import FilterResult
 from .product_hunt import ProductHuntPost
+from .records import CompactRecord
+from .research_record import ProductResearchRecord
+from .scraped_page import ScrapedPage
+from .screenshot import Screenshot
 
-__all__ = ["ProductHuntPost", "AnalyzedProduct", "BusinessProblem"]
+__all__ = [
+    "ProductHuntPost",
+    "AnalyzedProduct",
+    "BusinessProblem",
+    "FilterResult",
+    "ProductResearchRecord",
+    "Screenshot",
+    "ScrapedPage",
+    "CompactRecord",
+]
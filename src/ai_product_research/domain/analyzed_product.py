@@ -7,6 +7,11 @@ class BusinessProblem(BaseModel):
     main_pain: str
     success_metric: str
 
+    @classmethod
+    def from_validated(cls, problem: BaseModel) -> "BusinessProblem":
+        """Copy a problem another schema with the same fields already validated, without validating it again."""
+        return cls.model_construct(**dict(problem))
+
 
 class AnalyzedProduct(BaseModel):
     origin_url: str
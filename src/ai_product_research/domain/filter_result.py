@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class FilterResult(BaseModel):
+    passed: bool = Field(description="True if provided product matches requirements, otherwise False")
+    reason: str = Field(
+        description="Brief explanation of why the product passed or failed (1-2 sentences explaining which requirements were met or not met)")
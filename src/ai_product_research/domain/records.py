@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from .analyzed_product import AnalyzedProduct, BusinessProblem
+from .filter_result import FilterResult
+from .product_hunt import ProductHuntPost
+from .research_record import ProductResearchRecord
+
+
+@dataclass(slots=True, frozen=True)
+class CompactRecord:
+    """Flat, slotted form of a ``ProductResearchRecord`` for archive scans and backfills.
+
+    Fields are trusted as they are: records are validated once, when they enter as pydantic
+    models, and only turned back into models (``to_model``) where they leave again.
+    """
+    run_id: str
+    target_date: date
+    post_id: str
+    name: str
+    tagline: str
+    description: str
+    votes: int
+    url: str
+    website: str
+    thumbnail_url: Optional[str] = None
+    topics: tuple[str, ...] = ()
+    origin_url: Optional[str] = None
+    product_url: Optional[str] = None
+    primary_customer: Optional[str] = None
+    core_job: Optional[str] = None
+    main_pain: Optional[str] = None
+    success_metric: Optional[str] = None
+    passed: Optional[bool] = None
+    reason: Optional[str] = None
+    published: bool = False
+
+    @property
+    def analyzed(self) -> bool:
+        return self.product_url is not None
+
+    @classmethod
+    def from_model(cls, record: ProductResearchRecord) -> "CompactRecord":
+        post, product, filter_result = record.post, record.product, record.filter_result
+        problem = product.problem if product is not None else None
+        return cls(
+            record.run_id,
+            record.target_date,
+            post.id,
+            post.name,
+            post.tagline,
+            post.description,
+            post.votesCount,
+            post.url,
+            post.website,
+            post.thumbnail_url,
+            tuple(post.topics),
+            product.origin_url if product is not None else None,
+            product.product_url if product is not None else None,
+            problem.primary_customer if problem is not None else None,
+            problem.core_job if problem is not None else None,
+            problem.main_pain if problem is not None else None,
+            problem.success_metric if problem is not None else None,
+            filter_result.passed if filter_result is not None else None,
+            filter_result.reason if filter_result is not None else None,
+            record.published,
+        )
+
+    def to_model(self) -> ProductResearchRecord:
+        """Validated pydantic record, for handing the record to agents, channels or the API."""
+        product = None
+        if self.analyzed:
+            product = AnalyzedProduct(
+                origin_url=self.origin_url,
+                product_url=self.product_url,
+                name=self.name,
+                problem=BusinessProblem(
+                    primary_customer=self.primary_customer,
+                    core_job=self.core_job,
+                    main_pain=self.main_pain,
+                    success_metric=self.success_metric,
+                ),
+            )
+        filter_result = None
+        if self.passed is not None:
+            filter_result = FilterResult(passed=self.passed, reason=self.reason or "")
+        return ProductResearchRecord(
+            run_id=self.run_id,
+            target_date=self.target_date,
+            post=ProductHuntPost(
+                id=self.post_id,
+                name=self.name,
+                tagline=self.tagline,
+                description=self.description,
+                votesCount=self.votes,
+                url=self.url,
+                website=self.website,
+                thumbnail_url=self.thumbnail_url,
+                topics=list(self.topics),
+            ),
+            product=product,
+            filter_result=filter_result,
+            published=self.published,
+        )
@@ -0,0 +1,21 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .analyzed_product import AnalyzedProduct
+from .filter_result import FilterResult
+from .product_hunt import ProductHuntPost
+
+
+class ProductResearchRecord(BaseModel):
+    run_id: str
+    target_date: date
+    post: ProductHuntPost
+    product: Optional[AnalyzedProduct] = None
+    filter_result: Optional[FilterResult] = None
+    published: bool = False
+
+    @property
+    def passed(self) -> bool:
+        return self.product is not None and self.filter_result is not None and self.filter_result.passed
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+from .screenshot import Screenshot
+
+
+@dataclass
+class ScrapedPage:
+    """Content of a product website: its extracted text when the server-rendered HTML was
+    enough to analyze, otherwise a browser screenshot."""
+
+    url: str
+    strategy: Literal["http", "browser"]
+    text: Optional[str] = None
+    screenshot: Optional[Screenshot] = None
+
+    def close(self) -> None:
+        if self.screenshot is not None:
+            self.screenshot.close()
+
+    def __enter__(self) -> "ScrapedPage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
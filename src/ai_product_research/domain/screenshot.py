@@ -0,0 +1,85 @@
+import binascii
+import mmap
+import os
+import tempfile
+from pathlib import Path
+
+# Multiple of 3 so every chunk encodes to base64 without padding
+ENCODE_CHUNK_SIZE = 3 * 64 * 1024
+
+
+class Screenshot:
+    """PNG screenshot spooled to a temporary file instead of being held in memory.
+
+    The bytes are only mapped while being encoded, and the base64 data URL is built
+    incrementally into a single preallocated buffer. Turning it into a ``str`` copies it
+    once more, so encoding peaks at two encoded copies and leaves one, where the
+    bytes -> base64 -> str -> f-string chain held the PNG plus three.
+    """
+
+    DATA_URL_PREFIX = b"data:image/png;base64,"
+
+    def __init__(self, path: Path, owned: bool = True):
+        self.path = path
+        self.owned = owned
+
+    @classmethod
+    def spooled(cls, directory: str | None = None) -> "Screenshot":
+        """Create an empty screenshot backed by a new temporary file."""
+        fd, path = tempfile.mkstemp(prefix="screenshot-", suffix=".png", dir=directory)
+        os.close(fd)
+        return cls(Path(path))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, directory: str | None = None) -> "Screenshot":
+        screenshot = cls.spooled(directory)
+        screenshot.path.write_bytes(data)
+        return screenshot
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    def to_data_url(self) -> str:
+        """Encode the screenshot as a ``data:image/png;base64,...`` URL.
+
+        Returns:
+            The data URL, encoded chunk by chunk from a memory map of the file
+        """
+        size = self.size
+        prefix = self.DATA_URL_PREFIX
+        encoded = bytearray(len(prefix) + 4 * ((size + 2) // 3))
+        encoded[:len(prefix)] = prefix
+        if size == 0:
+            return encoded.decode("ascii")
+
+        offset = len(prefix)
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, size, ENCODE_CHUNK_SIZE):
+                    chunk = binascii.b2a_base64(view[start:start + ENCODE_CHUNK_SIZE], newline=False)
+                    encoded[offset:offset + len(chunk)] = chunk
+                    offset += len(chunk)
+            finally:
+                view.release()
+
+        # The second copy, a str can't take over the buffer; the buffer is freed on return
+        return encoded.decode("ascii")
+
+    def close(self) -> None:
+        """Delete the backing file if this screenshot owns it."""
+        if self.owned:
+            self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "Screenshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"Screenshot(path={str(self.path)!r})"
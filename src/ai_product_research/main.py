@@ -1,37 +1,97 @@
 import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from ai_product_research.app_context import create_app_context
+from ai_product_research.admin import AdminServer
+from ai_product_research.app_context import create_app_context, AppContext
+from ai_product_research.deadlines import deadline_scope, seconds_until
+from ai_product_research.ondemand import AnalysisApiServer, OnDemandAnalyzer
+from ai_product_research.replay import RunRecorder
+from ai_product_research.scheduler import DailyScheduler
+from ai_product_research.usecase import DistributedResearchCoordinator, PostResearchWorker
+from ai_product_research.warm_up import WarmUp
 
 log = logging.getLogger(__name__)
 
 
+async def start_admin_server(ctx: AppContext) -> AdminServer:
+    admin_server = AdminServer(
+        host=ctx.settings.admin_host,
+        port=ctx.settings.admin_port,
+        profile_dir=Path(ctx.settings.data_dir) / "profiles",
+    )
+    admin_server.register_metrics("llm", ctx.llm_invoker.metrics)
+    admin_server.register_metrics("llm_concurrency", ctx.llm_invoker.limiter.snapshot)
+    admin_server.register_metrics("scrape_retries", ctx.scraper_service.retry_report)
+    admin_server.register_metrics("scrape_paths", ctx.scraper_service.fetch_report)
+    await admin_server.start()
+    return admin_server
+
+
+async def start_analysis_api(ctx: AppContext, admin_server: AdminServer | None) -> AnalysisApiServer:
+    analyzer = OnDemandAnalyzer(
+        ctx.telegram_product_research_use_case,
+        concurrency=ctx.settings.analysis_concurrency,
+        max_queue=ctx.settings.analysis_max_queue,
+        cache_ttl=ctx.settings.analysis_cache_ttl_seconds,
+    )
+    if admin_server is not None:
+        admin_server.register_metrics("on_demand_analysis", analyzer.metrics)
+    server = AnalysisApiServer(analyzer, ctx.settings.analysis_api_host, ctx.settings.analysis_api_port)
+    await server.start()
+    return server
+
+
 async def main():
     ctx = create_app_context()
-    cet_tz = ZoneInfo("Europe/Paris")
-    last_execution_date = None
+    admin_server = await start_admin_server(ctx) if ctx.settings.admin_port is not None else None
+    if ctx.settings.analysis_api_port is not None and not ctx.settings.worker_mode:
+        await start_analysis_api(ctx, admin_server)
+    if ctx.settings.worker_mode:
+        await PostResearchWorker(ctx.telegram_product_research_use_case, ctx.job_queue).run()
+        return
 
-    if ctx.debug:
-        target_date = (datetime.now(cet_tz) - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        await ctx.telegram_product_research_use_case.execute(target_date)
+    use_case = ctx.telegram_product_research_use_case
+    if ctx.job_queue is not None:
+        use_case = DistributedResearchCoordinator(use_case, ctx.job_queue)
+        if ctx.settings.record_runs:
+            log.warning("Runs researched by workers aren't recorded, record_runs is ignored with the job queue")
+    elif ctx.settings.record_runs:
+        use_case = RunRecorder(use_case, Path(ctx.settings.data_dir) / "recordings")
+    warm_up = WarmUp(
+        scraper_service=ctx.scraper_service,
+        product_hunt_service=ctx.product_hunt_service,
+        telegram_service=ctx.publisher,
+        chat_models=[ctx.chatgpt_5_mini],
+    )
 
-    while True:
+    async def execute(target_date: datetime) -> None:
+        if ctx.settings.warm_up_lead_seconds > 0 or ctx.debug:
+            await warm_up.connect()
+        digest_deadline = ctx.settings.digest_deadline
+        budget = seconds_until(digest_deadline, datetime.now(scheduler.tz)) if digest_deadline is not None else None
         try:
-            now_cet = datetime.now(cet_tz)
-            if now_cet.hour == 6 and now_cet.minute == 0:
-                target_date = (now_cet - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-                if last_execution_date != target_date.date():
-                    log.info(f"Executing for target date: {target_date.date()}")
-                    await ctx.telegram_product_research_use_case.execute(target_date)
-                    last_execution_date = target_date.date()
-                    log.info(f"Execution completed for {target_date.date()}")
-            await asyncio.sleep(60)
-
-        except Exception as e:
-            log.error(f"Error in main loop: {e}", exc_info=True)
-            await asyncio.sleep(60)
+            with deadline_scope(budget):
+                await use_case.execute(target_date)
+        finally:
+            # The browser would sit idle until tomorrow's warm-up
+            await ctx.scraper_service.close()
+        log.info(f"LLM latency metrics: {ctx.llm_invoker.metrics()}")
+        log.info(f"Problem repair metrics: {ctx.problem_retriever_agent.repair_metrics()}")
+        warm_up.log_first_post(ctx.telegram_product_research_use_case.post_seconds)
+
+    scheduler = DailyScheduler(
+        execute,
+        tz=ZoneInfo("Europe/Paris"),
+        warm_up=warm_up.run if ctx.settings.warm_up_lead_seconds > 0 else None,
+        warm_up_lead=ctx.settings.warm_up_lead_seconds,
+    )
+    if ctx.debug:
+        await warm_up.run()
+        await execute(scheduler.target_date_for(datetime.now(scheduler.tz)))
+    await scheduler.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+from .analyzer import AnalysisQueueFullError, AnalysisResult, OnDemandAnalyzer, PostNotFoundError
+from .server import AnalysisApiServer
+
+__all__ = ["OnDemandAnalyzer", "AnalysisApiServer", "AnalysisResult", "AnalysisQueueFullError",
+           "PostNotFoundError"]
@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+import logging
+import sys
+
+from ai_product_research.ondemand.load_test import LoadTestConfig, run_load_test
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the on-demand analysis API against local fakes")
+    parser.add_argument("--requests", type=int, default=500, help="Requests to send in total")
+    parser.add_argument("--distinct-urls", type=int, default=50, help="Websites the requests pick from")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake LLM call")
+    parser.add_argument("--concurrency", type=int, default=4, help="Analyses running at once")
+    parser.add_argument("--max-queue", type=int, default=32, help="Analyses waiting before 503s")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run_load_test(LoadTestConfig(
+        requests=args.requests,
+        distinct_urls=args.distinct_urls,
+        clients=args.clients,
+        llm_latency=args.llm_latency,
+        analysis_concurrency=args.concurrency,
+        max_queue=args.max_queue,
+    )))
+    print(report.summary())
+    return 0 if 500 not in report.statuses else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit, urlunsplit
+
+from ai_product_research.deadlines import deadline_scope
+from ai_product_research.domain import AnalyzedProduct, FilterResult, ProductHuntPost
+from ai_product_research.usecase import TelegramProductsResearchUseCase
+
+log = logging.getLogger(__name__)
+
+
+class AnalysisQueueFullError(Exception):
+    """Every analysis slot and queue place is taken, the caller should retry later."""
+
+
+class PostNotFoundError(LookupError):
+    """Product Hunt doesn't know the requested post."""
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a website URL, the key analyses are coalesced and cached by."""
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Not an http(s) URL: {url!r}")
+    netloc = parts.hostname.lower() + (f":{parts.port}" if parts.port else "")
+    return urlunsplit((parts.scheme, netloc, parts.path.rstrip("/") or "/", parts.query, ""))
+
+
+def url_post(url: str) -> ProductHuntPost:
+    """Stand-in Product Hunt post of an arbitrary website, for the research pipeline."""
+    return ProductHuntPost(
+        id=f"url-{hashlib.sha256(url.encode('utf-8')).hexdigest()[:12]}",
+        name=urlsplit(url).hostname.removeprefix("www."),
+        tagline="",
+        description="",
+        votesCount=0,
+        url=url,
+        website=url,
+    )
+
+
+@dataclass
+class AnalysisResult:
+    post: ProductHuntPost
+    product: AnalyzedProduct | None
+    filter_result: FilterResult | None
+    seconds: float
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "post": self.post.model_dump(mode="json"),
+            "product": self.product.model_dump(mode="json") if self.product is not None else None,
+            "filter_result": self.filter_result.model_dump(mode="json") if self.filter_result is not None else None,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+@dataclass
+class _Job:
+    key: str
+    load_post: Callable[[], Awaitable[ProductHuntPost | None]]
+    future: asyncio.Future
+
+
+class OnDemandAnalyzer:
+    """Analyzes arbitrary websites and Product Hunt posts on request, outside the daily run.
+
+    Each request goes through the use case's scrape, problem retrieval and filter chain
+    under its own deadline. Concurrent requests for the same URL or post share one
+    analysis, finished analyses are served from an LRU cache for ``cache_ttl`` seconds.
+    At most ``concurrency`` analyses run at once and ``max_queue`` wait; past that new
+    requests are refused with ``AnalysisQueueFullError`` instead of piling up.
+    """
+
+    def __init__(
+        self,
+        use_case: TelegramProductsResearchUseCase,
+        concurrency: int = 4,
+        max_queue: int = 32,
+        cache_ttl: float = 24 * 3600.0,
+        cache_size: int = 1024,
+        request_deadline: float | None = 180.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.use_case = use_case
+        self.concurrency = concurrency
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.request_deadline = request_deadline
+        self.clock = clock
+        self.counts: Counter[str] = Counter()
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue(maxsize=max_queue)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._cache: OrderedDict[str, tuple[float, AnalysisResult]] = OrderedDict()
+        self._workers: list[asyncio.Task] = []
+        self._active = 0
+
+    async def start(self) -> None:
+        self._workers = [asyncio.create_task(self._work(), name=f"on-demand-analysis-{i}")
+                         for i in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def analyze_url(self, url: str) -> tuple[AnalysisResult, str]:
+        """Analysis of a website, with how it was served: "cache", "coalesced" or "analyzed".
+
+        Raises:
+            ValueError: If ``url`` isn't an http(s) URL
+            AnalysisQueueFullError: If the analysis can't be queued
+        """
+        url = normalize_url(url)
+
+        async def load_post() -> ProductHuntPost:
+            return url_post(url)
+
+        return await self._submit(f"url:{url}", load_post)
+
+    async def analyze_post(self, post_id: str) -> tuple[AnalysisResult, str]:
+        """Analysis of a Product Hunt post, with how it was served.
+
+        Raises:
+            PostNotFoundError: If Product Hunt doesn't know the post
+            AnalysisQueueFullError: If the analysis can't be queued
+        """
+        return await self._submit(f"post:{post_id}", lambda: self.use_case.product_hunt_service.get_post(post_id))
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            **self.counts,
+            "active": self._active,
+            "queued": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "cached": len(self._cache),
+        }
+
+    async def _submit(self, key: str, load_post: Callable[[], Awaitable[ProductHuntPost | None]]
+                      ) -> tuple[AnalysisResult, str]:
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > self.clock():
+            self._cache.move_to_end(key)
+            self.counts["cache_hits"] += 1
+            return cached[1], "cache"
+
+        future = self._inflight.get(key)
+        served = "coalesced"
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self._queue.put_nowait(_Job(key, load_post, future))
+            except asyncio.QueueFull:
+                self.counts["rejected"] += 1
+                raise AnalysisQueueFullError(f"{self._queue.maxsize} analyses are already waiting") from None
+            self._inflight[key] = future
+            served = "analyzed"
+        self.counts[served] += 1
+        # A client going away must not cancel the analysis other requests wait for
+        return await asyncio.shield(future), served
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._active += 1
+            try:
+                result = await self._analyze(job)
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                if result.product is not None:
+                    self._remember(job.key, result)
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self._active -= 1
+                self._inflight.pop(job.key, None)
+                self._queue.task_done()
+
+    async def _analyze(self, job: _Job) -> AnalysisResult:
+        started = time.perf_counter()
+        with deadline_scope(self.request_deadline):
+            post = await job.load_post()
+            if post is None:
+                raise PostNotFoundError(f"Unknown Product Hunt post: {job.key}")
+            product = await self.use_case.analyze_post(post)
+            filter_result = None
+            if product is not None:
+                filter_result = await self.use_case.product_filter_agent.evaluate_product(product)
+        log.info(f"Analyzed {job.key} on demand in {time.perf_counter() - started:.1f}s: "
+                 f"passed={filter_result.passed if filter_result is not None else None}")
+        return AnalysisResult(post, product, filter_result, time.perf_counter() - started)
+
+    def _remember(self, key: str, result: AnalysisResult) -> None:
+        self._cache[key] = (self.clock() + self.cache_ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from ai_product_research.agents import HedgedLlmInvoker, ProblemRetrieverAgent, ProductFilterAgent
+from ai_product_research.ondemand.analyzer import OnDemandAnalyzer
+from ai_product_research.ondemand.server import AnalysisApiServer
+from ai_product_research.services import WebSiteScrapperService
+from ai_product_research.soak.fakes import FakeChatModel, FakeProductHuntService, LocalSiteServer
+from ai_product_research.usecase import TelegramProductsResearchUseCase
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadTestConfig:
+    requests: int = 500
+    # Requests pick among this many websites, fewer means more coalescing and cache hits
+    distinct_urls: int = 50
+    clients: int = 50
+    llm_latency: float = 0.2
+    analysis_concurrency: int = 4
+    max_queue: int = 32
+    seed: int = 0
+
+
+@dataclass
+class LoadTestReport:
+    seconds: float
+    statuses: Counter[int] = field(default_factory=Counter)
+    served: Counter[str] = field(default_factory=Counter)
+    latencies: list[float] = field(default_factory=list)
+    metrics: dict[str, Any] = field(default_factory=dict)
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+    def summary(self) -> str:
+        return (f"{sum(self.statuses.values())} request(s) in {self.seconds:.2f}s, statuses {dict(self.statuses)}, "
+                f"served {dict(self.served)}, p50 {self.percentile(0.5):.3f}s p95 {self.percentile(0.95):.3f}s, "
+                f"analyzer {self.metrics}")
+
+
+async def run_load_test(config: LoadTestConfig) -> LoadTestReport:
+    """Fire concurrent requests at the analysis API backed by local fakes, no network or LLM needed."""
+    site = LocalSiteServer()
+    await site.start()
+    chat_model = FakeChatModel(latency=config.llm_latency, pass_rate=0.3)
+    invoker = HedgedLlmInvoker()
+    scraper = WebSiteScrapperService(rate_limit=1000.0, rate_burst=100)
+    use_case = TelegramProductsResearchUseCase(
+        product_hunt_service=FakeProductHuntService(site.url),
+        problem_retriever_agent=ProblemRetrieverAgent(chat_model, invoker),
+        scraper_service=scraper,
+        analyzed_products_telegram_channel_service=None,
+        product_filter_agent=ProductFilterAgent(chat_model, invoker),
+    )
+    server = AnalysisApiServer(
+        OnDemandAnalyzer(use_case, concurrency=config.analysis_concurrency, max_queue=config.max_queue),
+        "127.0.0.1", 0,
+    )
+    await server.start()
+    rng = random.Random(config.seed)
+    urls = [f"{site.url}/p/load-{i}" for i in range(config.distinct_urls)]
+    pending = [rng.choice(urls) for _ in range(config.requests)]
+    report = LoadTestReport(seconds=0.0)
+
+    async def client(http: httpx.AsyncClient) -> None:
+        while pending:
+            url = pending.pop()
+            started = time.perf_counter()
+            response = await http.post("/analyze", json={"url": url})
+            report.latencies.append(time.perf_counter() - started)
+            report.statuses[response.status_code] += 1
+            if response.status_code == 200:
+                report.served[response.json()["served"]] += 1
+
+    started = time.perf_counter()
+    try:
+        limits = httpx.Limits(max_connections=config.clients)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}", timeout=60.0, limits=limits) as http:
+            await asyncio.gather(*(client(http) for _ in range(config.clients)))
+        report.seconds = time.perf_counter() - started
+        report.metrics = server.analyzer.metrics()
+    finally:
+        await server.stop()
+        await scraper.close()
+        await site.stop()
+    log.info(report.summary())
+    return report
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import logging
+
+from ai_product_research.admin.http import HttpRequest, HttpResponse, start_http_server
+from ai_product_research.ondemand.analyzer import AnalysisQueueFullError, OnDemandAnalyzer, PostNotFoundError
+
+log = logging.getLogger(__name__)
+
+# Seconds a client refused for backpressure is told to wait
+RETRY_AFTER_SECONDS = 5
+
+
+class AnalysisApiServer:
+    """HTTP API running on-demand analyses.
+
+    Routes:
+        POST /analyze: body {"url": ...} or {"post_id": ...}, returns the analyzed product and
+            filter result; 503 with Retry-After when the analysis queue is full
+        GET /metrics: cache, coalescing and queue counters
+    """
+
+    def __init__(self, analyzer: OnDemandAnalyzer, host: str, port: int):
+        self.analyzer = analyzer
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        await self.analyzer.start()
+        self._server = await start_http_server(self.handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info(f"Analysis API listening on http://{self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.analyzer.stop()
+
+    async def handle(self, request: HttpRequest) -> HttpResponse:
+        if request.path == "/metrics" and request.method == "GET":
+            return HttpResponse.json(self.analyzer.metrics())
+        if request.path != "/analyze":
+            return HttpResponse.text("Not found", status=404)
+        if request.method != "POST":
+            return HttpResponse.text("Method not allowed", status=405)
+
+        try:
+            body = request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return HttpResponse.text("Body must be JSON", status=400)
+        if not isinstance(body, dict) or not (isinstance(body.get("url"), str) or isinstance(body.get("post_id"), str)):
+            return HttpResponse.text('Body must be {"url": ...} or {"post_id": ...}', status=400)
+
+        try:
+            if isinstance(body.get("url"), str):
+                result, served = await self.analyzer.analyze_url(body["url"])
+            else:
+                result, served = await self.analyzer.analyze_post(body["post_id"])
+        except ValueError as e:
+            return HttpResponse.text(str(e), status=400)
+        except PostNotFoundError as e:
+            return HttpResponse.text(str(e), status=404)
+        except AnalysisQueueFullError as e:
+            response = HttpResponse.text(f"Too many analyses in progress: {e}", status=503)
+            response.headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+            return response
+        except TimeoutError:
+            return HttpResponse.text("Analysis ran out of time", status=504)
+
+        if result.product is None:
+            return HttpResponse.json({**result.to_json(), "served": served, "error": "Website could not be analyzed"},
+                                     status=502)
+        return HttpResponse.json({**result.to_json(), "served": served})
@@ -0,0 +1,6 @@
+from .archive import ReplayMismatchError, ReplayedError, RunArchiveReader, RunArchiveWriter
+from .recording import RunRecorder
+from .replaying import ReplayReport, RunReplayer
+
+__all__ = ["RunRecorder", "RunReplayer", "ReplayReport", "RunArchiveReader", "RunArchiveWriter",
+           "ReplayMismatchError", "ReplayedError"]
@@ -0,0 +1,26 @@
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from ai_product_research.replay.replaying import RunReplayer
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rerun a recorded research day offline from its archive")
+    parser.add_argument("archive", type=Path, help="Run archive written with record_runs enabled")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier of the recorded latencies, 0 replays without waiting")
+    parser.add_argument("--strict", action="store_true", help="Fail on calls whose request changed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("ai_product_research.replay").setLevel(logging.INFO)
+    report = asyncio.run(RunReplayer(args.archive, args.latency_scale, args.strict).run())
+    print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
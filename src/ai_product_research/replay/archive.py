@@ -0,0 +1,113 @@
+import hashlib
+import json
+import zipfile
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+INTERACTIONS_FILE = "interactions.jsonl"
+METADATA_FILE = "run.json"
+BLOBS_DIR = "blobs"
+
+
+class ReplayMismatchError(LookupError):
+    """The replayed pipeline made a call the archive has no recording for."""
+
+
+class ReplayedError(RuntimeError):
+    """An error recorded for an interaction, raised again when it is replayed."""
+
+
+@dataclass
+class Interaction:
+    kind: str
+    key: str
+    latency: float
+    data: Any = None
+    error: str | None = None
+    # Free-form details kept for inspection only, e.g. a preview of an LLM prompt
+    request: Any = None
+
+
+@dataclass
+class RunArchiveWriter:
+    """Writes the external interactions of one run into a zip archive.
+
+    Binary payloads such as screenshots are stored once per content hash under ``blobs/``,
+    interactions as JSON lines in call order, next to a ``run.json`` metadata file.
+    """
+    path: Path
+    metadata: dict[str, Any] = field(default_factory=dict)
+    interactions: list[Interaction] = field(default_factory=list)
+    _zip: zipfile.ZipFile | None = field(default=None, init=False, repr=False)
+    _blobs: set[str] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def add(self, interaction: Interaction) -> None:
+        self.interactions.append(interaction)
+
+    def add_blob(self, data: bytes, suffix: str = "") -> str:
+        """Store binary content and return its name in the archive."""
+        name = f"{hashlib.sha256(data).hexdigest()[:24]}{suffix}"
+        if name not in self._blobs:
+            # Screenshots are already compressed, deflating them again only costs time
+            self._zip.writestr(f"{BLOBS_DIR}/{name}", data, compress_type=zipfile.ZIP_STORED)
+            self._blobs.add(name)
+        return name
+
+    def close(self) -> None:
+        if self._zip is None:
+            return
+        lines = (json.dumps(asdict(interaction), default=str) for interaction in self.interactions)
+        self._zip.writestr(INTERACTIONS_FILE, "\n".join(lines))
+        self._zip.writestr(METADATA_FILE, json.dumps(self.metadata, default=str))
+        self._zip.close()
+        self._zip = None
+
+
+class RunArchiveReader:
+    """Serves recorded interactions back in call order.
+
+    Calls are matched by kind and key. Unless ``strict``, a call whose key changed, e.g. an
+    edited prompt, falls back to the next unused recording of the same kind, so code changes
+    can still be profiled against the recorded day.
+    """
+
+    def __init__(self, path: Path, strict: bool = False):
+        self.path = path
+        self.strict = strict
+        self._zip = zipfile.ZipFile(path)
+        self.metadata: dict[str, Any] = json.loads(self._zip.read(METADATA_FILE))
+        self.interactions = [Interaction(**json.loads(line))
+                             for line in self._zip.read(INTERACTIONS_FILE).decode("utf-8").splitlines() if line]
+        self._unused: dict[str, list[int]] = defaultdict(list)
+        for i, interaction in enumerate(self.interactions):
+            self._unused[interaction.kind].append(i)
+        self.fallbacks = 0
+
+    def take(self, kind: str, key: str, required: bool = True) -> Interaction | None:
+        """Next unused recording of a call.
+
+        Raises:
+            ReplayMismatchError: If nothing is left to answer the call and it is ``required``
+        """
+        unused = self._unused[kind]
+        for position, i in enumerate(unused):
+            if self.interactions[i].key == key:
+                return self.interactions[unused.pop(position)]
+        if unused and not self.strict:
+            self.fallbacks += 1
+            return self.interactions[unused.pop(0)]
+        if not required:
+            return None
+        raise ReplayMismatchError(f"No recorded {kind} interaction left for {key!r} in {self.path}")
+
+    def blob(self, name: str) -> bytes:
+        return self._zip.read(f"{BLOBS_DIR}/{name}")
+
+    def close(self) -> None:
+        self._zip.close()
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from ai_product_research.agents.problem_retriever_agent import raw_answer
+from ai_product_research.domain import AnalyzedProduct, ProductHuntPost, ScrapedPage
+from ai_product_research.replay.archive import Interaction, RunArchiveWriter
+from ai_product_research.services.product_index import IndexMatch
+from ai_product_research.services.trend_aggregates import WeeklyDigest
+from ai_product_research.usecase import TelegramProductsResearchUseCase
+
+log = logging.getLogger(__name__)
+
+PREVIEW_CHARS = 2000
+
+
+def posts_key(posted_after: datetime, posted_before: datetime, limit: int, fields: Iterable[str]) -> str:
+    return f"{posted_after.isoformat()}/{posted_before.isoformat()}/{limit}/{','.join(sorted(set(fields)))}"
+
+
+def request_digest(messages: Any) -> str:
+    """Stable hash of LLM messages, the key LLM calls are matched by on replay."""
+    payload = [(getattr(message, "type", None), getattr(message, "content", message)) for message in messages]
+    return hashlib.sha256(json.dumps(payload, default=str, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+
+
+def request_preview(messages: Any) -> list[str]:
+    """Text of LLM messages with images left out, to see what was asked."""
+    preview = []
+    for message in messages:
+        content = getattr(message, "content", message)
+        if isinstance(content, list):
+            content = " ".join(part.get("text", f"<{part.get('type')}>") for part in content if isinstance(part, dict))
+        preview.append(str(content)[:PREVIEW_CHARS])
+    return preview
+
+
+class _Recorder:
+    """Passes calls through to ``inner`` and records their results and latencies."""
+
+    def __init__(self, inner: Any, writer: RunArchiveWriter):
+        self._inner = inner
+        self._writer = writer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    async def _record(self, kind: str, key: str, call: Callable[[], Awaitable[Any]],
+                      encode: Callable[[Any], Any], request: Any = None) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as e:
+            self._writer.add(Interaction(kind, key, time.perf_counter() - started, error=f"{type(e).__name__}: {e}",
+                                         request=request))
+            raise
+        self._writer.add(Interaction(kind, key, time.perf_counter() - started, data=encode(result), request=request))
+        return result
+
+
+class RecordingProductHuntService(_Recorder):
+    async def get_posts(self, posted_after: datetime, posted_before: datetime, limit: int = 20,
+                        fields: Iterable[str] = (), refresh: bool = False) -> list[ProductHuntPost]:
+        fields = tuple(fields)
+        return await self._record(
+            "product_hunt", posts_key(posted_after, posted_before, limit, fields),
+            lambda: self._inner.get_posts(posted_after, posted_before, limit, fields, refresh),
+            lambda posts: [post.model_dump(mode="json") for post in posts],
+        )
+
+
+class RecordingRanker(_Recorder):
+    def rank(self, posts: list[ProductHuntPost]) -> list[ProductHuntPost]:
+        ranked = self._inner.rank(posts)
+        self._writer.add(Interaction("rank", "", 0.0, data=[post.id for post in ranked]))
+        return ranked
+
+
+class RecordingProductIndex(_Recorder):
+    def find_duplicate(self, post: ProductHuntPost) -> IndexMatch | None:
+        started = time.perf_counter()
+        match = self._inner.find_duplicate(post)
+        data = None if match is None else {"score": match.score, "entry": match.entry.model_dump(mode="json")}
+        self._writer.add(Interaction("duplicate", post.id, time.perf_counter() - started, data=data))
+        return match
+
+
+class RecordingScraperService(_Recorder):
+    async def fetch(self, url: str) -> ScrapedPage | None:
+        return await self._record("scrape", url, lambda: self._inner.fetch(url), self._encode_page)
+
+    def _encode_page(self, page: ScrapedPage | None) -> dict[str, Any] | None:
+        if page is None:
+            return None
+        screenshot = None
+        if page.screenshot is not None:
+            screenshot = self._writer.add_blob(page.screenshot.read_bytes(), ".png")
+        return {"url": page.url, "strategy": page.strategy, "text": page.text, "screenshot": screenshot}
+
+
+class RecordingRunnable(_Recorder):
+    """Records structured output calls of an agent, keyed by the digest of their messages."""
+
+    def __init__(self, inner: Any, writer: RunArchiveWriter, schema_name: str):
+        super().__init__(inner, writer)
+        self._schema_name = schema_name
+
+    async def ainvoke(self, messages: Any, *args, **kwargs) -> Any:
+        return await self._record(
+            f"llm:{self._schema_name}", request_digest(messages),
+            lambda: self._inner.ainvoke(messages, *args, **kwargs),
+            self._encode_output,
+            request=request_preview(messages),
+        )
+
+    @staticmethod
+    def _encode_output(output: Any) -> dict[str, Any]:
+        # The raw answer, its usage and the validation errors are what a repair prompt is built from,
+        # replay needs them back for the repair calls to match their recordings
+        if isinstance(output, dict) and output.keys() == {"raw", "parsed", "parsing_error"}:
+            raw = output["raw"]
+            headers = getattr(raw, "response_metadata", {}).get("headers")
+            parsed, error = output["parsed"], output["parsing_error"]
+            return {
+                "parsed": parsed.model_dump(mode="json") if parsed is not None else None,
+                "parsing_error": f"{type(error).__name__}: {error}" if error is not None else None,
+                "validation_errors": (error.errors(include_url=False)
+                                      if isinstance(error, ValidationError) else None),
+                "headers": dict(headers) if headers else None,
+                "raw": raw_answer(raw),
+                "usage": getattr(raw, "usage_metadata", None),
+            }
+        return {"parsed": output.model_dump(mode="json"), "parsing_error": None, "headers": None}
+
+
+class RecordingTelegramService(_Recorder):
+    async def send_updates(self, products: list[AnalyzedProduct]) -> None:
+        await self._record("telegram", "send_updates", lambda: self._inner.send_updates(products),
+                           lambda _: [product.name for product in products])
+
+    async def send_weekly_digest(self, digest: WeeklyDigest) -> None:
+        await self._record("telegram", "send_weekly_digest", lambda: self._inner.send_weekly_digest(digest),
+                           lambda _: digest.week)
+
+
+@dataclass
+class RunRecorder:
+    """Runs the use case with every external interaction recorded into a per-run zip archive.
+
+    Product Hunt posts, the ranking and duplicate lookups against local state, scraped pages
+    with their screenshots, LLM requests and answers and Telegram calls are captured with
+    their latencies, enough for ``RunReplayer`` to rerun the day offline.
+    """
+    use_case: TelegramProductsResearchUseCase
+    directory: Path
+    last_archive: Path | None = None
+
+    async def execute(self, target_date: datetime) -> None:
+        use_case = self.use_case
+        path = self.directory / f"{target_date:%Y-%m-%d}-{datetime.now():%Y%m%dT%H%M%S}.zip"
+        writer = RunArchiveWriter(path, {
+            "target_date": target_date.isoformat(),
+            "recorded_at": datetime.now().isoformat(),
+            "duplicate_policy": use_case.duplicate_policy,
+            "publish_mode": use_case.publish_mode,
+            "weekly_digest_enabled": use_case.weekly_digest_enabled,
+            "metadata_fallback": use_case.metadata_fallback,
+            "product_index": use_case.product_index is not None,
+            "ranker": use_case.ranker is not None,
+        })
+        swapped = [
+            (use_case, "product_hunt_service", RecordingProductHuntService(use_case.product_hunt_service, writer)),
+            (use_case, "scraper_service", RecordingScraperService(use_case.scraper_service, writer)),
+            (use_case, "analyzed_products_telegram_channel_service",
+             RecordingTelegramService(use_case.analyzed_products_telegram_channel_service, writer)),
+            (use_case.problem_retriever_agent, "llm",
+             RecordingRunnable(use_case.problem_retriever_agent.llm, writer, "BusinessProblem")),
+            (use_case.product_filter_agent, "llm",
+             RecordingRunnable(use_case.product_filter_agent.llm, writer, "FilterResult")),
+        ]
+        if use_case.ranker is not None:
+            swapped.append((use_case, "ranker", RecordingRanker(use_case.ranker, writer)))
+        if use_case.product_index is not None:
+            swapped.append((use_case, "product_index", RecordingProductIndex(use_case.product_index, writer)))
+
+        originals = [(owner, name, getattr(owner, name)) for owner, name, _ in swapped]
+        for owner, name, recorder in swapped:
+            setattr(owner, name, recorder)
+        started = time.perf_counter()
+        try:
+            await use_case.execute(target_date)
+        finally:
+            for owner, name, original in originals:
+                setattr(owner, name, original)
+            writer.metadata["seconds"] = time.perf_counter() - started
+            writer.metadata["post_seconds"] = use_case.post_seconds
+            writer.close()
+            self.last_archive = path
+            log.info(f"Recorded {len(writer.interactions)} interaction(s) of the run into {path}")
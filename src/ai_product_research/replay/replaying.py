@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel, ValidationError
+
+from ai_product_research.agents import HedgedLlmInvoker, ProblemRetrieverAgent, ProductFilterAgent
+from ai_product_research.domain import AnalyzedProduct, ProductHuntPost, ScrapedPage, Screenshot
+from ai_product_research.replay.archive import Interaction, ReplayedError, RunArchiveReader
+from ai_product_research.replay.recording import posts_key, request_digest
+from ai_product_research.services.product_index import IndexedProduct, IndexMatch
+from ai_product_research.services.trend_aggregates import WeeklyDigest
+from ai_product_research.usecase import TelegramProductsResearchUseCase
+
+log = logging.getLogger(__name__)
+
+
+class _Replayer:
+    """Answers calls from the archive after the recorded latency times ``latency_scale``."""
+
+    def __init__(self, reader: RunArchiveReader, latency_scale: float = 1.0):
+        self._reader = reader
+        self._latency_scale = latency_scale
+
+    async def _replay(self, kind: str, key: str) -> Interaction:
+        interaction = self._reader.take(kind, key)
+        if self._latency_scale > 0:
+            await asyncio.sleep(interaction.latency * self._latency_scale)
+        if interaction.error is not None:
+            raise ReplayedError(interaction.error)
+        return interaction
+
+
+class ReplayProductHuntService(_Replayer):
+    async def get_posts(self, posted_after: datetime, posted_before: datetime, limit: int = 20,
+                        fields: Iterable[str] = (), refresh: bool = False) -> list[ProductHuntPost]:
+        interaction = await self._replay("product_hunt", posts_key(posted_after, posted_before, limit, fields))
+        return [ProductHuntPost.model_validate(post) for post in interaction.data]
+
+
+class ReplayRanker(_Replayer):
+    """Recorded ranking of the day, the learned pass history stays untouched."""
+
+    def rank(self, posts: list[ProductHuntPost]) -> list[ProductHuntPost]:
+        order = {post_id: i for i, post_id in enumerate(self._reader.take("rank", "").data)}
+        return sorted(posts, key=lambda post: order.get(post.id, len(order)))
+
+    def record(self, post: ProductHuntPost, passed: bool) -> None:
+        pass
+
+    def record_run(self, processed_posts: int, published_posts: int) -> None:
+        pass
+
+    def save(self) -> None:
+        pass
+
+
+class ReplayProductIndex(_Replayer):
+    """Recorded duplicate lookups, nothing is indexed or saved."""
+
+    def find_duplicate(self, post: ProductHuntPost) -> IndexMatch | None:
+        data = self._reader.take("duplicate", post.id).data
+        if data is None:
+            return None
+        return IndexMatch(score=data["score"], entry=IndexedProduct.model_validate(data["entry"]))
+
+    def add(self, *args, **kwargs) -> None:
+        pass
+
+    def save(self) -> None:
+        pass
+
+
+class ReplayScraperService(_Replayer):
+    async def fetch(self, url: str) -> ScrapedPage | None:
+        data = (await self._replay("scrape", url)).data
+        if data is None:
+            return None
+        screenshot = Screenshot.from_bytes(self._reader.blob(data["screenshot"])) if data["screenshot"] else None
+        return ScrapedPage(url=data["url"], strategy=data["strategy"], text=data["text"], screenshot=screenshot)
+
+    def retry_report(self) -> dict[str, Any]:
+        return {}
+
+    def fetch_report(self) -> dict[str, Any]:
+        return {}
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class ReplayRunnable(_Replayer):
+    def __init__(self, reader: RunArchiveReader, latency_scale: float, schema: type[BaseModel], include_raw: bool):
+        super().__init__(reader, latency_scale)
+        self.schema = schema
+        self.include_raw = include_raw
+
+    async def ainvoke(self, messages: Any, *args, **kwargs) -> Any:
+        data = (await self._replay(f"llm:{self.schema.__name__}", request_digest(messages))).data
+        parsed = self.schema.model_validate(data["parsed"]) if data["parsed"] is not None else None
+        error = self._parsing_error(data) if data["parsing_error"] else None
+        if not self.include_raw:
+            if error is not None:
+                raise error
+            return parsed
+        raw = AIMessage(content=data.get("raw", ""), usage_metadata=data.get("usage"),
+                        response_metadata={"headers": data["headers"] or {}})
+        return {"raw": raw, "parsed": parsed, "parsing_error": error}
+
+    def _parsing_error(self, data: dict[str, Any]) -> Exception:
+        """The recorded validation error rebuilt as one, so repairs quote the same errors."""
+        if not data.get("validation_errors"):
+            return ReplayedError(data["parsing_error"])
+        try:
+            return ValidationError.from_exception_data(self.schema.__name__, [
+                {"type": item["type"], "loc": tuple(item["loc"]), "input": item["input"],
+                 **({"ctx": item["ctx"]} if item.get("ctx") else {})}
+                for item in data["validation_errors"]
+            ])
+        except (KeyError, TypeError, ValueError):
+            # Custom errors whose context didn't survive JSON
+            return ReplayedError(data["parsing_error"])
+
+
+class ReplayChatModel:
+    """Chat model stand-in answering structured output calls with the recorded answers."""
+
+    def __init__(self, reader: RunArchiveReader, latency_scale: float = 1.0):
+        self.reader = reader
+        self.latency_scale = latency_scale
+
+    def with_structured_output(self, schema: type[BaseModel], method: str | None = None,
+                               include_raw: bool = False) -> ReplayRunnable:
+        return ReplayRunnable(self.reader, self.latency_scale, schema, include_raw)
+
+
+class ReplayTelegramService(_Replayer):
+    """Keeps what the replayed run would have sent instead of sending it."""
+
+    def __init__(self, reader: RunArchiveReader, latency_scale: float = 1.0):
+        super().__init__(reader, latency_scale)
+        self.sent: list[list[str]] = []
+
+    async def send_updates(self, products: list[AnalyzedProduct]) -> None:
+        # The replayed run may publish other products than the recorded one, that is what gets compared
+        interaction = self._reader.take("telegram", "send_updates", required=False)
+        if interaction is not None and self._latency_scale > 0:
+            await asyncio.sleep(interaction.latency * self._latency_scale)
+        self.sent.append([product.name for product in products])
+
+    async def send_weekly_digest(self, digest: WeeklyDigest) -> None:
+        self._reader.take("telegram", "send_weekly_digest", required=False)
+
+
+@dataclass
+class ReplayReport:
+    target_date: date
+    latency_scale: float
+    recorded_seconds: float
+    replayed_seconds: float
+    recorded_post_seconds: list[float]
+    replayed_post_seconds: list[float]
+    # Recorded latency of the external calls by kind, the part scaled on replay
+    external_seconds: dict[str, float] = field(default_factory=dict)
+    published: list[list[str]] = field(default_factory=list)
+    recorded_published: list[list[str]] = field(default_factory=list)
+    fallbacks: int = 0
+
+    @property
+    def same_publication(self) -> bool:
+        return self.published == self.recorded_published
+
+    def summary(self) -> str:
+        external = ", ".join(f"{kind} {seconds:.1f}s" for kind, seconds in sorted(self.external_seconds.items()))
+        return (f"Replayed {self.target_date} at {self.latency_scale:g}x latency in {self.replayed_seconds:.2f}s, "
+                f"recorded run took {self.recorded_seconds:.2f}s (external calls: {external}); "
+                f"{len(self.replayed_post_seconds)} post(s) researched vs {len(self.recorded_post_seconds)} recorded, "
+                f"{self.fallbacks} call(s) matched out of key, "
+                f"publication {'unchanged' if self.same_publication else 'changed'}: {self.published}")
+
+
+class RunReplayer:
+    """Reruns a recorded day offline from its archive through the current code.
+
+    External calls are answered from the recordings after their recorded latency times
+    ``latency_scale``, 0 replays as fast as the code runs. Local state (product index,
+    ranking history, archive, trends) is neither read nor written; the recorded ranking
+    and duplicate lookups stand in for it.
+    """
+
+    def __init__(self, archive: Path, latency_scale: float = 1.0, strict: bool = False):
+        self.archive = archive
+        self.latency_scale = latency_scale
+        self.strict = strict
+
+    def create_use_case(self, reader: RunArchiveReader) -> tuple[TelegramProductsResearchUseCase,
+                                                                   ReplayTelegramService]:
+        metadata = reader.metadata
+        chat_model = ReplayChatModel(reader, self.latency_scale)
+        # Hedged duplicates would consume the recordings of other calls
+        invoker = HedgedLlmInvoker(min_samples=2 ** 31)
+        telegram = ReplayTelegramService(reader, self.latency_scale)
+        use_case = TelegramProductsResearchUseCase(
+            product_hunt_service=ReplayProductHuntService(reader, self.latency_scale),
+            problem_retriever_agent=ProblemRetrieverAgent(chat_model, invoker),
+            scraper_service=ReplayScraperService(reader, self.latency_scale),
+            analyzed_products_telegram_channel_service=telegram,
+            product_filter_agent=ProductFilterAgent(chat_model, invoker),
+            product_index=ReplayProductIndex(reader) if metadata.get("product_index") else None,
+            duplicate_policy=metadata.get("duplicate_policy", "reuse"),
+            ranker=ReplayRanker(reader) if metadata.get("ranker") else None,
+            publish_mode=metadata.get("publish_mode", "batch"),
+            metadata_fallback=metadata.get("metadata_fallback", False),
+        )
+        return use_case, telegram
+
+    async def run(self) -> ReplayReport:
+        reader = RunArchiveReader(self.archive, strict=self.strict)
+        try:
+            use_case, telegram = self.create_use_case(reader)
+            target_date = datetime.fromisoformat(reader.metadata["target_date"])
+            external_seconds: dict[str, float] = defaultdict(float)
+            for interaction in reader.interactions:
+                external_seconds[interaction.kind] += interaction.latency
+            recorded_published = [interaction.data for interaction in reader.interactions
+                                  if interaction.kind == "telegram" and interaction.key == "send_updates"]
+
+            started = time.perf_counter()
+            await use_case.execute(target_date)
+            report = ReplayReport(
+                target_date=target_date.date(),
+                latency_scale=self.latency_scale,
+                recorded_seconds=reader.metadata.get("seconds", 0.0),
+                replayed_seconds=time.perf_counter() - started,
+                recorded_post_seconds=reader.metadata.get("post_seconds", []),
+                replayed_post_seconds=use_case.post_seconds,
+                external_seconds=dict(external_seconds),
+                published=telegram.sent,
+                recorded_published=recorded_published,
+                fallbacks=reader.fallbacks,
+            )
+        finally:
+            reader.close()
+        log.info(report.summary())
+        return report
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class DailyScheduler:
+    """Runs a job once a day at ``hour:minute`` for the previous day.
+
+    The clock and sleep are injectable, so a fake clock can fast-forward the scheduler
+    through many simulated days. An optional warm-up runs ``warm_up_lead`` seconds before
+    each due run, so the run doesn't start cold.
+    """
+    job: Callable[[datetime], Awaitable[None]]
+    tz: ZoneInfo = ZoneInfo("Europe/Paris")
+    hour: int = 6
+    minute: int = 0
+    poll_interval: float = 60.0
+    clock: Callable[[ZoneInfo], datetime] = datetime.now
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    last_execution_date: date | None = None
+    warm_up: Callable[[], Awaitable[Any]] | None = None
+    warm_up_lead: float = 300.0
+    _warmed_up_for: datetime | None = field(default=None, init=False, repr=False)
+
+    @staticmethod
+    def target_date_for(now: datetime) -> datetime:
+        return (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def next_run_at(self, now: datetime) -> datetime:
+        run_at = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if run_at <= now and (now - run_at >= timedelta(minutes=1) or self._executed(now)):
+            run_at += timedelta(days=1)
+        return run_at
+
+    def _executed(self, now: datetime) -> bool:
+        return self.last_execution_date == self.target_date_for(now).date()
+
+    async def warm_up_pending(self) -> bool:
+        """Run the warm-up if the next run is within the lead time, returns True when it ran."""
+        if self.warm_up is None:
+            return False
+        now = self.clock(self.tz)
+        run_at = self.next_run_at(now)
+        if not run_at - timedelta(seconds=self.warm_up_lead) <= now < run_at or self._warmed_up_for == run_at:
+            return False
+        self._warmed_up_for = run_at
+        log.info(f"Warming up for the run at {run_at}")
+        await self.warm_up()
+        return True
+
+    def _next_wake_up(self, now: datetime) -> datetime:
+        run_at = self.next_run_at(now)
+        warm_up_at = run_at - timedelta(seconds=self.warm_up_lead)
+        if self.warm_up is not None and self._warmed_up_for != run_at and now < warm_up_at:
+            return warm_up_at
+        return run_at
+
+    async def run_pending(self) -> bool:
+        """Run the job if it is due, returns True when it ran."""
+        now = self.clock(self.tz)
+        if now.hour != self.hour or now.minute != self.minute or self._executed(now):
+            return False
+        target_date = self.target_date_for(now)
+        log.info(f"Executing for target date: {target_date.date()}")
+        await self.job(target_date)
+        self.last_execution_date = target_date.date()
+        log.info(f"Execution completed for {target_date.date()}")
+        return True
+
+    async def run(self, max_runs: int | None = None) -> None:
+        """Run the job every day, or until it ran ``max_runs`` times."""
+        runs = 0
+        while True:
+            try:
+                await self.warm_up_pending()
+                runs += await self.run_pending()
+                if max_runs is not None and runs >= max_runs:
+                    return
+                now = self.clock(self.tz)
+                await self.sleep(max(0.0, min(self.poll_interval, (self._next_wake_up(now) - now).total_seconds())))
+            except Exception as e:
+                log.error(f"Error in main loop: {e}", exc_info=True)
+                await self.sleep(self.poll_interval)
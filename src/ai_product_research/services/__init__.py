@@ -1,9 +1,23 @@
 from .analyzed_products_telegram_channel_service import AnalyzedProductTelegramChannelService
+from .domain_failures import DomainFailureStore
+from .job_queue import SqliteJobQueue
+from .pass_probability_ranker import PassProbabilityRanker
+from .product_archive import ProductArchive
 from .product_hunt import ProductHuntService
+from .product_index import ProductEmbeddingIndex
+from .publishing import MultiDestinationPublisher
+from .trend_aggregates import TrendAggregator
 from .web_site_scrapper import WebSiteScrapperService
 
 __all__ = [
     "ProductHuntService",
     "WebSiteScrapperService",
     "AnalyzedProductTelegramChannelService",
-]
\ No newline at end of file
+    "ProductEmbeddingIndex",
+    "PassProbabilityRanker",
+    "ProductArchive",
+    "TrendAggregator",
+    "SqliteJobQueue",
+    "DomainFailureStore",
+    "MultiDestinationPublisher",
+]
@@ -1,19 +1,52 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 import httpx
 
+from ai_product_research.deadlines import bounded
 from ai_product_research.domain import AnalyzedProduct
+from ai_product_research.services.message_rendering import TelegramMarkdownRenderer
+from ai_product_research.services.trend_aggregates import WeeklyDigest
 
 logger = logging.getLogger(__name__)
 
+SEND_TIMEOUT = 10.0
+# Past the deadline a message still gets this long, a late digest beats no digest
+MIN_SEND_TIMEOUT = 2.0
+
+
+class TelegramSendError(Exception):
+    """The Bot API refused a message."""
+
 
 @dataclass
 class AnalyzedProductTelegramChannelService:
-    TELEGRAM_MESSAGE_LIMIT = 4096
-
     channel_id: str
     telegram_bot_token: str
+    api_url: str = "https://api.telegram.org"
+    language: str = "en"
+    renderer: TelegramMarkdownRenderer = field(init=False, repr=False)
+    _client: Optional[httpx.AsyncClient] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.renderer = TelegramMarkdownRenderer(self.language)
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        return self._client
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection to the Bot API with a getMe call, nothing is posted."""
+        response = await self._http_client().get(f"{self.api_url}/bot{self.telegram_bot_token}/getMe")
+        if response.status_code != 200:
+            logger.warning(f"Telegram getMe failed: {response.status_code} - {response.text}")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def send_updates(self, products: list[AnalyzedProduct]) -> None:
         if not products:
@@ -22,56 +55,27 @@ class AnalyzedProductTelegramChannelService:
 
         logger.info(f"Sending {len(products)} product(s) to Telegram channel {self.channel_id}")
 
-        batched_messages = self._batch_products_into_messages(products)
+        batched_messages = self.renderer.render_products(products)
 
         for i, message in enumerate(batched_messages, 1):
             await self._send_message(message)
             logger.info(f"Sent message batch {i}/{len(batched_messages)}")
 
-    def _batch_products_into_messages(self, products: list[AnalyzedProduct]) -> list[str]:
-        messages = []
-        current_message_parts = []
-        separator = "\n\n───\n\n"
-
-        for product in products:
-            product_text = self._format_product_message(product)
-
-            if current_message_parts:
-                test_message = separator.join(current_message_parts + [product_text])
-            else:
-                test_message = product_text
-
-            if len(test_message) > self.TELEGRAM_MESSAGE_LIMIT and current_message_parts:
-                messages.append(separator.join(current_message_parts))
-                current_message_parts = []
-
-            current_message_parts.append(product_text)
-
-        if current_message_parts:
-            messages.append(separator.join(current_message_parts))
+    async def send_weekly_digest(self, digest: WeeklyDigest) -> None:
+        logger.info(f"Sending weekly digest {digest.week} to Telegram channel {self.channel_id}")
+        await self._send_message(self._format_weekly_digest(digest))
 
-        return messages
+    def _format_weekly_digest(self, digest: WeeklyDigest) -> str:
+        return self.renderer.format_weekly_digest(digest)
 
-    def _format_product_message(self, product: AnalyzedProduct) -> str:
-        name = self._escape_markdown(product.name)
-        customer = self._escape_markdown(product.problem.primary_customer)
-        job = self._escape_markdown(product.problem.core_job)
-        pain = self._escape_markdown(product.problem.main_pain)
-        metric = self._escape_markdown(product.problem.success_metric)
+    async def deliver(self, text: str) -> None:
+        """Send one rendered MarkdownV2 message to the channel.
 
-        return f"""🚀 *{name}*
-
-💼 *Job to be Done:* {job}
-👥 *Customer:* {customer}
-⚡ *Pain Point:* {pain}
-📊 *Success Metric:* {metric}
-
-🔗 *Links:*
-• [Product Website]({product.product_url})
-• [Original Source]({product.origin_url})"""
-
-    async def _send_message(self, text: str) -> None:
-        url = f"https://api.telegram.org/bot{self.telegram_bot_token}/sendMessage"
+        Raises:
+            TelegramSendError: If the Bot API refused the message
+            httpx.HTTPError: If the request failed
+        """
+        url = f"{self.api_url}/bot{self.telegram_bot_token}/sendMessage"
 
         payload = {
             "chat_id": self.channel_id,
@@ -80,24 +84,20 @@ class AnalyzedProductTelegramChannelService:
             "disable_web_page_preview": False,
         }
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, timeout=10.0)
+        response = await self._http_client().post(url, json=payload,
+                                                  timeout=bounded(SEND_TIMEOUT, floor=MIN_SEND_TIMEOUT))
 
-                if response.status_code != 200:
-                    logger.error(f"Telegram API HTTP error: {response.status_code} - {response.text}")
-                    return
+        if response.status_code != 200:
+            raise TelegramSendError(f"Telegram API HTTP error: {response.status_code} - {response.text}")
 
-                result = response.json()
-                if not result.get("ok"):
-                    error_description = result.get("description", "Unknown error")
-                    logger.error(f"Telegram API error: {error_description}")
+        result = response.json()
+        if not result.get("ok"):
+            raise TelegramSendError(f"Telegram API error: {result.get('description', 'Unknown error')}")
+
+    async def _send_message(self, text: str) -> None:
+        try:
+            await self.deliver(text)
+        except TelegramSendError as e:
+            logger.error(str(e))
         except Exception as e:
             logger.error(f"Failed to send message to Telegram: {e}", exc_info=True)
-
-    @staticmethod
-    def _escape_markdown(text: str) -> str:
-        special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-        for char in special_chars:
-            text = text.replace(char, f'\\{char}')
-        return text
@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+log = logging.getLogger(__name__)
+
+# Failures that cost the full page load timeout, a plain HTTP request would hang the same way
+SLOW_FAILURE_CLASSES = {"timeout", "network"}
+
+
+def domain_of(url: str) -> str:
+    host = (urlparse(url).hostname or url).lower()
+    return host.removeprefix("www.")
+
+
+@dataclass
+class DomainFailure:
+    domain: str
+    failure_class: str
+    # Failure count decayed with the store's half-life, the TTL grows with it
+    score: float = 0.0
+    last_failure: float = 0.0
+    blocked_until: float = 0.0
+    failures: int = 0
+    # Time spent per failure, what skipping the domain saves
+    average_seconds: float = 0.0
+    message: str = ""
+
+
+class DomainFailureStore:
+    """Persistent record of domains that fail to render, by domain and failure class.
+
+    Each failure adds one to a score that halves every ``half_life`` seconds and blocks the
+    domain for ``base_ttl * 2 ** (score - 1)``, capped at ``max_ttl``. A domain failing day
+    after day stays blocked longer and longer, one that failed once long ago gets a short
+    block if it fails again. A successful scrape forgets the domain.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        base_ttl: float = 6 * 3600.0,
+        max_ttl: float = 14 * 24 * 3600.0,
+        half_life: float = 7 * 24 * 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.base_ttl = base_ttl
+        self.max_ttl = max_ttl
+        self.half_life = half_life
+        self.clock = clock
+        self.failures: dict[str, DomainFailure] = {}
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "DomainFailureStore":
+        store = cls(path, **kwargs)
+        if path.exists():
+            for entry in json.loads(path.read_text(encoding="utf-8")):
+                failure = DomainFailure(**entry)
+                store.failures[cls._key(failure.domain, failure.failure_class)] = failure
+            log.info(f"Loaded {len(store.failures)} failing domain record(s) from {path}")
+        return store
+
+    @staticmethod
+    def _key(domain: str, failure_class: str) -> str:
+        return f"{domain}|{failure_class}"
+
+    def blocked(self, domain: str, failure_classes: set[str] | None = None) -> DomainFailure | None:
+        """The failure the domain is currently blocked for, optionally only of the given classes."""
+        now = self.clock()
+        for failure in self.failures.values():
+            if (failure.domain == domain and failure.blocked_until > now
+                    and (failure_classes is None or failure.failure_class in failure_classes)):
+                return failure
+        return None
+
+    def record_failure(self, domain: str, failure_class: str, seconds: float, message: str = "") -> DomainFailure:
+        now = self.clock()
+        key = self._key(domain, failure_class)
+        failure = self.failures.get(key) or DomainFailure(domain, failure_class)
+        elapsed = max(0.0, now - failure.last_failure) if failure.last_failure else 0.0
+        failure.score = failure.score * 0.5 ** (elapsed / self.half_life) + 1.0
+        failure.last_failure = now
+        failure.blocked_until = now + min(self.max_ttl, self.base_ttl * 2 ** (failure.score - 1.0))
+        failure.average_seconds = (failure.average_seconds * failure.failures + seconds) / (failure.failures + 1)
+        failure.failures += 1
+        failure.message = message[:500]
+        self.failures[key] = failure
+        log.info(f"Blocking {domain} for {(failure.blocked_until - now) / 3600:.1f}h after {failure_class} "
+                 f"failure #{failure.failures}")
+        self.save()
+        return failure
+
+    def record_success(self, domain: str) -> None:
+        keys = [key for key, failure in self.failures.items() if failure.domain == domain]
+        if keys:
+            for key in keys:
+                del self.failures[key]
+            self.save()
+
+    def prune(self) -> None:
+        """Forget failures whose block expired and whose score decayed below one failure's worth."""
+        now = self.clock()
+        self.failures = {
+            key: failure for key, failure in self.failures.items()
+            if failure.blocked_until > now
+            or failure.score * 0.5 ** ((now - failure.last_failure) / self.half_life) >= 0.5
+        }
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.prune()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps([asdict(failure) for failure in self.failures.values()]), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    worker_id TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_until);
+CREATE INDEX IF NOT EXISTS jobs_run ON jobs (run_id, position);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    run_id: str
+    position: int
+    payload: dict[str, Any]
+    attempts: int
+
+
+@dataclass
+class JobResult:
+    position: int
+    status: str
+    result: Optional[dict[str, Any]]
+    error: Optional[str]
+
+
+class SqliteJobQueue:
+    """Durable job queue in a SQLite file shared by the processes of one host.
+
+    Workers lease jobs for ``lease_seconds``; a job whose lease expires without being
+    completed (e.g. the worker died) becomes available again. Failed jobs are retried
+    until ``max_attempts`` leases have been used, then marked failed.
+    Job states: pending -> leased -> done | failed | cancelled.
+    """
+
+    def __init__(self, path: Path, lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = connection.execute(sql, parameters).fetchall()
+                connection.execute("COMMIT")
+                return rows
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    async def enqueue(self, run_id: str, payloads: list[dict[str, Any]]) -> None:
+        def insert():
+            with self._connect() as connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany(
+                    "INSERT INTO jobs (id, run_id, position, payload) VALUES (?, ?, ?, ?)",
+                    [(uuid.uuid4().hex, run_id, i, json.dumps(payload)) for i, payload in enumerate(payloads)],
+                )
+                connection.execute("COMMIT")
+
+        await asyncio.to_thread(insert)
+        log.info(f"Enqueued {len(payloads)} job(s) for run {run_id}")
+
+    async def lease(self, worker_id: str) -> Optional[Job]:
+        """Lease the next available job, oldest run and lowest position first."""
+        now = time.time()
+        rows = await asyncio.to_thread(
+            self._execute,
+            """
+            UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_until = ?, worker_id = ?
+            WHERE id = (
+                SELECT id FROM jobs
+                WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?)
+                ORDER BY run_id, position
+                LIMIT 1
+            )
+            RETURNING id, run_id, position, payload, attempts
+            """,
+            (now + self.lease_seconds, worker_id, now),
+        )
+        if not rows:
+            return None
+        job_id, run_id, position, payload, attempts = rows[0]
+        if attempts > self.max_attempts:
+            await self.fail(Job(job_id, run_id, position, {}, attempts), "Lease expired too many times")
+            return await self.lease(worker_id)
+        return Job(job_id, run_id, position, json.loads(payload), attempts)
+
+    async def extend_lease(self, job: Job) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, job.id),
+        )
+
+    async def complete(self, job: Job, result: dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = 'done', result = ?, lease_until = NULL WHERE id = ? AND status = 'leased'",
+            (json.dumps(result), job.id),
+        )
+
+    async def fail(self, job: Job, error: str) -> None:
+        """Release a failed job for a retry, or mark it failed once out of attempts."""
+        status = "failed" if job.attempts >= self.max_attempts else "pending"
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = ?, error = ?, lease_until = NULL WHERE id = ? AND status = 'leased'",
+            (status, error, job.id),
+        )
+        log.warning(f"Job {job.id} of run {job.run_id} failed (attempt {job.attempts}, now {status}): {error}")
+
+    async def cancel_pending(self, run_id: str) -> None:
+        """Cancel jobs of a run that no worker has leased yet."""
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = 'cancelled' WHERE run_id = ? AND status = 'pending'",
+            (run_id,),
+        )
+
+    async def results(self, run_id: str) -> list[JobResult]:
+        """Current state of every job of a run, ordered by position."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT position, status, result, error FROM jobs WHERE run_id = ? ORDER BY position",
+            (run_id,),
+        )
+        return [
+            JobResult(position, status, json.loads(result) if result else None, error)
+            for position, status, result, error in rows
+        ]
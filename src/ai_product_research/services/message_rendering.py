@@ -0,0 +1,149 @@
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any
+
+from ai_product_research.domain import AnalyzedProduct
+from ai_product_research.services.trend_aggregates import WeeklyDigest
+
+MARKDOWN_SPECIAL_CHARS = "_*[]()~`>#+-=|{}.!"
+_MARKDOWN_ESCAPES = str.maketrans({char: f"\\{char}" for char in MARKDOWN_SPECIAL_CHARS})
+TELEGRAM_MESSAGE_LIMIT = 4096
+PRODUCT_SEPARATOR = "\n\n───\n\n"
+
+# Headings of the Telegram messages per language, product texts stay as the agents wrote them
+LABELS = {
+    "en": {
+        "job": "Job to be Done", "customer": "Customer", "pain": "Pain Point", "metric": "Success Metric",
+        "links": "Links", "website": "Product Website", "source": "Original Source",
+        "launched": "What launched in", "posts": "Posts", "analyzed": "analyzed", "passed": "passed",
+        "votes": "Votes", "average": "average", "median": "median", "topics": "Top topics",
+        "topic_posts": "posts", "customers": "Most common customers",
+    },
+    "fr": {
+        "job": "Tâche à accomplir", "customer": "Client", "pain": "Problème", "metric": "Indicateur de succès",
+        "links": "Liens", "website": "Site du produit", "source": "Source d'origine",
+        "launched": "Lancements de la semaine", "posts": "Publications", "analyzed": "analysées",
+        "passed": "retenues", "votes": "Votes", "average": "moyenne", "median": "médiane",
+        "topics": "Thèmes principaux", "topic_posts": "publications", "customers": "Clients les plus fréquents",
+    },
+    "es": {
+        "job": "Trabajo por hacer", "customer": "Cliente", "pain": "Problema", "metric": "Métrica de éxito",
+        "links": "Enlaces", "website": "Sitio del producto", "source": "Fuente original",
+        "launched": "Lanzamientos de la semana", "posts": "Publicaciones", "analyzed": "analizadas",
+        "passed": "aprobadas", "votes": "Votos", "average": "media", "median": "mediana",
+        "topics": "Temas principales", "topic_posts": "publicaciones", "customers": "Clientes más comunes",
+    },
+    "de": {
+        "job": "Zu erledigende Aufgabe", "customer": "Kunde", "pain": "Schmerzpunkt", "metric": "Erfolgskennzahl",
+        "links": "Links", "website": "Produktwebsite", "source": "Originalquelle",
+        "launched": "Neue Produkte der Woche", "posts": "Beiträge", "analyzed": "analysiert",
+        "passed": "bestanden", "votes": "Stimmen", "average": "Durchschnitt", "median": "Median",
+        "topics": "Top-Themen", "topic_posts": "Beiträge", "customers": "Häufigste Kunden",
+    },
+}
+
+
+@lru_cache(maxsize=8192)
+def escape_markdown(text: str) -> str:
+    """Escape Telegram MarkdownV2 special characters, cached as names and labels repeat across messages."""
+    return text.translate(_MARKDOWN_ESCAPES)
+
+
+@dataclass(frozen=True)
+class TelegramMarkdownRenderer:
+    """Renders products and digests as Telegram MarkdownV2 messages with headings in ``language``."""
+    language: str = "en"
+    message_limit: int = TELEGRAM_MESSAGE_LIMIT
+
+    def __post_init__(self):
+        if self.language not in LABELS:
+            raise ValueError(f"No message labels for language {self.language!r}, known: {sorted(LABELS)}")
+
+    @property
+    def key(self) -> str:
+        return f"telegram-markdown-v2:{self.language}:{self.message_limit}"
+
+    def label(self, name: str) -> str:
+        return escape_markdown(LABELS[self.language][name])
+
+    def render_products(self, products: list[AnalyzedProduct]) -> list[str]:
+        """Product messages joined into as few messages as fit the Telegram size limit."""
+        messages = []
+        current_message_parts = []
+
+        for product in products:
+            product_text = self.format_product(product)
+
+            if current_message_parts:
+                test_message = PRODUCT_SEPARATOR.join(current_message_parts + [product_text])
+            else:
+                test_message = product_text
+
+            if len(test_message) > self.message_limit and current_message_parts:
+                messages.append(PRODUCT_SEPARATOR.join(current_message_parts))
+                current_message_parts = []
+
+            current_message_parts.append(product_text)
+
+        if current_message_parts:
+            messages.append(PRODUCT_SEPARATOR.join(current_message_parts))
+
+        return messages
+
+    def format_product(self, product: AnalyzedProduct) -> str:
+        name = escape_markdown(product.name)
+        customer = escape_markdown(product.problem.primary_customer)
+        job = escape_markdown(product.problem.core_job)
+        pain = escape_markdown(product.problem.main_pain)
+        metric = escape_markdown(product.problem.success_metric)
+
+        return f"""🚀 *{name}*
+
+💼 *{self.label("job")}:* {job}
+👥 *{self.label("customer")}:* {customer}
+⚡ *{self.label("pain")}:* {pain}
+📊 *{self.label("metric")}:* {metric}
+
+🔗 *{self.label("links")}:*
+• [{self.label("website")}]({product.product_url})
+• [{self.label("source")}]({product.origin_url})"""
+
+    def render_weekly_digest(self, digest: WeeklyDigest) -> list[str]:
+        return [self.format_weekly_digest(digest)]
+
+    def format_weekly_digest(self, digest: WeeklyDigest) -> str:
+        topics = "\n".join(
+            f"• {escape_markdown(topic.topic)}: {topic.posts} {self.label('topic_posts')}, "
+            f"{escape_markdown(f'{topic.pass_rate:.0%}')} {self.label('passed')}"
+            for topic in digest.top_topics
+        )
+        customers = "\n".join(
+            f"• {escape_markdown(customer)} \\({count}\\)" for customer, count in digest.top_customers
+        )
+        pass_rate = escape_markdown(f"{digest.pass_rate:.0%}")
+        average_votes = escape_markdown(f"{digest.average_votes:.0f}")
+        median_votes = escape_markdown(digest.median_votes_bucket)
+
+        return f"""📈 *{self.label("launched")} {escape_markdown(digest.week)}*
+
+🧮 *{self.label("posts")}:* {digest.posts}, {self.label("analyzed")} {digest.analyzed}, {self.label("passed")} \
+{digest.passed} \\({pass_rate}\\)
+🗳 *{self.label("votes")}:* {self.label("average")} {average_votes}, {self.label("median")} {median_votes}
+
+🏷 *{self.label("topics")}:*
+{topics}
+
+👥 *{self.label("customers")}:*
+{customers}"""
+
+
+@dataclass(frozen=True)
+class JsonRenderer:
+    """Renders products and digests as one JSON document each, for webhooks and file sinks."""
+    key: str = "json"
+
+    def render_products(self, products: list[AnalyzedProduct]) -> list[dict[str, Any]]:
+        return [{"type": "products", "products": [product.model_dump(mode="json") for product in products]}]
+
+    def render_weekly_digest(self, digest: WeeklyDigest) -> list[dict[str, Any]]:
+        return [{"type": "weekly_digest", **asdict(digest)}]
@@ -0,0 +1,99 @@
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "canvas", "iframe", "head"}
+BLOCK_TAGS = {"p", "div", "section", "article", "header", "footer", "main", "li", "ul", "ol", "h1", "h2", "h3",
+              "h4", "h5", "h6", "br", "tr", "td", "th", "blockquote", "pre", "figcaption", "nav", "aside"}
+DESCRIPTION_META = {"description", "og:description", "twitter:description"}
+JS_REQUIRED_PATTERN = re.compile(r"\b(enable|turn on|requires?)\s+javascript\b", re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r"[ \t\r\f\v]+")
+
+
+@dataclass
+class PageText:
+    title: str = ""
+    description: str = ""
+    text: str = ""
+    script_count: int = 0
+    script_bytes: int = 0
+
+    @property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+    def is_spa_shell(self, min_words: int) -> bool:
+        """Whether the server-rendered HTML lacks the content the browser would render.
+
+        A page is treated as a shell when its visible text is shorter than ``min_words``
+        or mostly asks to enable JavaScript.
+        """
+        if self.word_count < min_words:
+            return True
+        return bool(JS_REQUIRED_PATTERN.search(self.text)) and self.word_count < 2 * min_words
+
+    def to_prompt(self, max_chars: int = 12000) -> str:
+        parts = [f"Title: {self.title}" if self.title else "",
+                 f"Description: {self.description}" if self.description else "",
+                 self.text]
+        return "\n\n".join(part for part in parts if part)[:max_chars]
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.page = PageText()
+        self._skip_depth = 0
+        self._in_title = False
+        self._in_script = False
+        self._chunks: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            values = dict(attrs)
+            name = (values.get("name") or values.get("property") or "").lower()
+            if name in DESCRIPTION_META and not self.page.description:
+                self.page.description = (values.get("content") or "").strip()
+        elif tag == "script":
+            self.page.script_count += 1
+            self._in_script = True
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "body":
+            # </head> is optional, nothing before <body> is skipped any more
+            self._skip_depth = 0
+        if tag in BLOCK_TAGS:
+            self._chunks.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag == "script":
+            self._in_script = False
+        if tag in SKIPPED_TAGS and self._skip_depth > 0:
+            self._skip_depth -= 1
+        if tag in BLOCK_TAGS:
+            self._chunks.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.page.title += data.strip()
+        elif self._in_script:
+            self.page.script_bytes += len(data)
+        elif self._skip_depth == 0:
+            self._chunks.append(data)
+
+    def result(self) -> PageText:
+        lines = (WHITESPACE_PATTERN.sub(" ", line).strip() for line in "".join(self._chunks).splitlines())
+        self.page.text = "\n".join(line for line in lines if line)
+        return self.page
+
+
+def extract_page_text(html: str) -> PageText:
+    """Extract the title, meta description and visible text of an HTML document."""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.result()
@@ -0,0 +1,128 @@
+import json
+import logging
+import math
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from ai_product_research.domain import ProductHuntPost
+
+log = logging.getLogger(__name__)
+
+KEYWORD_PATTERN = re.compile(r"[a-z][a-z0-9+#.-]{2,}")
+STOP_WORDS = {
+    "the", "and", "for", "with", "your", "you", "that", "this", "from", "into", "are", "our", "its",
+    "all", "any", "can", "more", "one", "out", "get", "not", "now", "new", "just", "make", "makes",
+    "has", "have", "was", "will", "who", "what", "how", "why", "when", "without", "about", "than",
+}
+
+
+def post_features(post: ProductHuntPost) -> set[str]:
+    """Topics and keywords of a post used as pass-probability features."""
+    features = {f"topic:{topic.lower()}" for topic in post.topics}
+    text = f"{post.name} {post.tagline} {post.description}".lower()
+    features.update(
+        f"word:{word.strip('.-')}" for word in KEYWORD_PATTERN.findall(text)
+        if word.strip(".-") not in STOP_WORDS
+    )
+    return features
+
+
+@dataclass
+class PassHistory:
+    passes: int = 0
+    fails: int = 0
+    features: dict[str, list[int]] = field(default_factory=dict)
+    processed_posts: int = 0
+    published_posts: int = 0
+
+
+class PassProbabilityRanker:
+    """Orders posts by the expected chance of passing the product filter.
+
+    Pass probability is a naive Bayes estimate over Product Hunt topics and keywords,
+    learned from past filter outcomes, and is weighted by the post's share of votes.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        vote_weight: float = 0.3,
+        smoothing: float = 1.0,
+        min_feature_count: int = 2,
+    ):
+        self.path = path
+        self.vote_weight = vote_weight
+        self.smoothing = smoothing
+        self.min_feature_count = min_feature_count
+        self.history = PassHistory()
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "PassProbabilityRanker":
+        ranker = cls(path, **kwargs)
+        if path.exists():
+            ranker.history = PassHistory(**json.loads(path.read_text(encoding="utf-8")))
+            log.info(f"Loaded pass history of {ranker.history.passes + ranker.history.fails} posts from {path}")
+        return ranker
+
+    def pass_probability(self, post: ProductHuntPost) -> float:
+        history = self.history
+        total = history.passes + history.fails
+        prior = (history.passes + self.smoothing) / (total + 2 * self.smoothing)
+        log_odds = math.log(prior / (1 - prior))
+        for feature in post_features(post):
+            passes, fails = history.features.get(feature, (0, 0))
+            if passes + fails < self.min_feature_count:
+                continue
+            # Likelihood ratio of seeing this feature in passed vs failed posts
+            log_odds += math.log(
+                ((passes + self.smoothing) / (history.passes + 2 * self.smoothing))
+                / ((fails + self.smoothing) / (history.fails + 2 * self.smoothing))
+            )
+        log_odds = max(-30.0, min(30.0, log_odds))
+        return 1 / (1 + math.exp(-log_odds))
+
+    def rank(self, posts: list[ProductHuntPost]) -> list[ProductHuntPost]:
+        """Sort posts by pass probability weighted by votes, highest first."""
+        if not posts:
+            return posts
+        max_votes = max(max(post.votesCount for post in posts), 1)
+
+        def score(post: ProductHuntPost) -> float:
+            vote_share = max(post.votesCount, 1) / max_votes
+            return self.pass_probability(post) * vote_share ** self.vote_weight
+
+        ranked = sorted(posts, key=score, reverse=True)
+        log.info("Ranked posts: " + ", ".join(f"{post.name}={score(post):.2f}" for post in ranked))
+        return ranked
+
+    def record(self, post: ProductHuntPost, passed: bool) -> None:
+        """Learn from the filter outcome of a post."""
+        if passed:
+            self.history.passes += 1
+        else:
+            self.history.fails += 1
+        for feature in post_features(post):
+            counts = self.history.features.setdefault(feature, [0, 0])
+            counts[0 if passed else 1] += 1
+
+    def record_run(self, processed_posts: int, published_posts: int) -> None:
+        self.history.processed_posts += processed_posts
+        self.history.published_posts += published_posts
+        log.info(
+            f"Processed {processed_posts} post(s) for {published_posts} published "
+            f"({processed_posts / max(published_posts, 1):.2f} per published post, "
+            f"average {self.average_processed_per_published():.2f})"
+        )
+
+    def average_processed_per_published(self) -> float:
+        return self.history.processed_posts / max(self.history.published_posts, 1)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(self.history)), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,236 @@
+import logging
+import uuid
+from collections.abc import Iterator, Sequence
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ai_product_research.domain import CompactRecord, ProductResearchRecord
+
+log = logging.getLogger(__name__)
+
+SCHEMA = pa.schema([
+    ("date", pa.date32()),
+    ("run_id", pa.string()),
+    ("post_id", pa.string()),
+    ("name", pa.string()),
+    ("tagline", pa.string()),
+    ("description", pa.string()),
+    ("votes", pa.int32()),
+    ("url", pa.string()),
+    ("website", pa.string()),
+    # Topics joined as "|topic|other|" so topic filters push down as substring matches
+    ("topics", pa.string()),
+    ("analyzed", pa.bool_()),
+    ("product_url", pa.string()),
+    ("origin_url", pa.string()),
+    ("primary_customer", pa.string()),
+    ("core_job", pa.string()),
+    ("main_pain", pa.string()),
+    ("success_metric", pa.string()),
+    ("passed", pa.bool_()),
+    ("reason", pa.string()),
+    ("published", pa.bool_()),
+])
+PARTITIONING = ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive")
+# Archive columns in the order ``_from_batch`` unpacks them
+RECORD_COLUMNS = ("run_id", "date", "post_id", "name", "tagline", "description", "votes", "url", "website", "topics",
+                  "analyzed", "origin_url", "product_url", "primary_customer", "core_job", "main_pain",
+                  "success_metric", "passed", "reason", "published")
+TEXT_COLUMNS = ("name", "tagline", "description", "primary_customer", "core_job", "main_pain", "success_metric",
+                "reason")
+
+
+def _to_row(record: ProductResearchRecord) -> dict[str, Any]:
+    post, product, filter_result = record.post, record.product, record.filter_result
+    problem = product.problem if product is not None else None
+    return {
+        "date": record.target_date,
+        "run_id": record.run_id,
+        "post_id": post.id,
+        "name": post.name,
+        "tagline": post.tagline,
+        "description": post.description,
+        "votes": post.votesCount,
+        "url": post.url,
+        "website": post.website,
+        "topics": "|" + "|".join(post.topics) + "|" if post.topics else "",
+        "analyzed": product is not None,
+        "product_url": product.product_url if product is not None else None,
+        "origin_url": product.origin_url if product is not None else None,
+        "primary_customer": problem.primary_customer if problem is not None else None,
+        "core_job": problem.core_job if problem is not None else None,
+        "main_pain": problem.main_pain if problem is not None else None,
+        "success_metric": problem.success_metric if problem is not None else None,
+        "passed": filter_result.passed if filter_result is not None else None,
+        "reason": filter_result.reason if filter_result is not None else None,
+        "published": record.published,
+    }
+
+
+def _from_batch(batch: pa.RecordBatch) -> Iterator[CompactRecord]:
+    """Compact records of a batch, converted column by column instead of into a dict per row."""
+    columns = batch.to_pydict()
+    for (run_id, target_date, post_id, name, tagline, description, votes, url, website, topics, analyzed,
+         origin_url, product_url, primary_customer, core_job, main_pain, success_metric, passed, reason,
+         published) in zip(*(columns[column] for column in RECORD_COLUMNS)):
+        yield CompactRecord(
+            run_id,
+            target_date,
+            post_id,
+            name,
+            tagline,
+            description,
+            votes,
+            url,
+            website,
+            None,
+            tuple(topic for topic in topics.split("|") if topic),
+            origin_url if analyzed else None,
+            product_url if analyzed else None,
+            primary_customer if analyzed else None,
+            core_job if analyzed else None,
+            main_pain if analyzed else None,
+            success_metric if analyzed else None,
+            passed,
+            (reason or "") if passed is not None else None,
+            published,
+        )
+
+
+class ProductArchive:
+    """Columnar archive of research records in zstd-compressed Parquet files, partitioned by
+    the month of the target date (``month=YYYY-MM/``) and sorted by date within each file.
+
+    Every run is appended as its own part file; once a month has more than ``compact_after``
+    parts they are merged into one, so a year of history stays a dozen files to open.
+    Queries prune partitions by month, skip row groups by date statistics and push the other
+    filters down to the Parquet scan, streaming matching rows batch by batch.
+    """
+
+    def __init__(self, directory: Path, compact_after: int = 8):
+        self.directory = directory
+        self.compact_after = compact_after
+
+    def append(self, records: Sequence[ProductResearchRecord]) -> None:
+        if not records:
+            return
+        by_month: dict[str, list[ProductResearchRecord]] = {}
+        for record in records:
+            by_month.setdefault(record.target_date.strftime("%Y-%m"), []).append(record)
+
+        for month, month_records in by_month.items():
+            table = pa.Table.from_pylist([_to_row(record) for record in month_records], schema=SCHEMA)
+            partition = self.directory / f"month={month}"
+            partition.mkdir(parents=True, exist_ok=True)
+            path = partition / f"part-{month_records[0].run_id}-{uuid.uuid4().hex[:8]}.parquet"
+            pq.write_table(table.sort_by("date"), path, compression="zstd")
+            log.info(f"Archived {len(month_records)} record(s) to {path}")
+            if len(list(partition.glob("*.parquet"))) > self.compact_after:
+                self.compact(month)
+
+    def compact(self, month: str) -> None:
+        """Merge all part files of a month into a single file sorted by date."""
+        partition = self.directory / f"month={month}"
+        parts = sorted(partition.glob("*.parquet"))
+        if len(parts) <= 1:
+            return
+        table = pa.concat_tables([pq.read_table(part, schema=SCHEMA) for part in parts]).sort_by("date")
+        path = partition / f"compacted-{uuid.uuid4().hex[:8]}.parquet"
+        tmp_path = path.with_suffix(".tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        tmp_path.rename(path)
+        for part in parts:
+            part.unlink()
+        log.info(f"Compacted {len(parts)} archive part(s) of {month} into {path}")
+
+    def _filter(
+        self,
+        start: Optional[date],
+        end: Optional[date],
+        passed: Optional[bool],
+        topic: Optional[str],
+        text: Optional[str],
+    ) -> Optional[ds.Expression]:
+        conditions = []
+        if start is not None:
+            conditions.append(ds.field("month") >= start.strftime("%Y-%m"))
+            conditions.append(ds.field("date") >= pa.scalar(start, pa.date32()))
+        if end is not None:
+            conditions.append(ds.field("month") <= end.strftime("%Y-%m"))
+            conditions.append(ds.field("date") <= pa.scalar(end, pa.date32()))
+        if passed is not None:
+            conditions.append(ds.field("passed") == passed)
+        if topic is not None:
+            conditions.append(pc.match_substring(ds.field("topics"), f"|{topic}|", ignore_case=True))
+        if text is not None:
+            matches = [pc.match_substring(ds.field(column), text, ignore_case=True) for column in TEXT_COLUMNS]
+            text_condition = matches[0]
+            for match in matches[1:]:
+                text_condition = text_condition | match
+            conditions.append(text_condition)
+
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def scan(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        passed: Optional[bool] = None,
+        topic: Optional[str] = None,
+        text: Optional[str] = None,
+        columns: Optional[list[str]] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream record batches matching all given filters.
+
+        Args:
+            start: First target date to include
+            end: Last target date to include
+            passed: Only products that passed (True) or failed (False) the filter
+            topic: Only posts with this Product Hunt topic, case-insensitive
+            text: Only rows containing this text in the post or analysis, case-insensitive
+            columns: Columns to read, all archive columns by default
+
+        Returns:
+            Iterator over matching record batches
+        """
+        if not self.directory.exists():
+            return iter(())
+        dataset = ds.dataset(self.directory, format="parquet", schema=SCHEMA.append(pa.field("month", pa.string())),
+                             partitioning=PARTITIONING)
+        return dataset.to_batches(columns=columns or SCHEMA.names,
+                                  filter=self._filter(start, end, passed, topic, text))
+
+    def query(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        passed: Optional[bool] = None,
+        topic: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> Iterator[ProductResearchRecord]:
+        """Stream archived research records matching all given filters, see ``scan``."""
+        for record in self.records(start, end, passed, topic, text):
+            yield record.to_model()
+
+    def records(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        passed: Optional[bool] = None,
+        topic: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> Iterator[CompactRecord]:
+        """Like ``query`` but yields compact records, skipping model validation for bulk scans."""
+        for batch in self.scan(start, end, passed, topic, text, columns=list(RECORD_COLUMNS)):
+            yield from _from_batch(batch)
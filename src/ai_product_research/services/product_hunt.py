@@ -1,103 +1,396 @@
-from dataclasses import dataclass
-from datetime import datetime
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
 import httpx
 import logging
 from ai_product_research.domain import ProductHuntPost
 
 log = logging.getLogger(__name__)
 
-@dataclass
-class ProductHuntService:
-    access_token: str
+API_URL = "https://api.producthunt.com/v2/api/graphql"
 
-    async def get_posts(self, posted_after: datetime, posted_before: datetime, limit: int = 20) -> list[ProductHuntPost]:
-        """Get Product Hunt posts for a specific time range.
-
-        Args:
-            posted_after: Start datetime for filtering posts
-            posted_before: End datetime for filtering posts
-            limit: Maximum number of posts to retrieve (default: 50)
-
-        Returns:
-            List of ProductHuntPost objects for the specified time range
-        """
-        url = "https://api.producthunt.com/v2/api/graphql"
-
-        query = """
-        query GetPosts($postedAfter: DateTime!, $postedBefore: DateTime!, $limit: Int!) {
-            posts(order: VOTES, postedAfter: $postedAfter, postedBefore: $postedBefore, first: $limit) {
-                edges {
-                    node {
+BASE_POST_FIELDS = """
                         id
                         name
                         tagline
                         description
                         votesCount
                         url
-                        website
+                        website"""
+
+# Optional post fields the caller can select, nothing the pipeline doesn't read is requested by default
+OPTIONAL_POST_FIELDS = {
+    "thumbnail": """
                         thumbnail {
                             url
-                        }
+                        }""",
+    "topics": """
                         topics {
                             edges {
                                 node {
                                     name
                                 }
                             }
-                        }
-                    }
-                }
-            }
-        }
+                        }""",
+}
+
+# Product Hunt rejects queries whose complexity exceeds this
+MAX_QUERY_COMPLEXITY = 1000
+# Estimated complexity of each optional field per post node, topics is a nested connection
+OPTIONAL_FIELD_COMPLEXITY = {"thumbnail": 1, "topics": 10}
+
+
+class ProductHuntApiError(Exception):
+    def __init__(self, errors: list[dict[str, Any]]):
+        super().__init__(f"Product Hunt API error: {errors}")
+        self.errors = errors
+
+    @property
+    def is_complexity_error(self) -> bool:
+        return any("complexity" in str(error.get("message", "")).lower() for error in self.errors)
+
+
+def estimate_posts_complexity(limit: int, fields: Iterable[str]) -> int:
+    """Estimated complexity of one ``posts`` field, every node of every connection counts."""
+    return 1 + limit * (1 + sum(OPTIONAL_FIELD_COMPLEXITY[name] for name in set(fields)))
+
+
+def _format_datetime(value: datetime) -> str:
+    # Product Hunt expects ISO format datetime strings
+    return value.isoformat() + "Z" if not value.tzinfo else value.isoformat()
+
+
+def _post_fields(fields: Iterable[str]) -> str:
+    unknown = set(fields) - OPTIONAL_POST_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown Product Hunt post fields: {sorted(unknown)}")
+    return BASE_POST_FIELDS + "".join(OPTIONAL_POST_FIELDS[name] for name in sorted(set(fields)))
+
+
+def _posts_query(fields: Iterable[str]) -> str:
+    return f"""
+        query GetPosts($postedAfter: DateTime!, $postedBefore: DateTime!, $limit: Int!) {{
+            posts(order: VOTES, postedAfter: $postedAfter, postedBefore: $postedBefore, first: $limit) {{
+                edges {{
+                    node {{{_post_fields(fields)}
+                    }}
+                }}
+            }}
+        }}
+        """
+
+
+def _post_query(fields: Iterable[str]) -> str:
+    return f"""
+        query GetPost($id: ID!) {{
+            post(id: $id) {{{_post_fields(fields)}
+            }}
+        }}
         """
 
-        # Product Hunt expects ISO format datetime strings
-        posted_after_str = posted_after.isoformat() + "Z" if not posted_after.tzinfo else posted_after.isoformat()
-        posted_before_str = posted_before.isoformat() + "Z" if not posted_before.tzinfo else posted_before.isoformat()
 
+def _posts_variables(posted_after: datetime, posted_before: datetime, limit: int) -> dict[str, Any]:
+    return {
+        "postedAfter": _format_datetime(posted_after),
+        "postedBefore": _format_datetime(posted_before),
+        "limit": limit,
+    }
+
+
+def _snapshot_key(query: str, variables: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps([query, variables]).encode("utf-8")).hexdigest()[:24]
+
+
+@dataclass
+class _DayWindow:
+    posted_after: datetime
+    posted_before: datetime
+    snapshot_key: str
+    closed: bool
+
+
+@dataclass
+class ProductHuntSnapshotStore:
+    """Local store of raw GraphQL responses, one gzipped JSON file per query and day."""
+
+    directory: Path
+
+    def _path(self, posted_after: datetime, key: str) -> Path:
+        return self.directory / posted_after.strftime("%Y-%m-%d") / f"{key}.json.gz"
+
+    def get(self, posted_after: datetime, key: str) -> Optional[dict[str, Any]]:
+        path = self._path(posted_after, key)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def put(self, posted_after: datetime, key: str, data: dict[str, Any]) -> None:
+        path = self._path(posted_after, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class RateLimitState:
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: Optional[float] = None
+
+    def update(self, headers: httpx.Headers) -> None:
+        try:
+            if "x-rate-limit-limit" in headers:
+                self.limit = int(headers["x-rate-limit-limit"])
+            if "x-rate-limit-remaining" in headers:
+                self.remaining = int(headers["x-rate-limit-remaining"])
+            if "x-rate-limit-reset" in headers:
+                # Seconds until the rate limit window resets
+                self.reset_at = time.monotonic() + int(headers["x-rate-limit-reset"])
+        except ValueError:
+            log.warning(f"Unexpected Product Hunt rate limit headers: {dict(headers)}")
+
+    def wait_time(self, min_remaining: int) -> float:
+        if self.remaining is None or self.reset_at is None or self.remaining >= min_remaining:
+            return 0.0
+        return max(0.0, self.reset_at - time.monotonic())
+
+
+@dataclass
+class ProductHuntService:
+    access_token: str
+    snapshot_store: Optional[ProductHuntSnapshotStore] = None
+    min_rate_limit_remaining: int = 100
+    max_query_complexity: int = MAX_QUERY_COMPLEXITY
+    rate_limit: RateLimitState = field(default_factory=RateLimitState)
+    _client: Optional[httpx.AsyncClient] = field(default=None, init=False, repr=False)
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection to the API so the first query skips DNS and TLS setup."""
+        await self._http_client().head(API_URL)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_posts(
+        self,
+        posted_after: datetime,
+        posted_before: datetime,
+        limit: int = 20,
+        fields: Iterable[str] = (),
+        refresh: bool = False,
+    ) -> list[ProductHuntPost]:
+        """Get Product Hunt posts for a specific time range.
+
+        Responses for time ranges that have already ended are kept in the snapshot store,
+        and reruns for the same range and fields are served from it.
+
+        Args:
+            posted_after: Start datetime for filtering posts
+            posted_before: End datetime for filtering posts
+            limit: Maximum number of posts to retrieve (default: 20)
+            fields: Optional post fields to request, any of "thumbnail" and "topics" (default: none)
+            refresh: Ignore the snapshot store and query the API (default: False)
+
+        Returns:
+            List of ProductHuntPost objects for the specified time range
+        """
+        query = _posts_query(fields)
+        variables = _posts_variables(posted_after, posted_before, limit)
+        snapshot_key = _snapshot_key(query, variables)
+        window_closed = self._is_past(posted_before)
+        data = None
+        if self.snapshot_store is not None and window_closed and not refresh:
+            data = self.snapshot_store.get(posted_after, snapshot_key)
+            if data is not None:
+                log.info(f"Serving Product Hunt posts from {posted_after} to {posted_before} from snapshot")
+
+        if data is None:
+            log.info(f"Fetching Product Hunt posts from {posted_after} to {posted_before}")
+            data = await self._execute_query(query, variables)
+            if self.snapshot_store is not None and window_closed:
+                self.snapshot_store.put(posted_after, snapshot_key, data)
+
+        edges = data.get("data", {}).get("posts", {}).get("edges", [])
+        log.info(f"Retrieved {len(edges)} posts")
+        return self._parse_posts(edges)
+
+    async def get_post(self, post_id: str, fields: Iterable[str] = ()) -> Optional[ProductHuntPost]:
+        """Get a single Product Hunt post by its ID, always from the API.
+
+        Args:
+            post_id: ID of the post
+            fields: Optional post fields to request, any of "thumbnail" and "topics" (default: none)
+
+        Returns:
+            The post, or None if Product Hunt doesn't know it
+        """
+        log.info(f"Fetching Product Hunt post {post_id}")
+        data = await self._execute_query(_post_query(fields), {"id": post_id})
+        node = (data.get("data") or {}).get("post")
+        return self._parse_posts([{"node": node}])[0] if node else None
+
+    async def get_posts_bulk(
+        self,
+        days: Iterable[datetime],
+        limit: int = 20,
+        fields: Iterable[str] = (),
+        refresh: bool = False,
+    ) -> dict[date, list[ProductHuntPost]]:
+        """Get Product Hunt posts of many days in as few requests as possible.
+
+        Every day is a 24 hour window from the given datetime. Windows are fetched as aliased
+        ``posts`` fields of one GraphQL query, split into as many queries as needed to stay
+        under ``max_query_complexity``. Snapshots are shared with ``get_posts``, so days
+        fetched either way are served locally afterwards.
+
+        Args:
+            days: Start datetimes of the days to fetch
+            limit: Maximum number of posts to retrieve per day (default: 20)
+            fields: Optional post fields to request, any of "thumbnail" and "topics" (default: none)
+            refresh: Ignore the snapshot store and query the API (default: False)
+
+        Returns:
+            Posts of every day in vote order, keyed by the day's date in ascending order
+        """
+        fields = tuple(fields)
+        query = _posts_query(fields)
+        posts_by_day: dict[date, list[ProductHuntPost]] = {}
+        missing: list[_DayWindow] = []
+        for posted_after in days:
+            posted_before = posted_after + timedelta(days=1)
+            window = _DayWindow(posted_after, posted_before,
+                                _snapshot_key(query, _posts_variables(posted_after, posted_before, limit)),
+                                self._is_past(posted_before))
+            data = None
+            if self.snapshot_store is not None and window.closed and not refresh:
+                data = self.snapshot_store.get(posted_after, window.snapshot_key)
+            if data is not None:
+                posts_by_day[posted_after.date()] = self._parse_posts(data["data"]["posts"]["edges"])
+            else:
+                missing.append(window)
+
+        days_per_query = max(1, self.max_query_complexity // estimate_posts_complexity(limit, fields))
+        chunks = [missing[i:i + days_per_query] for i in range(0, len(missing), days_per_query)]
+        log.info(f"Fetching Product Hunt posts of {len(missing)} day(s) in {len(chunks)} request(s), "
+                 f"{len(posts_by_day)} day(s) served from snapshot")
+        for chunk in chunks:
+            for window, data in await self._fetch_windows(chunk, limit, fields):
+                if self.snapshot_store is not None and window.closed:
+                    self.snapshot_store.put(window.posted_after, window.snapshot_key, data)
+                posts_by_day[window.posted_after.date()] = self._parse_posts(data["data"]["posts"]["edges"])
+
+        return dict(sorted(posts_by_day.items()))
+
+    async def _fetch_windows(self, windows: list[_DayWindow], limit: int,
+                             fields: tuple[str, ...]) -> list[tuple[_DayWindow, dict[str, Any]]]:
+        """Fetch day windows with one aliased query, halving it while the API finds it too complex."""
+        parameters = ["$limit: Int!"]
+        selections = []
+        variables: dict[str, Any] = {"limit": limit}
+        for i, window in enumerate(windows):
+            parameters.append(f"$postedAfter{i}: DateTime!, $postedBefore{i}: DateTime!")
+            selections.append(f"""
+            day{i}: posts(order: VOTES, postedAfter: $postedAfter{i}, postedBefore: $postedBefore{i}, first: $limit) {{
+                edges {{
+                    node {{{_post_fields(fields)}
+                    }}
+                }}
+            }}""")
+            variables[f"postedAfter{i}"] = _format_datetime(window.posted_after)
+            variables[f"postedBefore{i}"] = _format_datetime(window.posted_before)
+        query = f"""
+        query GetPostsBulk({", ".join(parameters)}) {{{"".join(selections)}
+        }}
+        """
+
+        try:
+            data = await self._execute_query(query, variables)
+        except ProductHuntApiError as e:
+            if not e.is_complexity_error or len(windows) == 1:
+                raise
+            middle = len(windows) // 2
+            log.warning(f"Product Hunt query of {len(windows)} day(s) is too complex, splitting it")
+            return (await self._fetch_windows(windows[:middle], limit, fields)
+                    + await self._fetch_windows(windows[middle:], limit, fields))
+
+        # Each alias is stored like the response of a single day query
+        return [(window, {"data": {"posts": data["data"][f"day{i}"]}}) for i, window in enumerate(windows)]
+
+    async def _execute_query(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
         headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
         }
+        payload = {"query": query, "variables": variables}
 
-        payload = {
-            "query": query,
-            "variables": {
-                "postedAfter": posted_after_str,
-                "postedBefore": posted_before_str,
-                "limit": limit,
-            }
-        }
+        client = self._http_client()
+        for attempt in range(2):
+            wait_time = self.rate_limit.wait_time(self.min_rate_limit_remaining)
+            if wait_time > 0:
+                log.warning(f"Product Hunt rate limit nearly exhausted "
+                            f"({self.rate_limit.remaining}/{self.rate_limit.limit}), waiting {wait_time:.0f}s")
+                await asyncio.sleep(wait_time)
 
-        async with httpx.AsyncClient() as client:
-            log.info(f"Fetching Product Hunt posts from {posted_after} to {posted_before}")
-            response = await client.post(url, json=payload, headers=headers)
+            response = await client.post(API_URL, json=payload, headers=headers)
+            self.rate_limit.update(response.headers)
+            if response.status_code == 429 and attempt == 0:
+                log.warning("Product Hunt rate limit exceeded, retrying after reset")
+                self.rate_limit.remaining = 0
+                if self.rate_limit.reset_at is None or self.rate_limit.reset_at <= time.monotonic():
+                    self.rate_limit.reset_at = time.monotonic() + 60
+                continue
             response.raise_for_status()
+            break
+
+        data = response.json()
+
+        if "errors" in data:
+            log.error(f"Product Hunt API errors: {data['errors']}")
+            raise ProductHuntApiError(data["errors"])
+
+        return data
+
+    @staticmethod
+    def _parse_posts(edges: list[dict[str, Any]]) -> list[ProductHuntPost]:
+        # Convert raw dict data to ProductHuntPost models
+        posts = []
+        for edge in edges:
+            node = edge["node"]
+            post = ProductHuntPost(
+                id=node["id"],
+                name=node["name"],
+                tagline=node["tagline"],
+                description=node["description"],
+                votesCount=node["votesCount"],
+                url=node["url"],
+                website=node["website"],
+                thumbnail_url=node.get("thumbnail", {}).get("url") if node.get("thumbnail") else None,
+                topics=[edge["node"]["name"] for edge in (node.get("topics") or {}).get("edges", [])]
+            )
+            posts.append(post)
+
+        return posts
 
-            data = response.json()
-
-            if "errors" in data:
-                log.error(f"Product Hunt API errors: {data['errors']}")
-                raise Exception(f"Product Hunt API error: {data['errors']}")
-
-            edges = data.get("data", {}).get("posts", {}).get("edges", [])
-            log.info(f"Retrieved {len(edges)} posts")
-
-            # Convert raw dict data to ProductHuntPost models
-            posts = []
-            for edge in edges:
-                node = edge["node"]
-                post = ProductHuntPost(
-                    id=node["id"],
-                    name=node["name"],
-                    tagline=node["tagline"],
-                    description=node["description"],
-                    votesCount=node["votesCount"],
-                    url=node["url"],
-                    website=node["website"],
-                    thumbnail_url=node.get("thumbnail", {}).get("url") if node.get("thumbnail") else None,
-                    topics=[edge["node"]["name"] for edge in node.get("topics", {}).get("edges", [])]
-                )
-                posts.append(post)
-
-            return posts
+    @staticmethod
+    def _is_past(value: datetime) -> bool:
+        now = datetime.now(value.tzinfo) if value.tzinfo else datetime.now(timezone.utc).replace(tzinfo=None)
+        return value <= now
@@ -0,0 +1,173 @@
+import logging
+import os
+import re
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from ai_product_research.domain import AnalyzedProduct, ProductHuntPost
+
+log = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 512
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def post_text(post: ProductHuntPost) -> str:
+    return f"{post.name}\n{post.tagline}\n{post.description}"
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Embed text locally with the hashing trick over words and character trigrams.
+
+    Args:
+        text: Text to embed
+        dim: Dimension of the embedding
+
+    Returns:
+        L2-normalized float32 vector, all zeros for text without words
+    """
+    features = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        features.append(word)
+        padded = f"<{word}>"
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    vector = np.zeros(dim, dtype=np.float32)
+    if not features:
+        return vector
+
+    hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.uint32,
+                         count=len(features))
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, hashes % dim, signs)
+    # Sublinear term frequency so repeated words don't dominate
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class IndexedProduct(BaseModel):
+    post_id: str
+    product: AnalyzedProduct
+    passed: bool | None = None
+    reason: str | None = None
+    indexed_at: datetime
+
+
+@dataclass
+class IndexMatch:
+    score: float
+    entry: IndexedProduct
+
+
+class ProductEmbeddingIndex:
+    """Cosine-similarity index over previously analyzed products.
+
+    Embeddings are kept in a NumPy matrix (one normalized row per product) and persisted
+    next to a JSON lines file with the matching ``IndexedProduct`` entries.
+    """
+
+    MATRIX_FILE = "embeddings.npy"
+    ENTRIES_FILE = "products.jsonl"
+
+    def __init__(self, directory: Path | None = None, similarity_threshold: float = 0.85, dim: int = EMBEDDING_DIM):
+        self.directory = directory
+        self.similarity_threshold = similarity_threshold
+        self.dim = dim
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._entries: list[IndexedProduct] = []
+        self._positions: dict[str, int] = {}
+
+    @classmethod
+    def load(cls, directory: Path, similarity_threshold: float = 0.85,
+             dim: int = EMBEDDING_DIM) -> "ProductEmbeddingIndex":
+        index = cls(directory, similarity_threshold, dim)
+        matrix_path = directory / cls.MATRIX_FILE
+        entries_path = directory / cls.ENTRIES_FILE
+        if not matrix_path.exists() or not entries_path.exists():
+            return index
+
+        matrix = np.load(matrix_path)
+        with entries_path.open(encoding="utf-8") as f:
+            entries = [IndexedProduct.model_validate_json(line) for line in f if line.strip()]
+        if matrix.shape != (len(entries), dim):
+            log.warning(f"Ignoring inconsistent product index at {directory}: matrix {matrix.shape}, "
+                        f"{len(entries)} entries")
+            return index
+
+        index._matrix = matrix.astype(np.float32, copy=False)
+        index._size = len(entries)
+        index._entries = entries
+        index._positions = {entry.post_id: i for i, entry in enumerate(entries)}
+        log.info(f"Loaded product index with {len(entries)} products from {directory}")
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, post: ProductHuntPost, product: AnalyzedProduct, passed: bool | None = None,
+            reason: str | None = None) -> None:
+        """Index an analyzed post, replacing a previous entry for the same post."""
+        entry = IndexedProduct(post_id=post.id, product=product, passed=passed, reason=reason,
+                               indexed_at=datetime.now())
+        vector = embed_text(post_text(post), self.dim)
+
+        position = self._positions.get(post.id)
+        if position is None:
+            position = self._size
+            self._grow(position + 1)
+            self._entries.append(entry)
+            self._positions[post.id] = position
+            self._size += 1
+        else:
+            self._entries[position] = entry
+        self._matrix[position] = vector
+
+    def query(self, text: str, k: int = 5) -> list[IndexMatch]:
+        """Return the top-k most similar indexed products by cosine similarity."""
+        if self._size == 0 or k <= 0:
+            return []
+
+        scores = self._matrix[:self._size] @ embed_text(text, self.dim)
+        k = min(k, self._size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [IndexMatch(score=float(scores[i]), entry=self._entries[i]) for i in top]
+
+    def find_duplicate(self, post: ProductHuntPost) -> IndexMatch | None:
+        """Return the closest previously analyzed product if it passes the similarity threshold."""
+        matches = self.query(post_text(post), k=1)
+        if matches and matches[0].score >= self.similarity_threshold:
+            return matches[0]
+        return None
+
+    def save(self) -> None:
+        if self.directory is None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        matrix_tmp = self.directory / f"{self.MATRIX_FILE}.tmp"
+        entries_tmp = self.directory / f"{self.ENTRIES_FILE}.tmp"
+        with matrix_tmp.open("wb") as f:
+            np.save(f, self._matrix[:self._size])
+        with entries_tmp.open("w", encoding="utf-8") as f:
+            for entry in self._entries:
+                f.write(entry.model_dump_json())
+                f.write("\n")
+        os.replace(matrix_tmp, self.directory / self.MATRIX_FILE)
+        os.replace(entries_tmp, self.directory / self.ENTRIES_FILE)
+        log.info(f"Saved product index with {self._size} products to {self.directory}")
+
+    def _grow(self, size: int) -> None:
+        if size <= self._matrix.shape[0]:
+            return
+        capacity = max(size, 2 * self._matrix.shape[0], 64)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
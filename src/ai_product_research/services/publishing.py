@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+import httpx
+
+from ai_product_research.deadlines import bounded
+from ai_product_research.domain import AnalyzedProduct
+from ai_product_research.services.analyzed_products_telegram_channel_service import \
+    AnalyzedProductTelegramChannelService
+from ai_product_research.services.message_rendering import JsonRenderer
+from ai_product_research.services.rate_limiter import AsyncRateLimiter
+from ai_product_research.services.trend_aggregates import WeeklyDigest
+
+log = logging.getLogger(__name__)
+
+# Past the run deadline a destination still gets this long, a late digest beats no digest
+MIN_PUBLISH_TIMEOUT = 2.0
+
+
+class MessageRenderer(Protocol):
+    # Destinations whose renderers share a key get the very same rendered messages
+    key: str
+
+    def render_products(self, products: list[AnalyzedProduct]) -> list[Any]: ...
+
+    def render_weekly_digest(self, digest: WeeklyDigest) -> list[Any]: ...
+
+
+class Destination(Protocol):
+    name: str
+    renderer: MessageRenderer
+
+    async def deliver(self, message: Any) -> None: ...
+
+
+class TelegramDestination:
+    """A Telegram channel, in the language of its service's renderer."""
+
+    def __init__(self, service: AnalyzedProductTelegramChannelService):
+        self.service = service
+        self.name = f"telegram:{service.channel_id}:{service.language}"
+        self.renderer = service.renderer
+
+    async def deliver(self, message: str) -> None:
+        await self.service.deliver(message)
+
+    async def warm_up(self) -> None:
+        await self.service.warm_up()
+
+    async def close(self) -> None:
+        await self.service.close()
+
+
+class WebhookDestination:
+    """POSTs every message as JSON to ``url``, for internal consumers of the digest."""
+
+    def __init__(self, url: str, headers: Optional[dict[str, str]] = None, timeout: float = 10.0):
+        self.url = url
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.name = f"webhook:{url}"
+        self.renderer = JsonRenderer()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def deliver(self, message: dict[str, Any]) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.post(self.url, json=message, headers=self.headers,
+                                            timeout=bounded(self.timeout, floor=MIN_PUBLISH_TIMEOUT))
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FileDestination:
+    """Appends every message as a JSON line to ``path``."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = f"file:{path}"
+        self.renderer = JsonRenderer()
+
+    async def deliver(self, message: dict[str, Any]) -> None:
+        line = json.dumps(message, ensure_ascii=False) + "\n"
+        await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line)
+
+
+@dataclass
+class RouteStats:
+    publishes: int = 0
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+    timeouts: int = 0
+    last_seconds: Optional[float] = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "publishes": self.publishes,
+            "sent": self.sent,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "timeouts": self.timeouts,
+            "last_seconds": self.last_seconds,
+        }
+
+
+@dataclass
+class PublishRoute:
+    """A destination with its own send rate, time budget per publish and failure counters.
+
+    Args:
+        destination: Where messages go
+        rate: Messages per second, unlimited if None
+        burst: Messages that may go out at once before the rate applies
+        timeout: Seconds one publish may spend on this destination
+        max_consecutive_failures: Failed messages in a row after which the rest of a publish is skipped
+    """
+    destination: Destination
+    rate: Optional[float] = None
+    burst: int = 1
+    timeout: float = 60.0
+    max_consecutive_failures: int = 3
+    stats: RouteStats = field(default_factory=RouteStats)
+    limiter: Optional[AsyncRateLimiter] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.rate is not None:
+            self.limiter = AsyncRateLimiter(self.rate, self.burst)
+
+
+class MultiDestinationPublisher:
+    """Publishes products and weekly digests to several destinations at once.
+
+    Messages are rendered once per renderer key, so channels sharing a format and language
+    share the rendering, then every destination is sent its messages concurrently. Each
+    route paces its own sends and has its own time budget; a failing or slow destination
+    is logged and counted without delaying or failing the others.
+
+    Has the ``send_updates``/``send_weekly_digest`` interface of the Telegram channel service,
+    so the use case publishes through either.
+    """
+
+    def __init__(self, routes: Iterable[PublishRoute]):
+        self.routes = list(routes)
+
+    async def send_updates(self, products: list[AnalyzedProduct]) -> None:
+        if not products:
+            log.info("No products to publish")
+            return
+        log.info(f"Publishing {len(products)} product(s) to {len(self.routes)} destination(s)")
+        await self._publish(lambda renderer: renderer.render_products(products))
+
+    async def send_weekly_digest(self, digest: WeeklyDigest) -> None:
+        log.info(f"Publishing weekly digest {digest.week} to {len(self.routes)} destination(s)")
+        await self._publish(lambda renderer: renderer.render_weekly_digest(digest))
+
+    async def warm_up(self) -> None:
+        await asyncio.gather(*(route.destination.warm_up() for route in self.routes
+                               if hasattr(route.destination, "warm_up")))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(route.destination.close() for route in self.routes
+                               if hasattr(route.destination, "close")), return_exceptions=True)
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Sent, failed and skipped messages per destination."""
+        return {route.destination.name: route.stats.snapshot() for route in self.routes}
+
+    async def _publish(self, render: Callable[[MessageRenderer], list[Any]]) -> None:
+        rendered: dict[str, list[Any]] = {}
+        for route in self.routes:
+            renderer = route.destination.renderer
+            if renderer.key not in rendered:
+                rendered[renderer.key] = render(renderer)
+        await asyncio.gather(*(self._dispatch(route, rendered[route.destination.renderer.key])
+                               for route in self.routes))
+
+    async def _dispatch(self, route: PublishRoute, messages: list[Any]) -> None:
+        name, stats = route.destination.name, route.stats
+        stats.publishes += 1
+        started = time.perf_counter()
+        done = 0
+        try:
+            async with asyncio.timeout(bounded(route.timeout, floor=MIN_PUBLISH_TIMEOUT)):
+                consecutive_failures = 0
+                for message in messages:
+                    if consecutive_failures >= route.max_consecutive_failures:
+                        log.error(f"Skipping the rest of the publish to {name} "
+                                  f"after {consecutive_failures} failed message(s)")
+                        break
+                    if route.limiter is not None:
+                        await route.limiter.acquire()
+                    try:
+                        await route.destination.deliver(message)
+                    except Exception as e:
+                        consecutive_failures += 1
+                        stats.failed += 1
+                        log.error(f"Failed to publish to {name}: {e}")
+                    else:
+                        consecutive_failures = 0
+                        stats.sent += 1
+                    done += 1
+        except TimeoutError:
+            stats.timeouts += 1
+            log.warning(f"Publishing to {name} ran out of time after {done}/{len(messages)} message(s)")
+        stats.skipped += len(messages) - done
+        stats.last_seconds = time.perf_counter() - started
+        log.info(f"Done publishing to {name}: {done}/{len(messages)} message(s) attempted "
+                 f"in {stats.last_seconds:.2f}s")
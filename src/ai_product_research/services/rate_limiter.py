@@ -0,0 +1,44 @@
+import asyncio
+import random
+import time
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter.
+
+    Args:
+        attempt: Retry attempt number starting from 1
+        base: Delay in seconds of the first attempt before jitter
+        cap: Maximum delay in seconds
+
+    Returns:
+        Random delay between 0 and ``min(cap, base * 2 ** (attempt - 1))``
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class AsyncRateLimiter:
+    """Token bucket limiting how often an operation may start.
+
+    Args:
+        rate: Tokens added per second
+        burst: Maximum number of tokens that can be spent at once
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,209 @@
+import json
+import logging
+import math
+import os
+import re
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+from ai_product_research.domain import ProductResearchRecord
+
+log = logging.getLogger(__name__)
+
+# Vote histogram buckets by powers of two: 0-1, 2-3, 4-7, ..., 512+
+VOTE_BUCKETS = 10
+CUSTOMER_SEGMENT_SPLIT = re.compile(r",|;|\band\b|\bor\b|&|/")
+CUSTOMER_CLAUSE_END = re.compile(r"\b(who|that|which|looking|seeking|needing|wanting|trying)\b|\(|:|\.")
+
+
+def vote_bucket(votes: int) -> int:
+    return min(VOTE_BUCKETS - 1, max(votes, 1).bit_length() - 1)
+
+
+def customer_segments(primary_customer: str) -> list[str]:
+    """Short customer segments of a primary customer description.
+
+    "Content creators and social media marketers who produce short videos"
+    gives ["content creators", "social media marketers"].
+    """
+    head = CUSTOMER_CLAUSE_END.split(primary_customer.lower(), maxsplit=1)[0]
+    segments = []
+    for segment in CUSTOMER_SEGMENT_SPLIT.split(head):
+        words = segment.split()
+        if words:
+            segments.append(" ".join(words[-4:]))
+    return segments
+
+
+@dataclass
+class TrendCounters:
+    posts: int = 0
+    analyzed: int = 0
+    passed: int = 0
+    published: int = 0
+    votes_sum: int = 0
+    votes_histogram: list[int] = field(default_factory=lambda: [0] * VOTE_BUCKETS)
+    # topic -> [posts, passed]
+    topics: dict[str, list[int]] = field(default_factory=dict)
+    customers: dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: "TrendCounters", sign: int = 1, max_customers: int = 50) -> None:
+        """Add (or with ``sign=-1`` subtract) another bucket's counters in place."""
+        self.posts += sign * other.posts
+        self.analyzed += sign * other.analyzed
+        self.passed += sign * other.passed
+        self.published += sign * other.published
+        self.votes_sum += sign * other.votes_sum
+        for i, count in enumerate(other.votes_histogram):
+            self.votes_histogram[i] += sign * count
+        for topic, (posts, passed) in other.topics.items():
+            counts = self.topics.setdefault(topic, [0, 0])
+            counts[0] += sign * posts
+            counts[1] += sign * passed
+            if counts[0] <= 0:
+                del self.topics[topic]
+        for customer, count in other.customers.items():
+            total = self.customers.get(customer, 0) + sign * count
+            if total > 0:
+                self.customers[customer] = total
+            else:
+                self.customers.pop(customer, None)
+        # Keep only the most common customers so buckets stay small however long history gets
+        if len(self.customers) > 2 * max_customers:
+            top = sorted(self.customers.items(), key=lambda item: item[1], reverse=True)[:max_customers]
+            self.customers = dict(top)
+
+    @classmethod
+    def from_records(cls, records: Sequence[ProductResearchRecord]) -> "TrendCounters":
+        counters = cls()
+        for record in records:
+            counters.posts += 1
+            counters.votes_sum += record.post.votesCount
+            counters.votes_histogram[vote_bucket(record.post.votesCount)] += 1
+            counters.analyzed += record.product is not None
+            counters.passed += record.passed
+            counters.published += record.published
+            for topic in record.post.topics:
+                topic_counts = counters.topics.setdefault(topic, [0, 0])
+                topic_counts[0] += 1
+                topic_counts[1] += record.passed
+            if record.product is not None:
+                for segment in customer_segments(record.product.problem.primary_customer):
+                    counters.customers[segment] = counters.customers.get(segment, 0) + 1
+        return counters
+
+
+@dataclass
+class TopicTrend:
+    topic: str
+    posts: int
+    pass_rate: float
+
+
+@dataclass
+class WeeklyDigest:
+    week: str
+    posts: int
+    analyzed: int
+    passed: int
+    pass_rate: float
+    average_votes: float
+    median_votes_bucket: str
+    top_topics: list[TopicTrend]
+    top_customers: list[tuple[str, int]]
+
+
+def week_key(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class TrendAggregator:
+    """Rolling per-day, per-week and per-topic counters fed incrementally by every run.
+
+    A rerun for the same day replaces that day's contribution instead of adding to it.
+    Daily buckets older than ``day_retention`` days are dropped; weekly and topic buckets
+    are kept, so the stored state grows by one small bucket per week.
+    """
+
+    def __init__(self, path: Optional[Path] = None, day_retention: int = 120):
+        self.path = path
+        self.day_retention = day_retention
+        self.days: dict[str, TrendCounters] = {}
+        self.weeks: dict[str, TrendCounters] = {}
+        self.topics = TrendCounters()
+
+    @classmethod
+    def load(cls, path: Path, day_retention: int = 120) -> "TrendAggregator":
+        aggregator = cls(path, day_retention)
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            aggregator.days = {key: TrendCounters(**value) for key, value in data["days"].items()}
+            aggregator.weeks = {key: TrendCounters(**value) for key, value in data["weeks"].items()}
+            aggregator.topics = TrendCounters(**data["topics"])
+        return aggregator
+
+    def record_run(self, target_date: date, records: Sequence[ProductResearchRecord]) -> None:
+        day = target_date.isoformat()
+        counters = TrendCounters.from_records(records)
+        week = self.weeks.setdefault(week_key(target_date), TrendCounters())
+
+        previous = self.days.get(day)
+        if previous is not None:
+            week.merge(previous, sign=-1)
+            self.topics.merge(previous, sign=-1)
+        week.merge(counters)
+        self.topics.merge(counters)
+        self.days[day] = counters
+
+        cutoff = (target_date - timedelta(days=self.day_retention)).isoformat()
+        for old_day in [key for key in self.days if key < cutoff]:
+            del self.days[old_day]
+        log.info(f"Updated trend aggregates for {day}: {counters.posts} post(s), {counters.passed} passed")
+
+    def weekly_digest(self, week: str, top: int = 5) -> Optional[WeeklyDigest]:
+        """Digest of one ISO week (e.g. "2025-W02"), computed from that week's bucket only."""
+        counters = self.weeks.get(week)
+        if counters is None or counters.posts == 0:
+            return None
+
+        top_topics = sorted(counters.topics.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        top_customers = sorted(counters.customers.items(), key=lambda item: item[1], reverse=True)[:top]
+        return WeeklyDigest(
+            week=week,
+            posts=counters.posts,
+            analyzed=counters.analyzed,
+            passed=counters.passed,
+            pass_rate=counters.passed / counters.analyzed if counters.analyzed else 0.0,
+            average_votes=counters.votes_sum / counters.posts,
+            median_votes_bucket=self._median_bucket(counters.votes_histogram),
+            top_topics=[TopicTrend(topic, posts, passed / posts) for topic, (posts, passed) in top_topics],
+            top_customers=top_customers,
+        )
+
+    @staticmethod
+    def _median_bucket(histogram: list[int]) -> str:
+        half = math.ceil(sum(histogram) / 2)
+        seen = 0
+        for i, count in enumerate(histogram):
+            seen += count
+            if seen >= half:
+                low = 0 if i == 0 else 2 ** i
+                return f"{low}+" if i == VOTE_BUCKETS - 1 else f"{low}-{2 ** (i + 1) - 1}"
+        return "0-1"
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "days": {key: asdict(value) for key, value in self.days.items()},
+            "weeks": {key: asdict(value) for key, value in self.weeks.items()},
+            "topics": asdict(self.topics),
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
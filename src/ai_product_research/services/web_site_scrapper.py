@@ -1,108 +1,490 @@
+import asyncio
 import logging
+import time
+from collections import Counter
+from collections.abc import Collection
 from typing import Optional
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright, Browser, Page, Playwright, Error as PlaywrightError, \
+    TimeoutError as PlaywrightTimeoutError
 import httpx
 
+from ai_product_research.deadlines import bounded, deadline_expired, remaining
+from ai_product_research.domain import Screenshot, ScrapedPage
+from ai_product_research.services.domain_failures import SLOW_FAILURE_CLASSES, DomainFailure, DomainFailureStore, \
+    domain_of
+from ai_product_research.services.page_text import PageText, extract_page_text
+from ai_product_research.services.rate_limiter import AsyncRateLimiter, backoff_delay
+
 log = logging.getLogger(__name__)
 
+VIEWPORT_WIDTH = 1920
+VIEWPORT_HEIGHT = 1080
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/131.0.0.0 Safari/537.36')
+# Launch args to appear more like a real browser
+BROWSER_ARGS = ['--disable-blink-features=AutomationControlled']
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_NETWORK_ERRORS = (
+    "net::ERR_CONNECTION_RESET",
+    "net::ERR_CONNECTION_CLOSED",
+    "net::ERR_EMPTY_RESPONSE",
+    "net::ERR_TIMED_OUT",
+    "net::ERR_NETWORK_CHANGED",
+)
+# Failures that say nothing about the site, they don't block its domain
+UNRECORDED_FAILURE_CLASSES = {"error", "deadline"}
+# Hosts of links that only redirect to the product, their domain says nothing about the product's site
+REDIRECT_DOMAINS = frozenset({"producthunt.com"})
+MAX_REDIRECT_HOPS = 5
+# Titles of bot checks served instead of the page
+CHALLENGE_TITLES = {"Just a moment...", "Attention Required! | Cloudflare", "Access denied", "Access Denied"}
+
+
+class RetryableScrapeError(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None, failure_class: str = "http_error"):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.failure_class = failure_class
+
+
+class BlockedScrapeError(Exception):
+    """The site answered with a bot check instead of the page."""
+
+
+class ScrapeFailedError(Exception):
+    def __init__(self, message: str, failure_class: str):
+        super().__init__(message)
+        self.failure_class = failure_class
+
+
+class KnownFailingDomainError(Exception):
+    def __init__(self, failure: DomainFailure):
+        super().__init__(f"{failure.domain} is blocked after {failure.failures} {failure.failure_class} failure(s)")
+        self.failure = failure
+
 
 class WebSiteScrapperService:
-    def __init__(self, timeout: int = 30000):
+    def __init__(
+        self,
+        timeout: int = 30000,
+        max_page_height: int = 8000,
+        spool_dir: Optional[str] = None,
+        max_retries: int = 2,
+        backoff_base: float = 2.0,
+        backoff_cap: float = 30.0,
+        per_host_concurrency: int = 2,
+        rate_limit: float = 1.0,
+        rate_burst: int = 3,
+        fast_path: bool = True,
+        min_text_words: int = 80,
+        max_html_bytes: int = 2 * 1024 * 1024,
+        failure_store: Optional[DomainFailureStore] = None,
+        redirect_domains: Collection[str] = REDIRECT_DOMAINS,
+    ):
         """
         Initialize the web scraper service.
 
         Args:
             timeout: Timeout in milliseconds for page load (default: 30000ms = 30s)
+            max_page_height: Maximum height in pixels of the captured page (default: 8000px)
+            spool_dir: Directory for temporary screenshot files (default: system temp dir)
+            max_retries: Retries of timeouts, 429/5xx responses and connection resets (default: 2)
+            backoff_base: Base delay in seconds of the jittered exponential backoff (default: 2s)
+            backoff_cap: Maximum backoff delay in seconds (default: 30s)
+            per_host_concurrency: Maximum concurrent scrapes of the same host (default: 2)
+            rate_limit: Scrapes started per second across all hosts (default: 1)
+            rate_burst: Scrapes that may start at once before the rate limit applies (default: 3)
+            fast_path: Try plain HTTP and local HTML parsing before launching a browser (default: True)
+            min_text_words: Visible words the HTML needs to skip the browser (default: 80)
+            max_html_bytes: Maximum HTML bytes downloaded by the fast path (default: 2MB)
+            failure_store: Domains that recently failed to render, skipped until their block expires (default: none)
+            redirect_domains: Domains of redirect links, followed to the product and never blocked (default: Product Hunt)
         """
         self.timeout = timeout
+        self.max_page_height = max_page_height
+        self.spool_dir = spool_dir
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.per_host_concurrency = per_host_concurrency
+        self.rate_limiter = AsyncRateLimiter(rate_limit, rate_burst)
+        self.retry_counts: Counter[str] = Counter()
+        self.failure_counts: Counter[str] = Counter()
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self.fast_path = fast_path
+        self.min_text_words = min_text_words
+        self.max_html_bytes = max_html_bytes
+        self.failure_store = failure_store
+        self.redirect_domains = frozenset(redirect_domains)
+        self.failure_skips: Counter[str] = Counter()
+        self.failure_seconds_avoided = 0.0
+        self.path_counts: Counter[str] = Counter()
+        self.path_seconds: Counter[str] = Counter()
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_semaphores[host]
+
+    def retry_report(self) -> dict[str, dict[str, int]]:
+        """Retries and final failures per host since the service was created."""
+        hosts = self.retry_counts.keys() | self.failure_counts.keys()
+        return {
+            host: {"retries": self.retry_counts[host], "failures": self.failure_counts[host]}
+            for host in sorted(hosts)
+        }
+
+    def fetch_report(self) -> dict[str, float]:
+        """Pages served by each path and the browser time the HTTP fast path saved."""
+        http, browser = self.path_counts["http"], self.path_counts["browser"]
+        average_http = self.path_seconds["http"] / http if http else 0.0
+        average_browser = self.path_seconds["browser"] / browser if browser else 0.0
+        return {
+            "http": http,
+            "browser": browser,
+            "http_share": http / (http + browser) if http + browser else 0.0,
+            "average_http_seconds": round(average_http, 3),
+            "average_browser_seconds": round(average_browser, 3),
+            # Estimated from the average browser scrape, only known once a page needed the browser
+            "estimated_seconds_saved": round(max(0.0, average_browser - average_http) * http, 1),
+            "escalation_seconds": round(self.path_seconds["escalation"], 1),
+            # Estimated from the average duration of the failures of the skipped domains
+            "failure_skips": sum(self.failure_skips.values()),
+            "failure_seconds_avoided": round(self.failure_seconds_avoided, 1),
+        }
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=self.timeout / 1000,
+                headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                event_hooks={"request": [self._check_domain]},
+            )
+        return self._http_client
 
-    async def _resolve_redirects(self, url: str) -> Optional[str]:
+    async def start(self) -> None:
+        """Launch a browser shared by all scrapes until ``close``, instead of one per scrape."""
+        if self._browser is not None and self._browser.is_connected():
+            return
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+        log.info("Launched shared browser")
+
+    async def close(self) -> None:
+        """Close the shared browser and the pooled HTTP client."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def _check_domain(self, request: httpx.Request) -> None:
+        # Redirects are requested through the hook too, so a slow domain is caught before connecting
+        if self.failure_store is None:
+            return
+        domain = domain_of(str(request.url))
+        if domain in self.redirect_domains:
+            return
+        failure = self.failure_store.blocked(domain, SLOW_FAILURE_CLASSES)
+        if failure is not None:
+            raise KnownFailingDomainError(failure)
+
+    def _skip(self, url: str, failure: DomainFailure) -> None:
+        self.failure_skips[failure.failure_class] += 1
+        self.failure_seconds_avoided += failure.average_seconds
+        log.info(f"Skipping {url[:80]}...: {failure.domain} failed {failure.failures} time(s) with "
+                 f"{failure.failure_class}, about {failure.average_seconds:.0f}s avoided")
+
+    @staticmethod
+    def _budget_ms(milliseconds: float) -> float:
+        # Playwright reads a timeout of 0 as no timeout at all
+        return bounded(milliseconds / 1000, floor=0.001) * 1000
+
+    def _clip_height(self, page_height: int) -> int:
+        return max(1, min(page_height, self.max_page_height))
+
+    async def _resolve_target(self, url: str) -> str:
         """
-        Follow redirects to get the final URL.
+        Follow the redirects of links on ``redirect_domains`` without requesting the product's site.
 
         Args:
             url: The URL that may redirect
 
         Returns:
-            The final URL after following redirects, or None if failed
+            The first URL off the redirect domains, or the last one reached if resolving failed
         """
+        current = url
         try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-                # Use GET with stream to avoid downloading full content
-                async with client.stream("GET", url) as response:
+            for _ in range(MAX_REDIRECT_HOPS):
+                if domain_of(current) not in self.redirect_domains:
+                    break
+                async with self._client().stream("GET", current, follow_redirects=False,
+                                                  timeout=bounded(10.0, floor=0.1)) as response:
+                    location = response.headers.get("location")
+                    if not response.is_redirect or not location:
+                        break
+                    current = str(response.url.join(location))
+        except httpx.HTTPError as e:
+            log.warning(f"Failed to resolve redirects for {url[:80]}...: {e!r}")
+        if current != url:
+            log.info(f"Resolved {url[:80]}... -> {current[:80]}")
+        return current
+
+    async def _capture(self, page: Page) -> Screenshot:
+        """Capture the page clipped to ``max_page_height`` into a spooled file."""
+        # Pages without a document element report no height, capture one viewport of them
+        page_height = int(await page.evaluate("() => document.documentElement.scrollHeight") or VIEWPORT_HEIGHT)
+        clip_height = self._clip_height(page_height)
+        if clip_height < page_height:
+            log.info(f"Clipping page height from {page_height}px to {clip_height}px")
+
+        screenshot = Screenshot.spooled(self.spool_dir)
+        try:
+            # Playwright also returns the bytes; drop them right away and keep only the file
+            await page.screenshot(
+                path=str(screenshot.path),
+                full_page=True,
+                clip={'x': 0, 'y': 0, 'width': VIEWPORT_WIDTH, 'height': clip_height},
+                type='png',
+            )
+        except BaseException:
+            screenshot.close()
+            raise
+        return screenshot
+
+    async def fetch(self, url: str) -> Optional[ScrapedPage]:
+        """
+        Fetch a website's content the cheapest way that is good enough to analyze.
+
+        The HTML is first downloaded over the pooled HTTP client and parsed locally. When its
+        visible text is meaningful the page is returned as text and no browser is launched;
+        SPA shells, non-HTML responses and failed downloads escalate to a browser screenshot.
+
+        With a failure store, domains whose browser scrape recently failed are skipped instead
+        of waiting for the same failure again; slow failures (timeouts, network errors) skip
+        the HTTP request as well.
+
+        Inside a ``deadline_scope`` every step gets no more than the time left, and nothing
+        is fetched once it passed.
+
+        Args:
+            url: The URL to fetch
+
+        Returns:
+            ScrapedPage with either the page text or a screenshot, or None if both paths fail
+            or the domain is known to fail. The caller must close it.
+        """
+        if deadline_expired():
+            log.warning(f"No time left to fetch {url[:80]}...")
+            return None
+        started = time.perf_counter()
+        target = await self._resolve_target(url)
+        final_url = None
+        try:
+            if self.fast_path:
+                page_text, final_url = await self._fetch_page_text(target)
+                if page_text is not None and not page_text.is_spa_shell(self.min_text_words):
+                    self._record_path("http", started)
+                    log.info(f"Fetched {url[:80]}... without a browser: {page_text.word_count} words")
+                    return ScrapedPage(url=url, strategy="http", text=page_text.to_prompt())
+                self._record_path("escalation", started, count=False)
+        except KnownFailingDomainError as e:
+            self._skip(url, e.failure)
+            return None
+
+        # Failures are known by the product's domain, never by the redirect link's
+        domain = next((domain_of(candidate) for candidate in (final_url, target)
+                       if candidate is not None and domain_of(candidate) not in self.redirect_domains), None)
+        failure = self.failure_store.blocked(domain) if self.failure_store is not None and domain else None
+        if failure is not None:
+            self._skip(url, failure)
+            return None
+
+        started = time.perf_counter()
+        # Scraped by the resolved URL, so per-host limits and retry counts apply to the product's host
+        if self.failure_store is not None:
+            screenshot = await self.scrape(target, failure_domain=domain)
+        else:
+            screenshot = await self.scrape(target)
+        if screenshot is None:
+            return None
+        self._record_path("browser", started)
+        return ScrapedPage(url=url, strategy="browser", screenshot=screenshot)
+
+    def _record_path(self, path: str, started: float, count: bool = True) -> None:
+        if count:
+            self.path_counts[path] += 1
+        self.path_seconds[path] += time.perf_counter() - started
+
+    async def _fetch_page_text(self, url: str) -> tuple[Optional[PageText], Optional[str]]:
+        """Download and parse the page's HTML, returns the text if any and the final URL if reached."""
+        host = urlparse(url).hostname or url
+        try:
+            async with self._host_semaphore(host):
+                await self.rate_limiter.acquire()
+                async with self._client().stream("GET", url, timeout=bounded(self.timeout / 1000, floor=0.1)) \
+                        as response:
                     final_url = str(response.url)
-                    log.info(f"Resolved {url[:80]}... -> {final_url}")
-                    return final_url
-        except Exception as e:
-            log.warning(f"Failed to resolve redirects for {url[:80]}...: {e}")
-            return url  # Return original URL if redirect resolution fails
+                    content_type = response.headers.get("content-type", "")
+                    if response.status_code != 200 or "html" not in content_type:
+                        log.info(f"Fast path skipped for {url[:80]}...: HTTP {response.status_code} {content_type}")
+                        return None, final_url
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body += chunk
+                        if len(body) >= self.max_html_bytes:
+                            break
+                    encoding = response.encoding or "utf-8"
+        except httpx.HTTPError as e:
+            log.info(f"Fast path failed for {url[:80]}...: {e!r}")
+            return None, None
+        # Parsing a large document takes a while, keep it off the event loop
+        return await asyncio.to_thread(extract_page_text, body.decode(encoding, errors="replace")), final_url
 
-    async def scrape(self, url: str) -> Optional[bytes]:
+    async def scrape(self, url: str, failure_domain: Optional[str] = None) -> Optional[Screenshot]:
         """
         Scrape a website and return a full-page screenshot.
         Uses Playwright with Chromium to render React/SPA sites.
 
+        Scrapes are rate limited globally and per host, and retryable failures
+        (timeouts, 429/5xx responses, connection resets) are retried with jittered
+        exponential backoff. Redirect links are resolved first, so the host is the product's.
+
         Args:
             url: The URL to scrape
+            failure_domain: Domain the outcome is recorded under in the failure store (default: not recorded)
 
         Returns:
-            Screenshot bytes (PNG format) of the full page, or None if scraping fails
+            Screenshot (PNG format) of the page clipped to ``max_page_height`` and spooled
+            to a temporary file, or None if scraping fails. The caller must close it.
         """
+        started = time.perf_counter()
+        url = await self._resolve_target(url)
         try:
-            async with async_playwright() as p:
-                # Launch browser with args to appear more like a real browser
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=['--disable-blink-features=AutomationControlled']
-                )
-
-                # Create context with realistic settings
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                    viewport={'width': 1920, 'height': 1080}
-                )
+            screenshot = await self._scrape_with_retries(url)
+        except ScrapeFailedError as e:
+            # Unclassified errors are more likely ours than the site's, they don't block the domain
+            if (self.failure_store is not None and failure_domain is not None
+                    and e.failure_class not in UNRECORDED_FAILURE_CLASSES):
+                self.failure_store.record_failure(failure_domain, e.failure_class, time.perf_counter() - started,
+                                                  str(e))
+            return None
+        if self.failure_store is not None and failure_domain is not None:
+            self.failure_store.record_success(failure_domain)
+        return screenshot
 
-                page = await context.new_page()
+    async def _scrape_with_retries(self, url: str) -> Screenshot:
+        host = urlparse(url).hostname or url
+        attempt = 0
+        while True:
+            try:
+                async with self._host_semaphore(host):
+                    await self.rate_limiter.acquire()
+                    return await self._scrape_once(url)
+            except (RetryableScrapeError, PlaywrightTimeoutError) as e:
+                delay = backoff_delay(attempt + 1, self.backoff_base, self.backoff_cap)
+                if isinstance(e, RetryableScrapeError) and e.retry_after is not None:
+                    delay = max(delay, min(e.retry_after, self.backoff_cap))
+                left = remaining()
+                if attempt >= self.max_retries or (left is not None and left <= delay):
+                    self.failure_counts[host] += 1
+                    log.warning(f"Giving up scraping {url[:80]}... after {attempt + 1} attempts: {e}")
+                    failure_class = e.failure_class if isinstance(e, RetryableScrapeError) else "timeout"
+                    if left is not None and left <= delay:
+                        # A timeout cut short by the deadline isn't the site's fault
+                        failure_class = "deadline" if failure_class == "timeout" else failure_class
+                    raise ScrapeFailedError(str(e), failure_class) from e
+                attempt += 1
+                self.retry_counts[host] += 1
+                log.info(f"Retrying {url[:80]}... in {delay:.1f}s (attempt {attempt}/{self.max_retries}): {e}")
+                await asyncio.sleep(delay)
+            except BlockedScrapeError as e:
+                self.failure_counts[host] += 1
+                log.warning(f"Blocked scraping {url[:80]}...: {e}")
+                raise ScrapeFailedError(str(e), "blocked") from e
+            except Exception as e:
+                self.failure_counts[host] += 1
+                log.error(f"Error scraping {url[:80]}...: {str(e)}")
+                raise ScrapeFailedError(str(e), "error") from e
 
-                # Remove webdriver detection
-                await page.add_init_script("""
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    })
-                """)
+    async def _scrape_once(self, url: str) -> Screenshot:
+        try:
+            if self._browser is not None and self._browser.is_connected():
+                return await self._scrape_page(self._browser, url)
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True, args=BROWSER_ARGS)
+                try:
+                    return await self._scrape_page(browser, url)
+                finally:
+                    await browser.close()
+        except PlaywrightTimeoutError:
+            raise
+        except PlaywrightError as e:
+            if any(error in str(e) for error in RETRYABLE_NETWORK_ERRORS):
+                raise RetryableScrapeError(str(e), failure_class="network") from e
+            raise
 
-                log.info(f"Scraping {url[:80]}...")
+    async def _scrape_page(self, browser: Browser, url: str) -> Screenshot:
+        # Create context with realistic settings
+        context = await browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={'width': VIEWPORT_WIDTH, 'height': VIEWPORT_HEIGHT}
+        )
+        try:
+            page = await context.new_page()
 
-                # Navigate to the page and let Playwright handle redirects
-                await page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
+            # Remove webdriver detection
+            await page.add_init_script("""
+                Object.defineProperty(navigator, 'webdriver', {
+                    get: () => undefined
+                })
+            """)
 
-                # Wait for navigation to complete (handles JS redirects)
-                try:
-                    # Wait up to 5 seconds for potential JavaScript redirects
-                    await page.wait_for_load_state("networkidle", timeout=5000)
-                except Exception:
-                    # If no additional navigation happens, that's fine
-                    pass
+            log.info(f"Scraping {url[:80]}...")
 
-                # Get the final URL after all redirects
-                final_url = page.url
-                log.info(f"Final URL: {final_url[:80]}...")
+            # Navigate to the page and let Playwright handle redirects
+            response = await page.goto(url, timeout=self._budget_ms(self.timeout), wait_until="domcontentloaded")
+            if response is not None and response.status in RETRYABLE_STATUS_CODES:
+                retry_after = response.headers.get("retry-after")
+                raise RetryableScrapeError(
+                    f"HTTP {response.status}",
+                    retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+                )
+            if response is not None and (response.headers.get("cf-mitigated") == "challenge"
+                                         or response.status == 403 and await page.title() in CHALLENGE_TITLES):
+                raise BlockedScrapeError(f"HTTP {response.status} bot check")
 
-                # Wait a bit for any dynamic content to load
-                await page.wait_for_timeout(2000)
+            # Wait for navigation to complete (handles JS redirects)
+            try:
+                # Wait up to 5 seconds for potential JavaScript redirects
+                await page.wait_for_load_state("networkidle", timeout=self._budget_ms(5000))
+            except Exception:
+                # If no additional navigation happens, that's fine
+                pass
 
-                # Take a full-page screenshot
-                screenshot_bytes = await page.screenshot(full_page=True, type='png')
+            # Get the final URL after all redirects
+            final_url = page.url
+            log.info(f"Final URL: {final_url[:80]}...")
 
-                await context.close()
-                await browser.close()
+            # Wait a bit for any dynamic content to load
+            await page.wait_for_timeout(self._budget_ms(2000))
 
-                log.info(f"Successfully scraped {final_url[:80]}... - screenshot size: {len(screenshot_bytes)} bytes")
-                return screenshot_bytes
+            # Take a full-page screenshot clipped to the maximum height
+            screenshot = await self._capture(page)
 
-        except PlaywrightTimeoutError:
-            log.warning(f"Timeout while scraping {url[:80]}...")
-            return None
-        except Exception as e:
-            log.error(f"Error scraping {url[:80]}...: {str(e)}")
-            return None
+            log.info(f"Successfully scraped {final_url[:80]}... - screenshot size: {screenshot.size} bytes")
+            return screenshot
+        finally:
+            await context.close()
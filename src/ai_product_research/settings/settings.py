@@ -1,20 +1,76 @@
 import logging
+from datetime import time
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 from rich.console import Console
 from rich.logging import RichHandler
 
+from ai_product_research.structured_logging import ContextTextFormatter, JsonFormatter, configure_logging
+
 
 class AppSettings(BaseSettings):
     openai_api_key: str
     model_name: str = "gpt-5.2"
     telegram_bot_token: str
     telegram_channel_id: str
+    telegram_language: str = "en"
+    # More channels getting the same products, as "channel_id" or "channel_id:language"
+    telegram_extra_channels: list[str] = []
+    # Telegram allows about 20 messages a minute to one channel
+    telegram_messages_per_second: float = 0.33
+    # JSON copies of every publish for internal consumers
+    publish_webhook_url: str | None = None
+    publish_file: str | None = None
     debug: bool = False
     product_hunt_api_key: str
     product_hunt_api_secret: str
     product_hunt_dev_token: str
     google_api_key: str
+    data_dir: str = "data"
+    duplicate_similarity_threshold: float = 0.85
+    duplicate_policy: Literal["reuse", "skip"] = "reuse"
+    weekly_digest_enabled: bool = False
+    # Record every run's external interactions into data_dir/recordings for offline replay
+    record_runs: bool = False
+    publish_mode: Literal["batch", "stream"] = "batch"
+    # Time of day (scheduler timezone) the products must be published by, whatever is researched by then
+    digest_deadline: time | None = None
+    post_deadline_seconds: float | None = 300.0
+    publish_reserve_seconds: float = 60.0
+    scrape_max_retries: int = 2
+    scrape_per_host_concurrency: int = 2
+    scrape_rate_limit: float = 1.0
+    scrape_fast_path: bool = True
+    scrape_min_text_words: int = 80
+    # Skip domains that recently failed to render, remembered in data_dir/domain_failures.json
+    scrape_failure_cache: bool = True
+    scrape_metadata_fallback: bool = True
+    admin_host: str = "127.0.0.1"
+    admin_port: int | None = None
+    # On-demand analysis API, off unless a port is set
+    analysis_api_host: str = "127.0.0.1"
+    analysis_api_port: int | None = None
+    analysis_concurrency: int = 4
+    analysis_max_queue: int = 32
+    analysis_cache_ttl_seconds: float = 24 * 3600.0
+    llm_request_timeout: float = 60.0
+    llm_call_deadline: float = 150.0
+    llm_hedge_percentile: float = 0.95
+    llm_initial_concurrency: float = 4.0
+    llm_max_concurrency: float = 32.0
+    batch_llm_poll_seconds: float = 60.0
+    # Text-only calls fixing an invalid problem answer before the screenshot is sent again
+    problem_repair_attempts: int = 2
+    warm_up_lead_seconds: float = 300.0
+    job_queue_enabled: bool = False
+    worker_mode: bool = False
+    job_lease_seconds: float = 300.0
+    job_max_attempts: int = 3
+    # JSON log lines, by default unless debug mode renders them with rich
+    log_json: bool | None = None
+    log_max_chars: int = 2000
+    log_payload_sample_rate: float = 0.05
 
     class Config:
         env_file = ".env"
@@ -24,20 +80,29 @@ class AppSettings(BaseSettings):
 def init_app_settings() -> AppSettings:
     settings = AppSettings() # type: ignore
 
-    if settings.debug:
+    # Handlers run on the queue listener's thread, the event loop only enqueues records
+    log_json = settings.log_json if settings.log_json is not None else not settings.debug
+    if log_json:
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+    elif settings.debug:
         console = Console(width=200, force_terminal=True, color_system="auto")
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(message)s",
-            handlers=[RichHandler(
-                rich_tracebacks=True,
-                markup=True,
-                console=console,
-                show_time=True,
-                show_path=False,
-            )]
+        handler = RichHandler(
+            rich_tracebacks=True,
+            markup=True,
+            console=console,
+            show_time=True,
+            show_path=False,
         )
+        handler.setFormatter(ContextTextFormatter("%(message)s"))
     else:
-        logging.basicConfig(level=logging.INFO)
+        handler = logging.StreamHandler()
+        handler.setFormatter(ContextTextFormatter(logging.BASIC_FORMAT))
+    configure_logging(
+        handler,
+        level=logging.INFO,
+        max_chars=settings.log_max_chars,
+        payload_sample_rate=settings.log_payload_sample_rate,
+    )
 
     return settings
\ No newline at end of file
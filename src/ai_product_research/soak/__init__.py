@@ -0,0 +1,4 @@
+from .harness import SoakConfig, SoakHarness
+from .report import GrowthLimit, SoakReport, check_growth
+
+__all__ = ["SoakConfig", "SoakHarness", "SoakReport", "GrowthLimit", "check_growth"]
@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from ai_product_research.soak.harness import SoakConfig, SoakHarness
+from ai_product_research.soak.report import GrowthLimit
+
+
+def parse_args() -> SoakConfig:
+    parser = argparse.ArgumentParser(description="Soak test the daily research scheduler against local fakes")
+    parser.add_argument("--days", type=int, default=300, help="Simulated days to run")
+    parser.add_argument("--max-posts", type=int, default=1000, help="Largest synthetic Product Hunt day")
+    parser.add_argument("--pass-rate", type=float, default=0.05, help="Share of products passing the filter")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    parser.add_argument("--scraper", choices=["http", "chromium"], default="chromium",
+                        help="Render every page in the browser or let the fast path read it")
+    parser.add_argument("--output", type=Path, default=Path("soak-report"))
+    parser.add_argument("--max-rss-growth", type=float, default=32.0, help="MiB per 100 runs")
+    parser.add_argument("--max-fd-growth", type=float, default=2.0, help="Descriptors per 100 runs")
+    parser.add_argument("--max-child-growth", type=float, default=1.0, help="Processes per 100 runs")
+    args = parser.parse_args()
+    return SoakConfig(
+        days=args.days,
+        max_posts=args.max_posts,
+        pass_rate=args.pass_rate,
+        llm_latency=args.llm_latency,
+        scraper=args.scraper,
+        output_dir=args.output,
+        limits=[
+            GrowthLimit("rss_mib", args.max_rss_growth),
+            GrowthLimit("open_fds", args.max_fd_growth),
+            GrowthLimit("child_processes", args.max_child_growth),
+        ],
+    )
+
+
+def main() -> int:
+    config = parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("ai_product_research.soak").setLevel(logging.INFO)
+    report = asyncio.run(SoakHarness(config).run())
+    for violation in report.violations:
+        print(f"FAIL: {violation}")
+    print(f"{len(report.samples)} run(s), report: {report.csv_path}, chart: {report.chart_path}")
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import asyncio
+import random
+import zlib
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from ai_product_research.admin.http import HttpRequest, HttpResponse, start_http_server
+from ai_product_research.domain import ProductHuntPost
+
+WORDS = ["ai", "agent", "notes", "calendar", "invoice", "video", "editor", "crm", "sales", "team", "code",
+         "review", "budget", "design", "email", "chat", "search", "docs", "hiring", "analytics"]
+TOPICS = ["Artificial Intelligence", "Productivity", "Developer Tools", "Marketing", "Design Tools", "SaaS",
+          "Fintech", "Education"]
+
+
+class FakeClock:
+    """Clock whose sleep advances time instantly, for fast-forwarding the scheduler."""
+
+    def __init__(self, start: datetime):
+        self.current = start
+
+    def now(self, tz: ZoneInfo | None = None) -> datetime:
+        return self.current.astimezone(tz) if tz is not None else self.current
+
+    async def sleep(self, seconds: float) -> None:
+        self.current += timedelta(seconds=seconds)
+        await asyncio.sleep(0)
+
+
+class FakeStructuredModel:
+    def __init__(self, schema: type[BaseModel], latency: float, pass_rate: float, include_raw: bool = False):
+        self.schema = schema
+        self.latency = latency
+        self.pass_rate = pass_rate
+        self.include_raw = include_raw
+
+    async def ainvoke(self, messages: Any) -> BaseModel | dict[str, Any]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        digest = zlib.crc32(str(messages[-1].content)[:4096].encode("utf-8"))
+        values = {}
+        for name, info in self.schema.model_fields.items():
+            if info.annotation is bool:
+                values[name] = digest % 10_000 < self.pass_rate * 10_000
+            else:
+                values[name] = f"Synthetic {name.replace('_', ' ')} {digest % 997}"
+        parsed = self.schema.model_validate(values)
+        if self.include_raw:
+            return {"raw": AIMessage(content="", response_metadata={"headers": {}}), "parsed": parsed,
+                    "parsing_error": None}
+        return parsed
+
+
+class FakeChatModel:
+    """Chat model stand-in answering structured output requests with deterministic values.
+
+    Boolean fields (e.g. ``FilterResult.passed``) are true for ``pass_rate`` of the inputs.
+    """
+
+    def __init__(self, latency: float = 0.0, pass_rate: float = 0.05):
+        self.latency = latency
+        self.pass_rate = pass_rate
+
+    def with_structured_output(self, schema: type[BaseModel], method: str | None = None,
+                               include_raw: bool = False) -> FakeStructuredModel:
+        return FakeStructuredModel(schema, self.latency, self.pass_rate, include_raw)
+
+
+class FakeProductHuntService:
+    """Synthetic Product Hunt days of up to ``max_posts`` posts linking to a local site.
+
+    The whole synthetic day is returned whatever the limit, so large days reach the pipeline.
+    """
+
+    def __init__(self, site_url: str, max_posts: int = 1000, seed: int = 0):
+        self.site_url = site_url
+        self.max_posts = max_posts
+        self.seed = seed
+        self.last_day_size = 0
+
+    async def get_posts(self, posted_after: datetime, posted_before: datetime, limit: int = 20,
+                        fields: Iterable[str] = (), refresh: bool = False) -> list[ProductHuntPost]:
+        rng = random.Random(posted_after.date().toordinal() * 31 + self.seed)
+        day = posted_after.strftime("%Y%m%d")
+        posts = []
+        for i in range(rng.randint(max(1, self.max_posts // 10), self.max_posts)):
+            words = rng.sample(WORDS, 4)
+            posts.append(ProductHuntPost(
+                id=f"{day}-{i}",
+                name=f"{words[0].title()}{words[1].title()} {i}",
+                tagline=f"{words[0]} {words[1]} for {words[2]}",
+                description=f"The {words[1]} {words[2]} that {words[3]} teams love",
+                votesCount=int(rng.paretovariate(1.2) * 10),
+                url=f"https://www.producthunt.com/posts/{day}-{i}",
+                website=f"{self.site_url}/p/{day}-{i}",
+                topics=rng.sample(TOPICS, 2) if "topics" in fields else [],
+            ))
+        self.last_day_size = len(posts)
+        return sorted(posts, key=lambda post: post.votesCount, reverse=True)
+
+    async def get_posts_bulk(self, days: Iterable[datetime], limit: int = 20, fields: Iterable[str] = (),
+                             refresh: bool = False) -> dict[date, list[ProductHuntPost]]:
+        return {day.date(): await self.get_posts(day, day + timedelta(days=1), limit, fields) for day in days}
+
+    async def get_post(self, post_id: str, fields: Iterable[str] = ()) -> ProductHuntPost | None:
+        day, _, _ = post_id.partition("-")
+        try:
+            posted_after = datetime.strptime(day, "%Y%m%d")
+        except ValueError:
+            return None
+        posts = await self.get_posts(posted_after, posted_after + timedelta(days=1), fields=fields)
+        return next((post for post in posts if post.id == post_id), None)
+
+
+class LocalSiteServer:
+    """Local HTTP server of synthetic product pages, the browser targets of a soak run."""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await start_http_server(self.handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def handle(self, request: HttpRequest) -> HttpResponse:
+        post_id = request.path.rsplit("/", 1)[-1]
+        rng = random.Random(post_id)
+        sections = "".join(
+            f"<section style='height:{rng.randint(200, 900)}px'><h2>{' '.join(rng.sample(WORDS, 3))}</h2>"
+            f"<p>{' '.join(rng.choices(WORDS, k=60))}</p></section>"
+            for _ in range(rng.randint(2, 12))
+        )
+        html = f"<!doctype html><html><head><title>{post_id}</title></head><body><h1>{post_id}</h1>{sections}</body></html>"
+        return HttpResponse(200, html.encode("utf-8"), {"Content-Type": "text/html; charset=utf-8"})
+
+
+class FakeTelegramServer:
+    """Local stand-in of the Telegram Bot API ``sendMessage`` method."""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = 0
+        self.messages = 0
+        # (chat_id, text) of every accepted message
+        self.sent: list[tuple[str, str]] = []
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await start_http_server(self.handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def handle(self, request: HttpRequest) -> HttpResponse:
+        if request.method != "POST" or not request.path.endswith("/sendMessage"):
+            return HttpResponse.json({"ok": False, "description": "Not found"}, status=404)
+        if not request.json().get("text"):
+            return HttpResponse.json({"ok": False, "description": "Bad Request: message text is empty"}, status=400)
+        self.messages += 1
+        self.sent.append((request.json()["chat_id"], request.json()["text"]))
+        return HttpResponse.json({"ok": True, "result": {"message_id": self.messages}})
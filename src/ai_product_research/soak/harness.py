@@ -0,0 +1,112 @@
+import gc
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+from zoneinfo import ZoneInfo
+
+from ai_product_research.agents import HedgedLlmInvoker, ProblemRetrieverAgent, ProductFilterAgent
+from ai_product_research.scheduler import DailyScheduler
+from ai_product_research.services import AnalyzedProductTelegramChannelService, PassProbabilityRanker, \
+    ProductArchive, ProductEmbeddingIndex, TrendAggregator, WebSiteScrapperService
+from ai_product_research.soak.fakes import FakeChatModel, FakeClock, FakeProductHuntService, \
+    FakeTelegramServer, LocalSiteServer
+from ai_product_research.soak.report import DEFAULT_LIMITS, GrowthLimit, SoakReport, SoakSample, check_growth, \
+    write_chart, write_csv
+from ai_product_research.soak.resources import sample_resources
+from ai_product_research.usecase import TelegramProductsResearchUseCase
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class SoakConfig:
+    days: int = 300
+    max_posts: int = 1000
+    pass_rate: float = 0.05
+    llm_latency: float = 0.0
+    # "chromium" always renders the local pages, so leaked browser processes show up; "http" lets
+    # the scraper's fast path read them
+    scraper: Literal["http", "chromium"] = "chromium"
+    output_dir: Path = Path("soak-report")
+    start: datetime = datetime(2025, 1, 1, 5, 59, tzinfo=ZoneInfo("Europe/Paris"))
+    warmup_fraction: float = 0.2
+    limits: list[GrowthLimit] = field(default_factory=lambda: list(DEFAULT_LIMITS))
+
+
+class SoakHarness:
+    """Fast-forwards the daily scheduler through simulated days and tracks process resources.
+
+    The real use case, agents, scheduler and persistent state run against local fakes of
+    Product Hunt, the product websites, the LLM and Telegram. After every run the harness
+    records RSS, open file descriptors, descendant processes and run latency, writes them as
+    CSV and an SVG chart, and reports metrics whose steady-state growth exceeds the limits.
+    """
+
+    def __init__(self, config: SoakConfig):
+        self.config = config
+        self.samples: list[SoakSample] = []
+
+    async def run(self) -> SoakReport:
+        config = self.config
+        site = LocalSiteServer()
+        telegram = FakeTelegramServer()
+        await site.start()
+        await telegram.start()
+        product_hunt = FakeProductHuntService(site.url, max_posts=config.max_posts)
+        use_case = self._create_use_case(product_hunt, telegram)
+        try:
+            clock = FakeClock(config.start)
+
+            async def execute(target_date: datetime) -> None:
+                started = time.perf_counter()
+                await use_case.execute(target_date)
+                latency = time.perf_counter() - started
+                # Collect cycles first so the sample shows retained memory, not pending garbage
+                gc.collect()
+                sample = SoakSample(len(self.samples), target_date.date(), product_hunt.last_day_size, latency,
+                                    sample_resources())
+                self.samples.append(sample)
+                log.info(f"Soak run {sample.run}: {sample.posts} posts in {latency:.2f}s, {sample.resources}")
+
+            scheduler = DailyScheduler(execute, tz=config.start.tzinfo, clock=clock.now, sleep=clock.sleep,
+                                       poll_interval=24 * 3600.0)
+            await scheduler.run(max_runs=config.days)
+        finally:
+            await use_case.scraper_service.close()
+            await site.stop()
+            await telegram.stop()
+
+        report = SoakReport(self.samples, check_growth(self.samples, config.limits, config.warmup_fraction),
+                            config.output_dir / "soak.csv", config.output_dir / "soak.svg")
+        write_csv(report.samples, report.csv_path)
+        write_chart(report.samples, report.chart_path)
+        log.info(f"Soak report written to {report.csv_path} and {report.chart_path}")
+        return report
+
+    def _create_use_case(self, product_hunt: FakeProductHuntService,
+                         telegram: FakeTelegramServer) -> TelegramProductsResearchUseCase:
+        config = self.config
+        data_dir = config.output_dir / "data"
+        chat_model = FakeChatModel(latency=config.llm_latency, pass_rate=config.pass_rate)
+        invoker = HedgedLlmInvoker()
+        # Local pages need no politeness, the rate limit would only slow the simulated days down
+        scraper = WebSiteScrapperService(fast_path=config.scraper == "http", rate_limit=1000.0, rate_burst=100)
+        return TelegramProductsResearchUseCase(
+            product_hunt_service=product_hunt,
+            problem_retriever_agent=ProblemRetrieverAgent(chat_model, invoker),
+            scraper_service=scraper,
+            analyzed_products_telegram_channel_service=AnalyzedProductTelegramChannelService(
+                channel_id="soak",
+                telegram_bot_token="soak",
+                api_url=telegram.url,
+            ),
+            product_filter_agent=ProductFilterAgent(chat_model, invoker),
+            product_index=ProductEmbeddingIndex.load(data_dir / "product_index"),
+            ranker=PassProbabilityRanker.load(data_dir / "pass_history.json"),
+            archive=ProductArchive(data_dir / "archive"),
+            trends=TrendAggregator.load(data_dir / "trends.json"),
+            weekly_digest_enabled=True,
+        )
@@ -0,0 +1,105 @@
+import csv
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+from ai_product_research.soak.resources import ResourceSample, growth_slope
+
+CHART_WIDTH = 720
+PANEL_HEIGHT = 160
+PANEL_MARGIN = 40
+
+
+@dataclass
+class SoakSample:
+    run: int
+    target_date: date
+    posts: int
+    latency: float
+    resources: ResourceSample
+
+
+@dataclass
+class GrowthLimit:
+    """Largest tolerated growth of a metric over 100 runs once warmed up."""
+    metric: str
+    max_growth_per_100_runs: float
+
+
+DEFAULT_LIMITS = [
+    GrowthLimit("rss_mib", 32.0),
+    GrowthLimit("open_fds", 2.0),
+    GrowthLimit("child_processes", 1.0),
+]
+
+METRICS: dict[str, Callable[[SoakSample], float]] = {
+    "rss_mib": lambda sample: sample.resources.rss_bytes / 2 ** 20,
+    "open_fds": lambda sample: sample.resources.open_fds,
+    "child_processes": lambda sample: sample.resources.child_processes,
+    "latency_s": lambda sample: sample.latency,
+}
+
+
+@dataclass
+class SoakReport:
+    samples: list[SoakSample]
+    violations: list[str] = field(default_factory=list)
+    csv_path: Path | None = None
+    chart_path: Path | None = None
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+
+def check_growth(samples: list[SoakSample], limits: list[GrowthLimit], warmup_fraction: float = 0.2) -> list[str]:
+    """Describe every metric whose steady-state trend exceeds its limit.
+
+    The first ``warmup_fraction`` of runs is ignored: caches, pools and the allocator
+    legitimately grow until they reach their working size.
+    """
+    steady = samples[int(len(samples) * warmup_fraction):]
+    violations = []
+    for limit in limits:
+        values = [METRICS[limit.metric](sample) for sample in steady]
+        growth = growth_slope(values) * 100
+        if growth > limit.max_growth_per_100_runs:
+            violations.append(f"{limit.metric} grows by {growth:.2f} per 100 runs "
+                              f"(limit {limit.max_growth_per_100_runs:g}) over {len(steady)} steady-state runs")
+    return violations
+
+
+def write_csv(samples: list[SoakSample], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["run", "target_date", "posts", *METRICS])
+        for sample in samples:
+            writer.writerow([sample.run, sample.target_date.isoformat(), sample.posts,
+                             *(f"{metric(sample):.4f}" for metric in METRICS.values())])
+
+
+def write_chart(samples: list[SoakSample], path: Path) -> None:
+    """Render one SVG line chart panel per metric over the runs."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    height = len(METRICS) * (PANEL_HEIGHT + PANEL_MARGIN) + PANEL_MARGIN
+    parts = [f"<svg xmlns='http://www.w3.org/2000/svg' width='{CHART_WIDTH + 2 * PANEL_MARGIN}' "
+             f"height='{height}' font-family='sans-serif' font-size='12'>",
+             "<rect width='100%' height='100%' fill='white'/>"]
+    for i, (name, metric) in enumerate(METRICS.items()):
+        top = PANEL_MARGIN + i * (PANEL_HEIGHT + PANEL_MARGIN)
+        values = [metric(sample) for sample in samples]
+        low, high = (min(values), max(values)) if values else (0.0, 0.0)
+        span = high - low or 1.0
+        step = CHART_WIDTH / max(len(values) - 1, 1)
+        points = " ".join(
+            f"{PANEL_MARGIN + j * step:.1f},{top + PANEL_HEIGHT - (value - low) / span * PANEL_HEIGHT:.1f}"
+            for j, value in enumerate(values)
+        )
+        parts.append(f"<text x='{PANEL_MARGIN}' y='{top - 8}'>{name}: min {low:.2f}, max {high:.2f}</text>")
+        parts.append(f"<rect x='{PANEL_MARGIN}' y='{top}' width='{CHART_WIDTH}' height='{PANEL_HEIGHT}' "
+                     f"fill='none' stroke='#ccc'/>")
+        parts.append(f"<polyline points='{points}' fill='none' stroke='#1f77b4' stroke-width='1.5'/>")
+    parts.append("</svg>")
+    path.write_text("\n".join(parts), encoding="utf-8")
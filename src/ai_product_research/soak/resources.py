@@ -0,0 +1,63 @@
+import os
+import resource
+from dataclasses import dataclass
+from pathlib import Path
+
+PROC = Path("/proc")
+
+
+@dataclass
+class ResourceSample:
+    rss_bytes: int
+    open_fds: int
+    child_processes: int
+
+
+def _descendants(pid: int) -> int:
+    children: dict[int, list[int]] = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces, fields after it are space separated
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    count = 0
+    pending = list(children.get(pid, []))
+    while pending:
+        child = pending.pop()
+        count += 1
+        pending.extend(children.get(child, []))
+    return count
+
+
+def sample_resources() -> ResourceSample:
+    """Resident memory, open file descriptors and descendant processes of this process.
+
+    Read from /proc on Linux. Elsewhere only peak RSS is available and the other counts are 0.
+    """
+    if not (PROC / "self").exists():
+        return ResourceSample(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, 0, 0)
+
+    resident_pages = int((PROC / "self" / "statm").read_text().split()[1])
+    return ResourceSample(
+        rss_bytes=resident_pages * os.sysconf("SC_PAGE_SIZE"),
+        open_fds=len(os.listdir(PROC / "self" / "fd")),
+        child_processes=_descendants(os.getpid()),
+    )
+
+
+def growth_slope(values: list[float]) -> float:
+    """Least-squares slope of the values per sample, 0 for fewer than two samples."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    variance = sum((x - mean_x) ** 2 for x in range(n))
+    return covariance / variance
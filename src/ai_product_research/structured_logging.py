@@ -0,0 +1,163 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+run_id_var: ContextVar[str | None] = ContextVar("run_id", default=None)
+post_id_var: ContextVar[str | None] = ContextVar("post_id", default=None)
+stage_var: ContextVar[str | None] = ContextVar("stage", default=None)
+CONTEXT_VARS = {"run_id": run_id_var, "post_id": post_id_var, "stage": stage_var}
+
+
+@contextmanager
+def log_context(**fields: str | None) -> Iterator[None]:
+    """Attach ``run_id``, ``post_id`` or ``stage`` to every record logged inside, tasks included."""
+    tokens = [(CONTEXT_VARS[name], CONTEXT_VARS[name].set(value)) for name, value in fields.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+@contextmanager
+def log_stage(logger: logging.Logger, stage: str) -> Iterator[None]:
+    """Run a pipeline stage under ``stage`` and log its duration when it ends."""
+    started = time.perf_counter()
+    with log_context(stage=stage):
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            logger.info(f"Stage {stage} took {duration:.2f}s", extra={"duration": round(duration, 3)})
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} chars truncated]"
+
+
+class ContextFilter(logging.Filter):
+    """Stamps records with the log context and bounds their size.
+
+    Runs in the logging caller before a record is queued, so it stays cheap: payloads passed
+    as ``extra={"payload": ...}`` are only rendered for ``payload_sample_rate`` of the records,
+    and messages and tracebacks are cut to ``max_chars``.
+    """
+
+    def __init__(self, max_chars: int = 2000, payload_sample_rate: float = 0.05):
+        super().__init__()
+        self.max_chars = max_chars
+        self.payload_sample_rate = payload_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, var in CONTEXT_VARS.items():
+            if getattr(record, name, None) is None:
+                setattr(record, name, var.get())
+        if not hasattr(record, "duration"):
+            record.duration = None
+
+        payload = getattr(record, "payload", None)
+        if payload is not None and random.random() < self.payload_sample_rate:
+            record.payload = _truncate(repr(payload), self.max_chars)
+        else:
+            record.payload = None
+
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            record.msg, record.args = _truncate(message, self.max_chars), None
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the writer falls behind."""
+
+    def __init__(self, log_queue: queue.Queue, max_chars: int = 2000):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render message and traceback here, the writer thread only serializes strings
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = _truncate(logging.Formatter().formatException(record.exc_info), 4 * self.max_chars)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record with stable fields, ``null`` when unknown."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "post_id": getattr(record, "post_id", None),
+            "stage": getattr(record, "stage", None),
+            "duration": getattr(record, "duration", None),
+        }
+        if getattr(record, "payload", None) is not None:
+            entry["payload"] = record.payload
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ContextTextFormatter(logging.Formatter):
+    """Human-readable message followed by the log context that is set."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        context = " ".join(f"{name}={value}" for name in ("run_id", "post_id", "stage", "duration", "payload")
+                           if (value := getattr(record, name, None)) is not None)
+        return f"{message} | {context}" if context else message
+
+
+def configure_logging(handler: logging.Handler, level: int = logging.INFO, queue_size: int = 10000,
+                      max_chars: int = 2000, payload_sample_rate: float = 0.05) -> QueueListener | None:
+    """Route the root logger through a bounded queue to ``handler`` on a background thread.
+
+    Does nothing when the root logger already has handlers, like ``logging.basicConfig``.
+
+    Returns:
+        The started listener, stopped at interpreter exit, or None if logging was configured
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return None
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size), max_chars=max_chars)
+    queue_handler.addFilter(ContextFilter(max_chars=max_chars, payload_sample_rate=payload_sample_rate))
+    listener = QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    listener.start()
+
+    def stop() -> None:
+        listener.stop()
+        if queue_handler.dropped:
+            print(f"Dropped {queue_handler.dropped} log record(s) while the log writer was behind", file=sys.stderr)
+
+    atexit.register(stop)
+    return listener
@@ -1,3 +1,7 @@
+from .batch_backfill import BackfillReport, BatchBackfillUseCase
+from .distributed_research import DistributedResearchCoordinator, PostResearchWorker
+from .product_selection import select_products, settled_products
 from .telegram_products_research_use_case import TelegramProductsResearchUseCase
 
-__all__ = ["TelegramProductsResearchUseCase"]
+__all__ = ["TelegramProductsResearchUseCase", "select_products", "settled_products", "DistributedResearchCoordinator",
+           "PostResearchWorker", "BatchBackfillUseCase", "BackfillReport"]
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from ai_product_research.agents import BatchLlmRunner
+from ai_product_research.agents.batch_llm import BatchItemError
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem, ProductHuntPost, ProductResearchRecord, \
+    ScrapedPage
+from ai_product_research.usecase.telegram_products_research_use_case import TelegramProductsResearchUseCase, \
+    post_metadata_text
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillReport:
+    days: int = 0
+    posts: int = 0
+    analyzed: int = 0
+    passed: int = 0
+    seconds: float = 0.0
+    # Pages by how they were fetched: "http", "browser", "metadata" or "missing"
+    pages: Counter[str] = field(default_factory=Counter)
+    errors: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass
+class BatchBackfillUseCase:
+    """Researches past days through batch LLM jobs instead of one synchronous call per post.
+
+    All posts of the range are fetched with bulk Product Hunt queries and their websites
+    scraped, then every problem retrieval goes out as one batch and every filter evaluation
+    as a second one. Results are recorded like daily runs (archive, trends, product index,
+    ranker history); nothing is published.
+    """
+    use_case: TelegramProductsResearchUseCase
+    runner: BatchLlmRunner
+    fetch_concurrency: int = 8
+
+    async def execute(self, first_day: datetime, days: int) -> BackfillReport:
+        started = time.perf_counter()
+        report = BackfillReport(days=days)
+        posts_by_day = await self.use_case.product_hunt_service.get_posts_bulk(
+            [first_day + timedelta(days=i) for i in range(days)], fields=("topics",),
+        )
+        posts = {post.id: (day, post) for day, day_posts in posts_by_day.items() for post in day_posts}
+        report.posts = len(posts)
+        log.info(f"Backfilling {len(posts)} post(s) of {days} day(s) from {first_day.date()} with batch jobs")
+
+        problems_batch = self.runner.new_batch(f"problems-{first_day:%Y%m%d}-{days}")
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        async def add_problem_request(post: ProductHuntPost) -> None:
+            async with semaphore:
+                page = await self.use_case.scraper_service.fetch(post.website)
+            if page is None and self.use_case.metadata_fallback:
+                page = ScrapedPage(url=post.website, strategy="http", text=post_metadata_text(post))
+                report.pages["metadata"] += 1
+            elif page is None:
+                report.pages["missing"] += 1
+                return
+            else:
+                report.pages[page.strategy] += 1
+            with page:
+                problems_batch.add(self.use_case.problem_retriever_agent.batch_request(post.id, page))
+
+        await asyncio.gather(*(add_problem_request(post) for _, post in posts.values()))
+        problems = await self.runner.run(problems_batch)
+
+        products: dict[str, AnalyzedProduct] = {}
+        filters_batch = self.runner.new_batch(f"filters-{first_day:%Y%m%d}-{days}")
+        for post_id, problem in problems.items():
+            if isinstance(problem, BatchItemError):
+                report.errors["problem"] += 1
+                log.warning(f"No business problem for post {post_id}: {problem}")
+                continue
+            post = posts[post_id][1]
+            products[post_id] = AnalyzedProduct(
+                origin_url=post.url,
+                product_url=post.website,
+                name=post.name,
+                problem=BusinessProblem.from_validated(problem),
+            )
+            filters_batch.add(self.use_case.product_filter_agent.batch_request(post_id, products[post_id]))
+        filter_results = await self.runner.run(filters_batch)
+
+        records_by_day: dict[date, list[ProductResearchRecord]] = {day: [] for day in posts_by_day}
+        for post_id, (day, post) in posts.items():
+            product = products.get(post_id)
+            filter_result = filter_results.get(post_id)
+            if isinstance(filter_result, BatchItemError):
+                report.errors["filter"] += 1
+                log.warning(f"No filter result for post {post_id}: {filter_result}")
+                product, filter_result = None, None
+            records_by_day[day].append(ProductResearchRecord(
+                run_id=f"backfill-{day:%Y%m%d}",
+                target_date=day,
+                post=post,
+                product=product,
+                filter_result=filter_result,
+            ))
+        self._record(records_by_day, report)
+        report.seconds = time.perf_counter() - started
+        log.info(f"Backfill done in {report.seconds:.0f}s: {report.analyzed}/{report.posts} post(s) analyzed, "
+                 f"{report.passed} passed, pages {dict(report.pages)}, errors {dict(report.errors)}")
+        return report
+
+    def _record(self, records_by_day: dict[date, list[ProductResearchRecord]], report: BackfillReport) -> None:
+        use_case = self.use_case
+        for day, records in records_by_day.items():
+            for record in records:
+                if record.product is None:
+                    continue
+                report.analyzed += 1
+                report.passed += record.filter_result.passed
+                if use_case.product_index is not None:
+                    use_case.product_index.add(record.post, record.product, record.filter_result.passed,
+                                               record.filter_result.reason)
+                if use_case.ranker is not None:
+                    use_case.ranker.record(record.post, record.filter_result.passed)
+            if use_case.archive is not None:
+                use_case.archive.append(records)
+            if use_case.trends is not None:
+                use_case.trends.record_run(day, records)
+        if use_case.product_index is not None:
+            use_case.product_index.save()
+        if use_case.ranker is not None:
+            use_case.ranker.save()
+        if use_case.trends is not None:
+            use_case.trends.save()
+
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from ai_product_research.deadlines import remaining
+from ai_product_research.domain import AnalyzedProduct, FilterResult, ProductHuntPost, ProductResearchRecord
+from ai_product_research.services import ProductEmbeddingIndex, SqliteJobQueue
+from ai_product_research.services.job_queue import Job, JobResult
+from ai_product_research.structured_logging import log_context
+from ai_product_research.usecase.telegram_products_research_use_case import POSTS_LIMIT, \
+    TelegramProductsResearchUseCase
+
+log = logging.getLogger(__name__)
+
+
+def encode_research_result(product: AnalyzedProduct | None, filter_result: FilterResult | None) -> dict[str, Any]:
+    return {
+        "product": product.model_dump(mode="json") if product is not None else None,
+        "filter_result": filter_result.model_dump(mode="json") if filter_result is not None else None,
+    }
+
+
+def decode_research_result(result: dict[str, Any] | None) -> tuple[AnalyzedProduct | None, FilterResult | None]:
+    if result is None:
+        return None, None
+    product = AnalyzedProduct.model_validate(result["product"]) if result["product"] is not None else None
+    filter_result = FilterResult.model_validate(result["filter_result"]) if result["filter_result"] is not None \
+        else None
+    return product, filter_result
+
+
+@dataclass
+class PostResearchWorker:
+    """Pulls per-post jobs from the queue and researches them (scrape, extract, filter).
+
+    Any number of workers can run in separate processes against the same queue. The lease
+    is renewed while a post is being researched, so only a dead worker's jobs get re-leased.
+    """
+    use_case: TelegramProductsResearchUseCase
+    queue: SqliteJobQueue
+    worker_id: str = field(default_factory=lambda: f"{socket.gethostname()}-{os.getpid()}")
+    poll_interval: float = 2.0
+    _run_id: str | None = field(default=None, init=False, repr=False)
+
+    async def run(self) -> None:
+        log.info(f"Worker {self.worker_id} started")
+        while True:
+            try:
+                if not await self.run_once():
+                    await asyncio.sleep(self.poll_interval)
+            except Exception as e:
+                log.error(f"Error in worker {self.worker_id}: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def run_once(self) -> bool:
+        """Research one leased post, returns False when no job was available."""
+        job = await self.queue.lease(self.worker_id)
+        if job is None:
+            return False
+        if job.run_id != self._run_id:
+            self._reload_index()
+            self._run_id = job.run_id
+
+        post = ProductHuntPost.model_validate(job.payload)
+        log.info(f"Worker {self.worker_id} researching {post.name} (run {job.run_id}, attempt {job.attempts})")
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            with log_context(run_id=job.run_id):
+                product, filter_result = await self.use_case.research_post(post)
+        except Exception as e:
+            log.error(f"Error researching post: {post.name} ({post.website})", exc_info=True)
+            await self.queue.fail(job, f"{type(e).__name__}: {e}")
+            return True
+        finally:
+            heartbeat.cancel()
+        await self.queue.complete(job, encode_research_result(product, filter_result))
+        return True
+
+    async def _heartbeat(self, job: Job) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            await self.queue.extend_lease(job)
+
+    def _reload_index(self) -> None:
+        # The coordinator saves the index after every run, pick up the products it added
+        index = self.use_case.product_index
+        if index is not None and index.directory is not None:
+            self.use_case.product_index = ProductEmbeddingIndex.load(index.directory, index.similarity_threshold,
+                                                                     index.dim)
+
+
+@dataclass
+class DistributedResearchCoordinator:
+    """Runs a research day by fanning posts out to workers through the job queue.
+
+    Posts are enqueued in ranked order and results are consumed in that same order, so the
+    records match a sequential run: once ``POSTS_LIMIT`` products passed among the completed
+    leading posts, the remaining pending jobs are cancelled. Selection, persistence and
+    publishing then run through the use case as usual; in stream mode products settled
+    among the leading posts are published while the workers are still busy.
+    """
+    use_case: TelegramProductsResearchUseCase
+    queue: SqliteJobQueue
+    poll_interval: float = 2.0
+    run_timeout: float = 3 * 3600.0
+
+    async def execute(self, target_date: datetime) -> None:
+        run_id = self.use_case.start_run()
+        with log_context(run_id=run_id):
+            log.info(f"Start distributed products research: target_date = {target_date}, run_id = {run_id}")
+            posts = await self.use_case.fetch_posts(target_date)
+            await self.queue.enqueue(run_id, [post.model_dump(mode="json") for post in posts])
+            records = await self.gather_records(run_id, target_date, posts)
+
+            for record in records:
+                if record.product is None:
+                    continue
+                log.info(f"Product filter: {record.product.name} passed={record.filter_result.passed}")
+                if self.use_case.product_index is not None:
+                    self.use_case.product_index.add(record.post, record.product, record.filter_result.passed,
+                                                    record.filter_result.reason)
+                if self.use_case.ranker is not None:
+                    self.use_case.ranker.record(record.post, record.filter_result.passed)
+            await self.use_case.finish_run(target_date, records)
+
+    async def gather_records(self, run_id: str, target_date: datetime,
+                             posts: list[ProductHuntPost]) -> list[ProductResearchRecord]:
+        """Wait for workers until the leading posts hold enough passed products or all posts are done."""
+        timeout = self.run_timeout
+        left = remaining()
+        if left is not None:
+            # Same budget as a sequential run: stop waiting in time to publish before the deadline
+            timeout = max(0.0, min(timeout, left - self.use_case.publish_reserve_seconds))
+        deadline = time.monotonic() + timeout
+        while True:
+            results = await self.queue.results(run_id)
+            records, complete = self._leading_records(run_id, target_date, posts, results)
+            await self.use_case.publish_settled(records)
+            if complete:
+                break
+            if time.monotonic() >= deadline:
+                log.warning(f"Run {run_id} timed out after {timeout:g}s with {len(records)} of "
+                            f"{len(posts)} post(s) researched")
+                break
+            await asyncio.sleep(self.poll_interval)
+
+        await self.queue.cancel_pending(run_id)
+        log.info(f"Gathered {len(records)} research record(s) of run {run_id}")
+        return records
+
+    @staticmethod
+    def _leading_records(run_id: str, target_date: datetime, posts: list[ProductHuntPost],
+                         results: list[JobResult]) -> tuple[list[ProductResearchRecord], bool]:
+        records = []
+        passed_count = 0
+        for post, result in zip(posts, results):
+            if passed_count >= POSTS_LIMIT:
+                return records, True
+            if result.status not in ("done", "failed"):
+                return records, False
+            product, filter_result = decode_research_result(result.result)
+            records.append(ProductResearchRecord(
+                run_id=run_id,
+                target_date=target_date.date(),
+                post=post,
+                product=product,
+                filter_result=filter_result,
+            ))
+            passed_count += filter_result is not None and filter_result.passed
+        return records, True
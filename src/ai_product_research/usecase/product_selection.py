@@ -0,0 +1,34 @@
+from collections.abc import Sequence
+
+from ai_product_research.domain import ProductResearchRecord
+
+
+def select_products(records: Sequence[ProductResearchRecord], limit: int) -> list[ProductResearchRecord]:
+    """Pick the records to publish.
+
+    Products that passed the filter come first, in processing order. If fewer than ``limit``
+    passed, the rest is backfilled from the ``limit`` most voted analyzed products.
+    """
+    selected = [record for record in records if record.passed][:limit]
+    top_records = sorted(
+        (record for record in records if record.product is not None),
+        key=lambda record: record.post.votesCount,
+        reverse=True,
+    )[:limit]
+    for record in top_records:
+        if len(selected) >= limit:
+            break
+        if not any(record is chosen for chosen in selected):
+            selected.append(record)
+    return selected
+
+
+def settled_products(records: Sequence[ProductResearchRecord], limit: int) -> list[ProductResearchRecord]:
+    """Records whose place in the final selection is already certain.
+
+    ``records`` are the researched leading posts in processing order. Passed products head
+    the selection in that order, so each of the first ``limit`` is settled as soon as it
+    passed. Backfilled products depend on the votes of every analyzed post and only settle
+    once the run is over.
+    """
+    return [record for record in records if record.passed][:limit]
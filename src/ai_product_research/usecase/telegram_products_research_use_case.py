@@ -1,62 +1,271 @@
+import asyncio
 import logging
-from dataclasses import dataclass
+import time
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Literal
 
 from ai_product_research.agents import ProblemRetrieverAgent, ProductFilterAgent
-from ai_product_research.domain import ProductHuntPost, AnalyzedProduct, BusinessProblem
+from ai_product_research.agents.hedged_invoker import StructuredOutputError
+from ai_product_research.domain import ProductHuntPost, AnalyzedProduct, BusinessProblem, FilterResult, \
+    ProductResearchRecord
 from ai_product_research.services import ProductHuntService, WebSiteScrapperService, \
-    AnalyzedProductTelegramChannelService
+    AnalyzedProductTelegramChannelService, ProductEmbeddingIndex, PassProbabilityRanker, ProductArchive, \
+    TrendAggregator, MultiDestinationPublisher
+from ai_product_research.services.trend_aggregates import week_key
+from ai_product_research.deadlines import deadline_expired, deadline_scope, remaining
+from ai_product_research.structured_logging import log_context, log_stage
+from ai_product_research.usecase.product_selection import select_products, settled_products
 
 log = logging.getLogger(__name__)
 
 POSTS_LIMIT = 3
 
 
+def post_metadata_text(post: ProductHuntPost) -> str:
+    """What the Product Hunt listing says about the product, in the layout of a fetched page's text."""
+    parts = [f"Title: {post.name}", f"Description: {post.tagline}", post.description]
+    if post.topics:
+        parts.append(f"Topics: {', '.join(post.topics)}")
+    return "\n\n".join(part for part in parts if part)
+
+
 @dataclass
 class TelegramProductsResearchUseCase:
     product_hunt_service: ProductHuntService
     problem_retriever_agent: ProblemRetrieverAgent
     scraper_service: WebSiteScrapperService
-    analyzed_products_telegram_channel_service: AnalyzedProductTelegramChannelService
+    analyzed_products_telegram_channel_service: AnalyzedProductTelegramChannelService | MultiDestinationPublisher
     product_filter_agent: ProductFilterAgent
+    product_index: ProductEmbeddingIndex | None = None
+    duplicate_policy: Literal["reuse", "skip"] = "reuse"
+    ranker: PassProbabilityRanker | None = None
+    archive: ProductArchive | None = None
+    trends: TrendAggregator | None = None
+    weekly_digest_enabled: bool = False
+    # "stream" publishes each product as soon as its place in the selection is certain
+    publish_mode: Literal["batch", "stream"] = "batch"
+    # Analyze the Product Hunt texts of posts whose website can't be fetched instead of skipping them
+    metadata_fallback: bool = False
+    # Seconds each post may take to research, within whatever deadline the run is executed under
+    post_deadline_seconds: float | None = None
+    # Part of the run's deadline kept for publishing, research stops this long before it
+    publish_reserve_seconds: float = 60.0
+    # Research latency of every post of the last run, in order
+    post_seconds: list[float] = field(default_factory=list)
+    # Seconds from the start of the last run until its first product message was sent
+    first_message_seconds: float | None = None
+    _run_started: float | None = field(default=None, init=False, repr=False)
+    _published_post_ids: set[str] = field(default_factory=set, init=False, repr=False)
 
     async def execute(self, target_date: datetime) -> None:
-        log.info(f"Start executing telegram products research use case: target_date = {target_date}")
-        next_day = target_date + timedelta(days=1)
-        posts = await self.product_hunt_service.get_posts(posted_after=target_date, posted_before=next_day)
-        filtered_posts: list[AnalyzedProduct] = []
-        top_posts: list[AnalyzedProduct] = []
-        for post in posts:
-            if len(filtered_posts) >= POSTS_LIMIT:
+        """Research the posts of ``target_date`` and publish the selected products.
+
+        Executed inside a ``deadline_scope``, research stops ``publish_reserve_seconds`` before
+        the deadline and the products researched by then are published.
+        """
+        run_id = self.start_run()
+        with log_context(run_id=run_id):
+            log.info(f"Start executing telegram products research use case: target_date = {target_date}, run_id = {run_id}")
+            left = remaining()
+            records: list[ProductResearchRecord] = []
+            with deadline_scope(left - self.publish_reserve_seconds if left is not None else None):
+                await self._research_posts(run_id, target_date, records)
+            await self.finish_run(target_date, records)
+
+    async def _research_posts(self, run_id: str, target_date: datetime,
+                              records: list[ProductResearchRecord]) -> None:
+        posts = await self.fetch_posts(target_date)
+        passed_count = 0
+        for i, post in enumerate(posts):
+            if passed_count >= POSTS_LIMIT:
                 break
-            analyzed_post = await self.analyze_post(post)
-            if analyzed_post is not None:
-                if len(top_posts) < POSTS_LIMIT:
-                    top_posts.append(analyzed_post)
-                filter_passed = await self.product_filter_agent.filter_product(analyzed_post)
-                log.info(f"Product filter: {analyzed_post.name} passed={filter_passed}")
-                if filter_passed:
-                    filtered_posts.append(analyzed_post)
-
-        for post in top_posts:
-            if len(filtered_posts) >= POSTS_LIMIT:
+            if deadline_expired():
+                log.warning(f"Research deadline passed, {len(posts) - i} post(s) left unresearched")
                 break
-            filtered_posts.append(post)
+            started = time.perf_counter()
+            analyzed_post, filter_result = await self.research_post(post)
+            self.post_seconds.append(time.perf_counter() - started)
+            records.append(ProductResearchRecord(
+                run_id=run_id,
+                target_date=target_date.date(),
+                post=post,
+                product=analyzed_post,
+                filter_result=filter_result,
+            ))
+            if analyzed_post is not None:
+                log.info(f"Product filter: {analyzed_post.name} passed={filter_result.passed}")
+                if filter_result.passed:
+                    passed_count += 1
+                if self.ranker is not None:
+                    self.ranker.record(post, filter_result.passed)
+                if filter_result.passed:
+                    await self.publish_settled(records)
+
+    def start_run(self) -> str:
+        """Reset the per-run state and return a new run id."""
+        self._run_started = time.perf_counter()
+        self._published_post_ids = set()
+        self.first_message_seconds = None
+        self.post_seconds = []
+        return uuid.uuid4().hex[:12]
+
+    async def fetch_posts(self, target_date: datetime) -> list[ProductHuntPost]:
+        """Posts of the target date in the order they should be researched."""
+        next_day = target_date + timedelta(days=1)
+        posts = await self.product_hunt_service.get_posts(
+            posted_after=target_date,
+            posted_before=next_day,
+            # Topics are only needed as ranking features and archive metadata
+            fields=("topics",) if self.ranker is not None or self.archive is not None else (),
+        )
+        if self.ranker is not None:
+            posts = self.ranker.rank(posts)
+        return posts
+
+    async def finish_run(self, target_date: datetime, records: list[ProductResearchRecord]) -> None:
+        """Select and publish products of researched records and persist the run's state."""
+        selected = select_products(records, POSTS_LIMIT)
+        unpublished = [record for record in selected if record.post.id not in self._published_post_ids]
+        for record in selected:
+            record.published = True
+        filtered_posts = [record.product for record in selected]
+
+        if self.product_index is not None:
+            self.product_index.save()
+        if self.ranker is not None:
+            self.ranker.record_run(len(records), len(selected))
+            self.ranker.save()
+        if self.archive is not None:
+            self.archive.append(records)
+        if self.trends is not None:
+            self.trends.record_run(target_date.date(), records)
+            self.trends.save()
+
+        log.info(f"Scrape retries per host: {self.scraper_service.retry_report()}")
+        log.info(f"Scrape paths: {self.scraper_service.fetch_report()}")
 
-        log.info(f"Analyzed posts: posts = {filtered_posts}")
-        await self.analyzed_products_telegram_channel_service.send_updates(filtered_posts)
+        # Selected products, streamed ones included
+        log.info(f"Analyzed posts: {[product.name for product in filtered_posts]}", extra={"payload": filtered_posts})
+        # Nothing left after streaming is no news, an empty run still gets logged by the channel service
+        if unpublished or not self._published_post_ids:
+            await self._send_products(unpublished)
+        if self.first_message_seconds is not None:
+            log.info(f"First product message of the run was sent after {self.first_message_seconds:.1f}s "
+                     f"({self.publish_mode} publishing)")
+
+        # Sunday closes the ISO week
+        if self.trends is not None and self.weekly_digest_enabled and target_date.weekday() == 6:
+            digest = self.trends.weekly_digest(week_key(target_date.date()))
+            if digest is not None:
+                await self.analyzed_products_telegram_channel_service.send_weekly_digest(digest)
+
+    async def publish_settled(self, records: list[ProductResearchRecord]) -> None:
+        """In stream mode, send the products of ``records`` whose place in the selection is certain.
+
+        Args:
+            records: Researched leading posts of the run, in processing order
+        """
+        if self.publish_mode != "stream":
+            return
+        settled = [record for record in settled_products(records, POSTS_LIMIT)
+                   if record.post.id not in self._published_post_ids]
+        if settled:
+            log.info(f"Publishing {len(settled)} settled product(s) ahead of the end of the run")
+            await self._send_products(settled)
+
+    async def _send_products(self, records: list[ProductResearchRecord]) -> None:
+        self._published_post_ids.update(record.post.id for record in records)
+        await self.analyzed_products_telegram_channel_service.send_updates([record.product for record in records])
+        if records and self.first_message_seconds is None and self._run_started is not None:
+            self.first_message_seconds = time.perf_counter() - self._run_started
+
+    async def research_post(self, post: ProductHuntPost) -> tuple[AnalyzedProduct | None, FilterResult | None]:
+        """Analyze and filter a post, reusing the analysis of a near-duplicate product when indexed.
+
+        The post gets ``post_deadline_seconds`` at most, within the deadline it is researched
+        under; running out of time leaves it without a product.
+        """
+        with log_context(post_id=post.id), deadline_scope(self.post_deadline_seconds):
+            try:
+                async with asyncio.timeout(remaining()):
+                    return await self._research_post(post)
+            except TimeoutError:
+                if not deadline_expired():
+                    raise
+                log.warning(f"Ran out of time researching post {post.name}")
+                return None, None
+
+    async def _research_post(self, post: ProductHuntPost) -> tuple[AnalyzedProduct | None, FilterResult | None]:
+        duplicate = self.product_index.find_duplicate(post) if self.product_index is not None else None
+        if duplicate is not None:
+            log.info(f"Post {post.name} is a near-duplicate of {duplicate.entry.product.name} "
+                     f"(similarity={duplicate.score:.3f}, policy={self.duplicate_policy})")
+            if self.duplicate_policy == "skip":
+                return None, None
+            analyzed_post = duplicate.entry.product.model_copy(
+                update={"origin_url": post.url, "product_url": post.website, "name": post.name},
+            )
+            if duplicate.entry.passed is None:
+                filter_result = await self.evaluate_product(analyzed_post)
+                return (analyzed_post, filter_result) if filter_result is not None else (None, None)
+            return analyzed_post, FilterResult(
+                passed=duplicate.entry.passed,
+                reason=duplicate.entry.reason or f"Reused result of near-duplicate {duplicate.entry.product.name}",
+            )
+
+        analyzed_post = await self.analyze_post(post)
+        if analyzed_post is None:
+            return None, None
+        filter_result = await self.evaluate_product(analyzed_post)
+        if filter_result is None:
+            return None, None
+        if self.product_index is not None:
+            self.product_index.add(post, analyzed_post, filter_result.passed, filter_result.reason)
+        return analyzed_post, filter_result
+
+    async def evaluate_product(self, analyzed_post: AnalyzedProduct) -> FilterResult | None:
+        """Filter an analyzed product, None if the call timed out or its answer was invalid."""
+        try:
+            with log_stage(log, "filter"):
+                return await self.product_filter_agent.evaluate_product(analyzed_post)
+        except (TimeoutError, StructuredOutputError) as e:
+            # Also what a call cut short by the post or run deadline raises, either way the post has no product
+            log.error(f"Could not filter {analyzed_post.name}: {type(e).__name__}: {e}")
+            return None
 
     async def analyze_post(self, post: ProductHuntPost) -> AnalyzedProduct | None:
-        log.info(f"Start analyzing post: post = {post}")
+        log.info(f"Start analyzing post {post.name}", extra={"payload": post})
         try:
-            screenshot_bytes = await self.scraper_service.scrape(post.website)
-            business_problem = await self.problem_retriever_agent.retrieve_problem(screenshot_bytes)
+            with log_stage(log, "scrape"):
+                page = await self.scraper_service.fetch(post.website)
+            if page is None and self.metadata_fallback:
+                log.warning(f"No website content for {post.name} ({post.website}), analyzing its Product Hunt texts")
+                with log_stage(log, "problem"):
+                    business_problem = await self.problem_retriever_agent.retrieve_problem_from_text(
+                        post_metadata_text(post),
+                    )
+                return AnalyzedProduct(
+                    origin_url=post.url,
+                    product_url=post.website,
+                    name=post.name,
+                    problem=BusinessProblem.from_validated(business_problem),
+                )
+            if page is None:
+                log.warning(f"Skipping post without website content: {post.name} ({post.website})")
+                return None
+            with page, log_stage(log, "problem"):
+                if page.text is not None:
+                    business_problem = await self.problem_retriever_agent.retrieve_problem_from_text(page.text)
+                else:
+                    business_problem = await self.problem_retriever_agent.retrieve_problem(page.screenshot)
             return AnalyzedProduct(
                 origin_url=post.url,
                 product_url=post.website,
                 name=post.name,
-                problem=BusinessProblem.model_validate(business_problem.model_dump()),
+                problem=BusinessProblem.from_validated(business_problem),
             )
         except Exception:
-            log.error(f"Error during analyzing a post: post = {post}", exc_info=True)
+            log.error(f"Error during analyzing a post: {post.name} ({post.website})", exc_info=True)
             return None
@@ -0,0 +1,129 @@
+import asyncio
+import importlib
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ai_product_research.services import AnalyzedProductTelegramChannelService, MultiDestinationPublisher, \
+    ProductHuntService, WebSiteScrapperService
+
+log = logging.getLogger(__name__)
+
+# Modules the first LLM call, HTTP request and archive write import lazily
+PREIMPORT_MODULES = (
+    "openai.resources.chat",
+    "openai.lib.streaming.chat",
+    "openai.pagination",
+    "jiter",
+    "langchain_core.tracers.langchain",
+    "langchain_core.tracers.run_collector",
+    "langchain_core.tracers.stdout",
+    "h11",
+    "anyio.streams.tls",
+    "pyarrow.parquet",
+    "pyarrow.dataset",
+)
+WARM_UP_HOSTS = ("api.openai.com", "api.producthunt.com", "api.telegram.org")
+
+
+@dataclass
+class WarmUpReport:
+    step_seconds: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    # Elapsed time of the warm-up, less than the sum of its steps as some run concurrently
+    wall_seconds: float = 0.0
+
+
+def first_post_overhead(post_seconds: list[float]) -> float | None:
+    """How much longer the first post of a run took than the median of the others."""
+    if len(post_seconds) < 2:
+        return None
+    return post_seconds[0] - statistics.median(post_seconds[1:])
+
+
+@dataclass
+class WarmUp:
+    """Pays the cold-start costs of a run ahead of it: module imports, DNS lookups, pooled
+    connections to Product Hunt, Telegram and OpenAI, and the shared browser.
+
+    ``run`` does the slow part well ahead of the run. Pooled connections idle out within
+    seconds (httpx keeps them alive for 5s by default), so ``connect`` opens them right
+    before the run instead. Each step is timed; that time would otherwise land on the
+    first posts of the run.
+    """
+    scraper_service: WebSiteScrapperService
+    product_hunt_service: ProductHuntService
+    telegram_service: AnalyzedProductTelegramChannelService | MultiDestinationPublisher
+    chat_models: list[Any] = field(default_factory=list)
+    hosts: tuple[str, ...] = WARM_UP_HOSTS
+    modules: tuple[str, ...] = PREIMPORT_MODULES
+    last_report: WarmUpReport | None = None
+
+    async def run(self) -> WarmUpReport:
+        """Import modules, resolve hosts and start the browser, the warm-up ahead of a run."""
+        report = WarmUpReport()
+        started = time.perf_counter()
+        await self._step(report, "imports", lambda: asyncio.to_thread(self._import_modules))
+        await asyncio.gather(
+            self._step(report, "dns", self._resolve_hosts),
+            self._step(report, "browser", self.scraper_service.start),
+        )
+        report.wall_seconds = time.perf_counter() - started
+        self.last_report = report
+        log.info(f"Warm-up took {report.wall_seconds:.1f}s: "
+                 f"{', '.join(f'{name} {seconds:.2f}s' for name, seconds in report.step_seconds.items())}")
+        return report
+
+    async def connect(self) -> WarmUpReport:
+        """Open pooled connections to Product Hunt, Telegram and OpenAI, right before a run."""
+        report = self.last_report or WarmUpReport()
+        started = time.perf_counter()
+        await asyncio.gather(
+            self._step(report, "product_hunt", self.product_hunt_service.warm_up),
+            self._step(report, "telegram", self.telegram_service.warm_up),
+            self._step(report, "openai", self._connect_openai),
+        )
+        elapsed = time.perf_counter() - started
+        report.wall_seconds += elapsed
+        self.last_report = report
+        log.info(f"Opened API connections in {elapsed:.2f}s")
+        return report
+
+    def log_first_post(self, post_seconds: list[float]) -> None:
+        """Report the cold-start work the warm-up took on and what is left on the first post."""
+        if self.last_report is None or not post_seconds:
+            return
+        overhead = first_post_overhead(post_seconds)
+        overhead_text = f", {overhead:+.1f}s over the run's median post" if overhead is not None else ""
+        log.info(f"Warm-up moved about {self.last_report.wall_seconds:.1f}s of cold-start work off the run, "
+                 f"first post took {post_seconds[0]:.1f}s{overhead_text}")
+
+    @staticmethod
+    async def _step(report: WarmUpReport, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:
+            report.errors[name] = f"{type(e).__name__}: {e}"
+            log.warning(f"Warm-up step {name} failed: {e}")
+        report.step_seconds[name] = time.perf_counter() - started
+
+    def _import_modules(self) -> None:
+        for module in self.modules:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                log.debug(f"Skipping warm-up import of missing module {module}")
+
+    async def _resolve_hosts(self) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.getaddrinfo(host, 443) for host in self.hosts))
+
+    async def _connect_openai(self) -> None:
+        # Listing models is free and leaves a TLS connection in the client's pool
+        clients = {id(client): client for model in self.chat_models
+                   if (client := getattr(model, "root_async_client", None)) is not None}
+        await asyncio.gather(*(client.models.list() for client in clients.values()))
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from ai_product_research.admin import AdminServer, EventLoopMonitor
+from ai_product_research.admin.http import HttpRequest, HttpResponse, MAX_BODY_SIZE, start_http_server
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+async def raw_request(port: int, data: bytes) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    status_line = (await reader.readline()).decode("latin-1")
+    writer.close()
+    await writer.wait_closed()
+    return status_line.strip()
+
+
+@pytest.fixture
+async def admin_server(tmp_path: Path):
+    server = AdminServer(
+        host="127.0.0.1",
+        port=0,
+        profile_dir=tmp_path,
+        monitor=EventLoopMonitor(interval=0.01, slow_callback_threshold=0.1),
+    )
+    await server.start()
+    yield server
+    await server.stop()
+
+
+class TestAdminServer:
+    async def test_reports_tasks_lag_and_blocking_stack(self, admin_server: AdminServer):
+        """A callback blocking the loop shows up in lag percentiles with the blocking stack"""
+        # given
+        base_url = f"http://127.0.0.1:{admin_server.port}"
+        admin_server.register_metrics("llm", lambda: {"requests": 1})
+
+        async def blocking_job():
+            await asyncio.sleep(0.05)
+            busy_wait(0.3)
+
+        job = asyncio.create_task(blocking_job(), name="blocking-job")
+        await job
+        await asyncio.sleep(0.05)
+
+        # when
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            tasks = await client.get("/tasks")
+            loop = (await client.get("/loop")).json()
+            metrics = (await client.get("/metrics")).json()
+
+        # then
+        assert "event-loop-monitor" in tasks.text
+        assert loop["lag"]["max"] >= 0.2
+        assert any("busy_wait" in "".join(report["stack"]) for report in loop["slow_callbacks"])
+        assert metrics == {"llm": {"requests": 1}}
+
+    async def test_writes_folded_profile_of_running_code(self, admin_server: AdminServer, tmp_path: Path):
+        """On-demand profiles sample the loop thread into a flame-graph readable file"""
+        # given
+        base_url = f"http://127.0.0.1:{admin_server.port}"
+
+        profiled = asyncio.Event()
+
+        async def busy_job():
+            while not profiled.is_set():
+                busy_wait(0.01)
+                await asyncio.sleep(0.001)
+
+        async def get_profile(client: httpx.AsyncClient) -> httpx.Response:
+            try:
+                return await client.get("/profile", params={"seconds": "0.2"})
+            finally:
+                profiled.set()
+
+        # when
+        async with httpx.AsyncClient(base_url=base_url, timeout=5) as client:
+            response, _ = await asyncio.gather(get_profile(client), busy_job())
+
+        # then
+        assert response.status_code == 200
+        path = Path(response.headers["X-Profile-Path"])
+        assert path.parent == tmp_path
+        lines = path.read_text().splitlines()
+        assert lines
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any("busy_wait" in line for line in lines)
+
+
+class TestHttpServer:
+    async def test_tells_oversized_bodies_from_malformed_requests(self):
+        """Bodies over the limit get 413, requests that don't parse get 400"""
+        # given
+        async def handler(request: HttpRequest) -> HttpResponse:
+            return HttpResponse.text("ok")
+
+        server = await start_http_server(handler, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        # when
+        try:
+            too_large = await raw_request(port, f"POST / HTTP/1.1\r\nContent-Length: {MAX_BODY_SIZE + 1}\r\n\r\n"
+                                          .encode("latin-1"))
+            bad_length = await raw_request(port, b"POST / HTTP/1.1\r\nContent-Length: lots\r\n\r\n")
+            bad_request_line = await raw_request(port, b"NONSENSE\r\n\r\n")
+            valid = await raw_request(port, b"GET / HTTP/1.1\r\n\r\n")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        # then
+        assert too_large == "HTTP/1.1 413 Payload Too Large"
+        assert bad_length == "HTTP/1.1 400 Bad Request"
+        assert bad_request_line == "HTTP/1.1 400 Bad Request"
+        assert valid == "HTTP/1.1 200 OK"
@@ -0,0 +1,143 @@
+import asyncio
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from openai import RateLimitError
+
+from ai_product_research.agents.adaptive_limiter import AimdConcurrencyLimiter, parse_reset_duration
+from ai_product_research.agents.hedged_invoker import HedgedLlmInvoker
+
+
+class ConcurrencyTrackingLlm:
+    """Runnable stand-in recording how many calls run at once"""
+
+    def __init__(self, duration: float = 0.02, headers: dict[str, str] | None = None):
+        self.duration = duration
+        self.headers = headers or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, messages):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.in_flight -= 1
+        return {"raw": AIMessage(content="", response_metadata={"headers": self.headers}), "parsed": "parsed",
+                "parsing_error": None}
+
+
+class RateLimitedLlm:
+    async def ainvoke(self, messages):
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        response = httpx.Response(429, headers={"retry-after": "2"}, request=request)
+        raise RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class TestAimdConcurrencyLimiter:
+    def test_parses_reset_durations(self):
+        """OpenAI reset headers mix units, plain numbers are seconds"""
+        assert parse_reset_duration("20ms") == pytest.approx(0.02)
+        assert parse_reset_duration("6m0s") == pytest.approx(360.0)
+        assert parse_reset_duration("1.5") == pytest.approx(1.5)
+        assert parse_reset_duration("soon") is None
+
+    def test_increases_additively_and_decreases_multiplicatively(self):
+        """Healthy calls grow the limit by about one per round, an overload halves it once per cooldown"""
+        # given
+        limiter = AimdConcurrencyLimiter(initial_limit=4, cooldown=60)
+
+        # when
+        for _ in range(4):
+            limiter.on_success(1.0)
+        grown = limiter.limit
+        limiter.on_overload("rate limited")
+        limiter.on_overload("rate limited again")
+
+        # then
+        assert 4.9 < grown < 5.0
+        assert limiter.limit == pytest.approx(grown / 2)
+        assert limiter.decreases == 1
+
+    def test_decreases_on_latency_above_baseline_of_same_kind(self):
+        """A call far slower than the usual calls of its kind signals queueing at the provider"""
+        # given
+        limiter = AimdConcurrencyLimiter(initial_limit=8)
+        for _ in range(10):
+            limiter.on_success(1.0, "filter")
+            limiter.on_success(10.0, "vision")
+
+        # when
+        limiter.on_success(12.0, "vision")
+        limit_after_usual_vision_call = limiter.limit
+        limiter.on_success(5.0, "filter")
+
+        # then
+        assert limit_after_usual_vision_call > 8
+        assert limiter.limit == pytest.approx(limit_after_usual_vision_call / 2)
+
+    async def test_rate_limit_headers_cap_limit_and_pause(self):
+        """Exhausted requests cap the limit and hold new calls until the window resets"""
+        # given
+        limiter = AimdConcurrencyLimiter(initial_limit=8)
+
+        # when
+        limiter.observe_rate_limits({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "200ms",
+                                     "x-ratelimit-remaining-tokens": "90000", "x-ratelimit-limit-tokens": "100000"})
+        started = asyncio.get_running_loop().time()
+        async with limiter.slot():
+            waited = asyncio.get_running_loop().time() - started
+
+        # then
+        assert limiter.limit == 1
+        assert limiter.pauses == 1
+        assert waited >= 0.15
+
+
+class TestHedgedLlmInvokerWithLimiter:
+    async def test_bounds_concurrent_requests_by_limit(self):
+        """Calls beyond the limit wait for a slot and structured output is unwrapped"""
+        # given
+        limiter = AimdConcurrencyLimiter(initial_limit=3, max_limit=3)
+        invoker = HedgedLlmInvoker(limiter=limiter)
+        llm = ConcurrencyTrackingLlm(headers={"x-ratelimit-remaining-requests": "100"})
+
+        # when
+        results = await asyncio.gather(*(invoker.ainvoke(llm, [], name="filter") for _ in range(12)))
+
+        # then
+        assert results == ["parsed"] * 12
+        assert llm.max_in_flight == 3
+        assert limiter.in_flight == 0
+        assert limiter.snapshot()["rate_limit_headers"] == {"x-ratelimit-remaining-requests": "100"}
+
+    async def test_rate_limit_error_decreases_limit(self):
+        """A 429 halves the limit and pauses for the retry-after of the response"""
+        # given
+        limiter = AimdConcurrencyLimiter(initial_limit=8)
+        invoker = HedgedLlmInvoker(limiter=limiter)
+
+        # when
+        with pytest.raises(RateLimitError):
+            await invoker.ainvoke(RateLimitedLlm(), [], name="vision")
+
+        # then
+        snapshot = limiter.snapshot()
+        assert snapshot["limit"] == 4
+        assert snapshot["pauses"] == 1
+        assert snapshot["paused_for"] > 1.5
+
+    async def test_raises_parsing_error_of_raw_output(self):
+        """Invalid structured output surfaces as an error like without include_raw"""
+        # given
+        class UnparsableLlm:
+            async def ainvoke(self, messages):
+                return {"raw": AIMessage(content="{"), "parsed": None, "parsing_error": ValueError("bad json")}
+
+        invoker = HedgedLlmInvoker(limiter=AimdConcurrencyLimiter())
+
+        # when / then
+        with pytest.raises(ValueError, match="bad json"):
+            await invoker.ainvoke(UnparsableLlm(), [], name="filter")
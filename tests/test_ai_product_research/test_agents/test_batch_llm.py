@@ -0,0 +1,151 @@
+import json
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from ai_product_research.agents import BatchLlmRunner, BatchRequest, BusinessProblem, LocalFileBatchProvider
+from ai_product_research.agents.batch_llm import BatchItemError
+from ai_product_research.domain import FilterResult
+from ai_product_research.soak.fakes import FakeChatModel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = 0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps += 1
+        self.now += seconds
+
+
+class FlakyChatModel(FakeChatModel):
+    """Fake model failing on prompts containing "broken\""""
+
+    def with_structured_output(self, schema, method=None, include_raw=False):
+        structured = super().with_structured_output(schema, method, include_raw)
+        answer = structured.ainvoke
+
+        async def ainvoke(messages):
+            if "broken" in str(messages[-1].content):
+                raise ValueError("model refused")
+            return await answer(messages)
+
+        structured.ainvoke = ainvoke
+        return structured
+
+
+def request(custom_id: str, schema=FilterResult) -> BatchRequest:
+    return BatchRequest(custom_id, schema, [SystemMessage(content="Evaluate"), HumanMessage(content=custom_id)])
+
+
+class TestBatchLlmRunner:
+    async def test_splits_requests_into_jobs_and_maps_answers_back(self, tmp_path: Path):
+        """Requests are spread over jobs of the provider's size and answers come back by custom id"""
+        # given
+        clock = FakeClock()
+        provider = LocalFileBatchProvider(tmp_path / "provider", FlakyChatModel(pass_rate=0.5),
+                                          [BusinessProblem, FilterResult], completion_seconds=120.0,
+                                          max_requests=2, clock=clock)
+        runner = BatchLlmRunner(provider, tmp_path / "batches", poll_interval=60.0, sleep=clock.sleep)
+        batch = runner.new_batch("filters")
+        for custom_id in ("a", "b", "broken", "d"):
+            batch.add(request(custom_id))
+        batch.add(request("e", BusinessProblem))
+
+        # when
+        results = await runner.run(batch)
+
+        # then
+        assert provider.submitted == 3
+        assert clock.sleeps == 2
+        assert isinstance(results["a"], FilterResult) and isinstance(results["e"], BusinessProblem)
+        assert isinstance(results["broken"], BatchItemError)
+        assert set(results) == {"a", "b", "broken", "d", "e"}
+        assert '"url": "/v1/chat/completions"' in (tmp_path / "batches" / "filters-000.jsonl").read_text()
+
+    async def test_resumes_submitted_jobs_after_a_restart(self, tmp_path: Path):
+        """A run interrupted while polling picks up its jobs again instead of resubmitting them"""
+        # given
+        clock = FakeClock()
+        provider = LocalFileBatchProvider(tmp_path / "provider", FakeChatModel(), [FilterResult],
+                                          completion_seconds=3600.0, clock=clock)
+
+        async def crash(seconds: float) -> None:
+            raise KeyboardInterrupt
+
+        interrupted = BatchLlmRunner(provider, tmp_path / "batches", sleep=crash)
+        batch = interrupted.new_batch("filters")
+        batch.add(request("a"))
+        with pytest.raises(KeyboardInterrupt):
+            await interrupted.run(batch)
+        clock.now += 3600.0
+
+        # when
+        runner = BatchLlmRunner(provider, tmp_path / "batches", sleep=clock.sleep)
+        batch = runner.new_batch("filters")
+        batch.add(request("a"))
+        results = await runner.run(batch)
+
+        # then
+        assert provider.submitted == 1
+        assert isinstance(results["a"], FilterResult)
+        assert not (tmp_path / "batches" / "filters.jobs.json").exists()
+
+    async def test_splits_files_at_the_provider_byte_limit(self, tmp_path: Path):
+        """Files are rotated before a line would take them past the byte limit, long lines get a file each"""
+        # given
+        provider = LocalFileBatchProvider(tmp_path / "provider", FakeChatModel(), [FilterResult])
+        line_bytes = len(json.dumps(provider.request_line(request("a")))) + 1
+        provider.max_bytes = 2 * line_bytes + 10
+        runner = BatchLlmRunner(provider, tmp_path / "batches")
+        batch = runner.new_batch("filters")
+
+        # when
+        for custom_id in ("a", "b", "c"):
+            batch.add(request(custom_id))
+        batch.add(request("long " + "é" * line_bytes))
+        batch.add(request("e"))
+        batch.close()
+
+        # then
+        sizes = [len(path.read_bytes()) for path in batch.paths]
+        lines = [len(path.read_text(encoding="utf-8").splitlines()) for path in batch.paths]
+        assert lines == [2, 1, 1, 1]
+        assert all(size <= provider.max_bytes for size in sizes[:2] + sizes[3:])
+        assert sizes[2] > provider.max_bytes
+
+    async def test_submits_the_remaining_files_after_a_crash_mid_submission(self, tmp_path: Path):
+        """Files left unsubmitted by a crash are submitted on restart, the recorded jobs are not resubmitted"""
+        # given
+        provider = LocalFileBatchProvider(tmp_path / "provider", FakeChatModel(), [FilterResult], max_requests=2)
+        submit = provider.submit
+
+        async def crash_on_second_file(path: Path):
+            if provider.submitted == 1:
+                raise ConnectionError("connection reset")
+            return await submit(path)
+
+        provider.submit = crash_on_second_file
+        interrupted = BatchLlmRunner(provider, tmp_path / "batches")
+        batch = interrupted.new_batch("filters")
+        for custom_id in ("p0", "p1", "p2", "p3"):
+            batch.add(request(custom_id))
+        with pytest.raises(ConnectionError):
+            await interrupted.run(batch)
+        provider.submit = submit
+
+        # when
+        runner = BatchLlmRunner(provider, tmp_path / "batches")
+        batch = runner.new_batch("filters")
+        for custom_id in ("p0", "p1", "p2", "p3"):
+            batch.add(request(custom_id))
+        results = await runner.run(batch)
+
+        # then
+        assert provider.submitted == 2
+        assert all(isinstance(results[custom_id], FilterResult) for custom_id in ("p0", "p1", "p2", "p3"))
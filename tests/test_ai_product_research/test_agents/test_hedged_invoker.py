@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from ai_product_research.agents.adaptive_limiter import AimdConcurrencyLimiter
+from ai_product_research.agents.hedged_invoker import HedgedLlmInvoker
+from ai_product_research.deadlines import DeadlineExceededError, deadline_scope
+
+
+class FakeLlm:
+    """Runnable stand-in whose calls take the given durations in order"""
+
+    def __init__(self, durations: list[float]):
+        self.durations = durations
+        self.calls = 0
+        self.cancelled = 0
+
+    async def ainvoke(self, messages):
+        duration = self.durations[min(self.calls, len(self.durations) - 1)]
+        call = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(duration)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return f"response-{call}"
+
+
+class TestHedgedLlmInvoker:
+    async def test_hedges_call_slower_than_observed_p95(self):
+        """A call stuck past the p95 latency is raced by a duplicate and the loser is cancelled"""
+        # given
+        invoker = HedgedLlmInvoker(deadline=5.0, min_samples=5, min_hedge_delay=0.01)
+        warmup = FakeLlm([0.01])
+        for _ in range(5):
+            await invoker.ainvoke(warmup, [], name="vision")
+        stuck = FakeLlm([2.0, 0.01])
+
+        # when
+        result = await invoker.ainvoke(stuck, [], name="vision")
+
+        # then
+        metrics = invoker.metrics()["vision"]
+        assert result == "response-1"
+        assert stuck.cancelled == 1
+        assert metrics["hedges"] == 1
+        assert metrics["hedge_wins"] == 1
+        assert metrics["hedge_win_rate"] == 1.0
+        assert metrics["requests"] == 6
+        assert sum(metrics["histogram"].values()) == 6
+
+    async def test_does_not_hedge_without_enough_samples(self):
+        """Hedging needs observed latencies, so the first calls run alone"""
+        # given
+        invoker = HedgedLlmInvoker(deadline=5.0, min_samples=5)
+        llm = FakeLlm([0.05])
+
+        # when
+        await invoker.ainvoke(llm, [], name="filter")
+
+        # then
+        assert llm.calls == 1
+        assert invoker.metrics()["filter"]["hedges"] == 0
+
+    async def test_enforces_per_call_deadline(self):
+        """Calls exceeding the deadline are cancelled and counted as timeouts"""
+        # given
+        invoker = HedgedLlmInvoker(deadline=0.05)
+        llm = FakeLlm([1.0])
+
+        # when
+        with pytest.raises(TimeoutError):
+            await invoker.ainvoke(llm, [], name="vision")
+
+        # then
+        assert llm.cancelled == 1
+        assert invoker.metrics()["vision"]["timeouts"] == 1
+
+    async def test_call_gets_no_more_than_the_scoped_deadline(self):
+        """Inside a deadline scope calls are cut at the scope's end and none start after it"""
+        # given
+        limiter = AimdConcurrencyLimiter(initial_limit=4)
+        invoker = HedgedLlmInvoker(deadline=5.0, limiter=limiter)
+        llm = FakeLlm([1.0])
+
+        # when
+        with deadline_scope(0.05):
+            with pytest.raises(TimeoutError):
+                await invoker.ainvoke(llm, [], name="vision")
+            with pytest.raises(DeadlineExceededError):
+                await invoker.ainvoke(llm, [], name="vision")
+
+        # then
+        assert llm.calls == 1 and llm.cancelled == 1
+        assert invoker.metrics()["vision"]["timeouts"] == 2
+        assert limiter.limit == 4
@@ -0,0 +1,163 @@
+import json
+from typing import Any
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_openai import ChatOpenAI
+from pydantic import ValidationError
+
+from ai_product_research.agents.hedged_invoker import HedgedLlmInvoker, StructuredOutputError
+from ai_product_research.agents.problem_retriever_agent import BusinessProblem, ProblemRetrieverAgent
+
+VALID = {
+    "primary_customer": "Sales teams",
+    "core_job": "Book meetings",
+    "main_pain": "Back and forth emails",
+    "success_metric": "Meetings booked per week",
+}
+
+
+def answer(values: dict[str, Any], input_tokens: int = 150) -> dict[str, Any]:
+    """Structured output of ``include_raw=True`` for the given field values"""
+    raw = AIMessage(content=json.dumps(values),
+                    usage_metadata={"input_tokens": input_tokens, "output_tokens": 80, "total_tokens": input_tokens + 80})
+    try:
+        return {"raw": raw, "parsed": BusinessProblem.model_validate(values), "parsing_error": None}
+    except ValidationError as e:
+        return {"raw": raw, "parsed": None, "parsing_error": e}
+
+
+class ScriptedChatModel:
+    """Chat model stand-in returning the scripted answers in order and recording the requests"""
+
+    def __init__(self, answers: list[dict[str, Any]]):
+        self.answers = answers
+        self.requests: list[list[Any]] = []
+
+    def with_structured_output(self, schema, method=None, include_raw=False):
+        return self
+
+    async def ainvoke(self, messages):
+        self.requests.append(messages)
+        return self.answers[len(self.requests) - 1]
+
+
+def tool_call_completion(values: dict[str, Any]) -> dict[str, Any]:
+    """OpenAI chat completion answering with a ``BusinessProblem`` tool call"""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-5-mini",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": "call-1",
+                    "type": "function",
+                    "function": {"name": "BusinessProblem", "arguments": json.dumps(values)},
+                }],
+            },
+        }],
+        "usage": {"prompt_tokens": 1500, "completion_tokens": 80, "total_tokens": 1580},
+    }
+
+
+def has_image(messages: list[Any]) -> bool:
+    return any(isinstance(message.content, list) and any(part.get("type") == "image_url" for part in message.content)
+               for message in messages)
+
+
+class TestProblemRepair:
+    async def test_repairs_invalid_vision_answer_without_the_screenshot(self):
+        """An answer over the field limits is fixed by a text-only call quoting it with its errors"""
+        # given
+        invalid = {**VALID, "main_pain": "x" * 600, "core_job": ""}
+        chat_model = ScriptedChatModel([answer(invalid, input_tokens=1500), answer(VALID, input_tokens=200)])
+        agent = ProblemRetrieverAgent(chat_model, HedgedLlmInvoker())
+
+        # when
+        problem = await agent.retrieve_problem(b"\x89PNG fake screenshot")
+
+        # then
+        repair_request = chat_model.requests[1]
+        assert problem == BusinessProblem(**VALID)
+        assert has_image(chat_model.requests[0])
+        assert not has_image(repair_request)
+        assert "main_pain: String should have at most 512 characters" in repair_request[-1].content
+        assert "core_job: String should have at least 1 character" in repair_request[-1].content
+        assert "x" * 600 in repair_request[-1].content
+        assert agent.repair_metrics()["problem_retriever"] == {
+            "invalid_outputs": 1,
+            "repair_calls": 1,
+            "repaired": 1,
+            "repair_success_rate": 1.0,
+            "full_retries": 0,
+            "full_retry_successes": 0,
+            "failures": 0,
+            "input_tokens_saved": 1500,
+        }
+
+    async def test_retries_with_the_screenshot_only_after_repairs_fail(self):
+        """Failed repairs fall back to one full vision retry, and its failure surfaces as the error"""
+        # given
+        invalid = {**VALID, "success_metric": ""}
+        chat_model = ScriptedChatModel([answer(invalid), answer(invalid), answer(invalid), answer(invalid)])
+        agent = ProblemRetrieverAgent(chat_model, HedgedLlmInvoker(), repair_attempts=2)
+
+        # when
+        with pytest.raises(StructuredOutputError, match="success_metric"):
+            await agent.retrieve_problem(b"\x89PNG fake screenshot")
+
+        # then
+        metrics = agent.repair_metrics()["problem_retriever"]
+        assert [has_image(request) for request in chat_model.requests] == [True, False, False, True]
+        assert metrics["repair_calls"] == 2
+        assert metrics["repair_success_rate"] == 0.0
+        assert metrics["full_retries"] == 1
+        assert metrics["failures"] == 1
+        assert metrics["input_tokens_saved"] == 0
+
+    async def test_valid_answers_need_no_repair(self):
+        """Answers passing validation go through with a single call and no repair stats"""
+        # given
+        chat_model = ScriptedChatModel([answer(VALID)])
+        agent = ProblemRetrieverAgent(chat_model, HedgedLlmInvoker())
+
+        # when
+        problem = await agent.retrieve_problem_from_text("Book meetings without the back and forth")
+
+        # then
+        assert problem == BusinessProblem(**VALID)
+        assert len(chat_model.requests) == 1
+        assert agent.repair_metrics() == {}
+
+    async def test_repairs_invalid_answers_of_the_openai_chat_model(self):
+        """An invalid answer of a real ChatOpenAI reaches the repair instead of failing inside the client"""
+        # given
+        invalid = {**VALID, "main_pain": "x" * 600}
+        answers = [tool_call_completion(invalid), tool_call_completion(VALID)]
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json=answers[len(requests) - 1])
+
+        chat_model = ChatOpenAI(model="gpt-5-mini", api_key="test",
+                                http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        agent = ProblemRetrieverAgent(chat_model, HedgedLlmInvoker())
+
+        # when
+        problem = await agent.retrieve_problem_from_text("Book meetings without the back and forth")
+
+        # then
+        repair_prompt = requests[1]["messages"][-1]["content"]
+        assert problem == BusinessProblem(**VALID)
+        assert len(requests) == 2
+        assert "main_pain: String should have at most 512 characters" in repair_prompt
+        assert "x" * 600 in repair_prompt
+        assert agent.repair_metrics()["problem_retriever_text"]["input_tokens_saved"] == 1500
@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+from ai_product_research.deadlines import bounded, deadline_expired, deadline_scope, remaining, seconds_until
+
+
+class TestDeadlineScope:
+    async def test_nested_scopes_only_shorten_the_budget_and_reach_tasks(self):
+        """A post's scope can't outlive the run's, tasks started inside see the same deadline"""
+        # given
+        seen = []
+
+        async def stage():
+            seen.append(remaining())
+
+        # when
+        with deadline_scope(10.0):
+            with deadline_scope(60.0):
+                outer_bound = remaining()
+            with deadline_scope(1.0):
+                await asyncio.create_task(stage())
+                capped = bounded(30.0)
+        without = remaining()
+
+        # then
+        assert 9.0 < outer_bound <= 10.0
+        assert 0.0 < seen[0] <= 1.0 and 0.0 < capped <= 1.0
+        assert without is None and bounded(30.0) == 30.0
+
+    async def test_expires_and_bounds_to_the_floor(self):
+        """Once the deadline passed stages get their floor timeout"""
+        # when
+        with deadline_scope(0.01):
+            await asyncio.sleep(0.02)
+            expired = deadline_expired()
+            timeout = bounded(10.0, floor=2.0)
+
+        # then
+        assert expired
+        assert timeout == 2.0
+
+    def test_seconds_until_next_time_of_day(self):
+        """The deadline is the next occurrence of the time, tomorrow once it passed"""
+        # given
+        tz = ZoneInfo("Europe/Paris")
+
+        # when
+        today = seconds_until(time(7, 0), datetime(2025, 3, 1, 6, 0, tzinfo=tz))
+        tomorrow = seconds_until(time(7, 0), datetime(2025, 3, 1, 7, 30, tzinfo=tz))
+
+        # then
+        assert today == 3600.0
+        assert tomorrow == 23.5 * 3600.0
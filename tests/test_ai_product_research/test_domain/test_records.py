@@ -0,0 +1,124 @@
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, timedelta
+from typing import Any
+
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem, CompactRecord, FilterResult, \
+    ProductHuntPost, ProductResearchRecord
+from ai_product_research.services.product_archive import ProductArchive
+
+BENCHMARK_RECORDS = 5000
+
+
+def make_records(count: int) -> list[ProductResearchRecord]:
+    rng = random.Random(3)
+    records = []
+    for i in range(count):
+        day = date(2025, 1, 1) + timedelta(days=i // 20)
+        post = ProductHuntPost(
+            id=f"post-{i}",
+            name=f"Product {i}",
+            tagline=f"Meetings booked for you, take {i}",
+            description=f"An assistant that schedules meetings across calendars and time zones, version {i}",
+            votesCount=rng.randint(1, 1000),
+            url=f"https://www.producthunt.com/posts/product-{i}",
+            website=f"https://example.com/{i}",
+            topics=["Productivity", "Artificial Intelligence"][:1 + i % 2],
+        )
+        analyzed = i % 4 != 3
+        product = AnalyzedProduct(
+            origin_url=post.url,
+            product_url=post.website,
+            name=post.name,
+            problem=BusinessProblem(
+                primary_customer="Founders of small sales teams",
+                core_job="Book meetings with prospects",
+                main_pain="Back and forth emails to find a slot",
+                success_metric="Meetings booked per week",
+            ),
+        ) if analyzed else None
+        filter_result = FilterResult(passed=i % 2 == 0, reason="Uses AI to schedule") if analyzed else None
+        records.append(ProductResearchRecord(run_id=f"run-{day.isoformat()}", target_date=day, post=post,
+                                             product=product, filter_result=filter_result, published=i % 5 == 0))
+    return records
+
+
+def best_of(runs: int, action: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def allocated_bytes(build: Callable[[], list[Any]]) -> int:
+    tracemalloc.start()
+    try:
+        kept = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+class TestCompactRecord:
+    def test_round_trips_models(self):
+        """Models survive the compact form unchanged, including absent analyses"""
+        # given
+        records = make_records(40)
+        records[0].post.thumbnail_url = "https://ph-files.imgix.net/thumb.png"
+        records[1].post.topics = []
+        records[2].post.description = "Größe 日本"
+
+        # when
+        compact = [CompactRecord.from_model(record) for record in records]
+
+        # then
+        assert [record.to_model() for record in compact] == records
+        assert any(not record.analyzed for record in compact)
+
+    def test_archive_yields_the_same_records_compact(self, tmp_path):
+        """Compact archive scans carry the same fields as the validated query"""
+        # given
+        archive = ProductArchive(tmp_path)
+        archive.append(make_records(60))
+
+        # when
+        compact = sorted(archive.records(passed=True), key=lambda record: record.post_id)
+        models = sorted(archive.query(passed=True), key=lambda record: record.post.id)
+
+        # then
+        assert [record.to_model() for record in compact] == models
+
+
+class TestCompactRecordBenchmark:
+    def test_is_cheaper_than_the_pydantic_models(self, tmp_path):
+        """Compact records build faster, take less memory and scan from the archive faster than the models"""
+        # given
+        records = make_records(BENCHMARK_RECORDS)
+        dumps = [record.model_dump() for record in records]
+        archive = ProductArchive(tmp_path)
+        archive.append(records)
+
+        # when
+        model_build = best_of(3, lambda: [ProductResearchRecord.model_validate(dump) for dump in dumps])
+        compact_build = best_of(3, lambda: [CompactRecord.from_model(record) for record in records])
+        # Loaded from the archive, so both sides allocate their own strings
+        model_memory = allocated_bytes(lambda: list(archive.query()))
+        compact_memory = allocated_bytes(lambda: list(archive.records()))
+        model_scan = best_of(3, lambda: list(archive.query()))
+        compact_scan = best_of(3, lambda: list(archive.records()))
+
+        # then
+        per_record = {
+            "build_us": (model_build * 1e6 / BENCHMARK_RECORDS, compact_build * 1e6 / BENCHMARK_RECORDS),
+            "memory_bytes": (model_memory // BENCHMARK_RECORDS, compact_memory // BENCHMARK_RECORDS),
+            "scan_us": (model_scan * 1e6 / BENCHMARK_RECORDS, compact_scan * 1e6 / BENCHMARK_RECORDS),
+        }
+        assert compact_build < model_build, per_record
+        assert compact_memory < model_memory / 2, per_record
+        assert compact_scan < model_scan * 0.75, per_record
@@ -0,0 +1,111 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_product_research.agents import HedgedLlmInvoker, ProblemRetrieverAgent, ProductFilterAgent
+from ai_product_research.ondemand import AnalysisApiServer, OnDemandAnalyzer
+from ai_product_research.services import WebSiteScrapperService
+from ai_product_research.soak.fakes import FakeChatModel, FakeProductHuntService, LocalSiteServer
+from ai_product_research.usecase import TelegramProductsResearchUseCase
+
+
+@pytest.fixture
+async def site():
+    site = LocalSiteServer()
+    await site.start()
+    yield site
+    await site.stop()
+
+
+async def start_api(site: LocalSiteServer, concurrency: int = 4, max_queue: int = 32) -> AnalysisApiServer:
+    chat_model = FakeChatModel(latency=0.1, pass_rate=0.5)
+    invoker = HedgedLlmInvoker()
+    use_case = TelegramProductsResearchUseCase(
+        product_hunt_service=FakeProductHuntService(site.url, max_posts=20),
+        problem_retriever_agent=ProblemRetrieverAgent(chat_model, invoker),
+        scraper_service=WebSiteScrapperService(rate_limit=1000.0, rate_burst=100),
+        analyzed_products_telegram_channel_service=None,
+        product_filter_agent=ProductFilterAgent(chat_model, invoker),
+    )
+    server = AnalysisApiServer(OnDemandAnalyzer(use_case, concurrency=concurrency, max_queue=max_queue),
+                               "127.0.0.1", 0)
+    await server.start()
+    return server
+
+
+async def stop_api(server: AnalysisApiServer) -> None:
+    await server.stop()
+    await server.analyzer.use_case.scraper_service.close()
+
+
+class TestAnalysisApiServer:
+    async def test_coalesces_concurrent_requests_and_serves_repeats_from_cache(self, site: LocalSiteServer):
+        """Simultaneous requests for one website share an analysis, later ones hit the cache"""
+        # given
+        server = await start_api(site)
+        url = f"{site.url}/p/invoicer"
+
+        # when
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}", timeout=10.0) as client:
+                concurrent = await asyncio.gather(
+                    client.post("/analyze", json={"url": url}),
+                    client.post("/analyze", json={"url": url + "/"}),
+                    client.post("/analyze", json={"url": url.replace("http://", "HTTP://")}),
+                )
+                repeat = await client.post("/analyze", json={"url": url})
+                invalid = await client.post("/analyze", json={"url": "ftp://example.com"})
+                metrics = (await client.get("/metrics")).json()
+        finally:
+            await stop_api(server)
+
+        # then
+        assert [response.status_code for response in concurrent] == [200, 200, 200]
+        assert sorted(response.json()["served"] for response in concurrent) == ["analyzed", "coalesced", "coalesced"]
+        body = repeat.json()
+        assert body["served"] == "cache"
+        assert body["product"]["product_url"] == url
+        assert body["filter_result"]["passed"] in (True, False)
+        assert invalid.status_code == 400
+        assert (metrics["analyzed"], metrics["coalesced"], metrics["cache_hits"]) == (1, 2, 1)
+
+    async def test_refuses_requests_past_the_queue_with_503(self, site: LocalSiteServer):
+        """With every slot and queue place taken, new analyses are refused with Retry-After"""
+        # given
+        server = await start_api(site, concurrency=1, max_queue=1)
+
+        # when
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}", timeout=10.0) as client:
+                responses = await asyncio.gather(*(
+                    client.post("/analyze", json={"url": f"{site.url}/p/site-{i}"}) for i in range(6)
+                ))
+        finally:
+            await stop_api(server)
+
+        # then
+        statuses = [response.status_code for response in responses]
+        assert statuses.count(200) >= 1
+        assert 503 in statuses
+        refused = next(response for response in responses if response.status_code == 503)
+        assert refused.headers["Retry-After"] == "5"
+
+    async def test_analyzes_product_hunt_posts_by_id(self, site: LocalSiteServer):
+        """Posts are looked up on Product Hunt first, unknown IDs are 404"""
+        # given
+        server = await start_api(site)
+
+        # when
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}", timeout=10.0) as client:
+                known = await client.post("/analyze", json={"post_id": "20250301-0"})
+                unknown = await client.post("/analyze", json={"post_id": "20250301-999"})
+        finally:
+            await stop_api(server)
+
+        # then
+        assert known.status_code == 200
+        assert known.json()["post"]["id"] == "20250301-0"
+        assert known.json()["product"]["product_url"] == f"{site.url}/p/20250301-0"
+        assert unknown.status_code == 404
@@ -0,0 +1,184 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage
+from pydantic import ValidationError
+
+from ai_product_research.agents import BusinessProblem, HedgedLlmInvoker, ProblemRetrieverAgent, ProductFilterAgent
+from ai_product_research.replay import ReplayMismatchError, RunArchiveReader, RunArchiveWriter, RunRecorder, \
+    RunReplayer
+from ai_product_research.replay.archive import Interaction
+from ai_product_research.replay.recording import RecordingRunnable
+from ai_product_research.replay.replaying import ReplayChatModel
+from ai_product_research.services import AnalyzedProductTelegramChannelService, PassProbabilityRanker, \
+    ProductEmbeddingIndex, WebSiteScrapperService
+from ai_product_research.soak.fakes import FakeChatModel, FakeProductHuntService, FakeTelegramServer, \
+    LocalSiteServer
+from ai_product_research.usecase import TelegramProductsResearchUseCase
+
+VALID_PROBLEM = {
+    "primary_customer": "Sales teams",
+    "core_job": "Book meetings",
+    "main_pain": "Back and forth emails",
+    "success_metric": "Meetings booked per week",
+}
+
+
+def tool_call_answer(values: dict[str, Any]) -> dict[str, Any]:
+    """Structured output of ``include_raw=True`` answering with a tool call"""
+    raw = AIMessage(content="", tool_calls=[{"name": "BusinessProblem", "args": values, "id": "call-1"}],
+                    usage_metadata={"input_tokens": 1500, "output_tokens": 80, "total_tokens": 1580})
+    try:
+        return {"raw": raw, "parsed": BusinessProblem.model_validate(values), "parsing_error": None}
+    except ValidationError as e:
+        return {"raw": raw, "parsed": None, "parsing_error": e}
+
+
+class ScriptedChatModel:
+    def __init__(self, answers: list[dict[str, Any]]):
+        self.answers = answers
+        self.calls = 0
+
+    def with_structured_output(self, schema, method=None, include_raw=False):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return self.answers[self.calls - 1]
+
+
+class UnreachableScraperService:
+    async def fetch(self, url: str) -> None:
+        return None
+
+    def retry_report(self) -> dict:
+        return {}
+
+    def fetch_report(self) -> dict:
+        return {}
+
+
+class FakeTelegramService:
+    def __init__(self):
+        self.sent: list[list[str]] = []
+
+    async def send_updates(self, products) -> None:
+        self.sent.append([product.name for product in products])
+
+
+class TestRunRecordReplay:
+    async def test_replays_recorded_day_offline(self, tmp_path: Path):
+        """A recorded run is rerun from its archive alone and publishes the same products"""
+        # given
+        site = LocalSiteServer()
+        telegram = FakeTelegramServer()
+        await site.start()
+        await telegram.start()
+        chat_model = FakeChatModel(latency=0.02, pass_rate=0.3)
+        invoker = HedgedLlmInvoker()
+        scraper = WebSiteScrapperService(rate_limit=1000.0, rate_burst=100)
+        use_case = TelegramProductsResearchUseCase(
+            product_hunt_service=FakeProductHuntService(site.url, max_posts=20),
+            problem_retriever_agent=ProblemRetrieverAgent(chat_model, invoker),
+            scraper_service=scraper,
+            analyzed_products_telegram_channel_service=AnalyzedProductTelegramChannelService(
+                channel_id="replay", telegram_bot_token="replay", api_url=telegram.url,
+            ),
+            product_filter_agent=ProductFilterAgent(chat_model, invoker),
+            product_index=ProductEmbeddingIndex(),
+            ranker=PassProbabilityRanker(),
+        )
+        recorder = RunRecorder(use_case, tmp_path / "recordings")
+        try:
+            await recorder.execute(datetime(2025, 3, 1))
+        finally:
+            await scraper.close()
+            await site.stop()
+            await telegram.stop()
+
+        # when
+        report = await RunReplayer(recorder.last_archive, latency_scale=0.0, strict=True).run()
+
+        # then
+        assert report.published == report.recorded_published
+        assert report.published and report.published[0]
+        assert report.fallbacks == 0
+        assert len(report.replayed_post_seconds) == len(report.recorded_post_seconds)
+        assert report.external_seconds["llm:BusinessProblem"] > 0
+        assert report.replayed_seconds < report.recorded_seconds
+        assert use_case.scraper_service is scraper
+
+
+class TestRunArchive:
+    def test_matches_calls_by_key_and_falls_back_by_kind(self, tmp_path: Path):
+        """Changed requests reuse the next recording of their kind unless replay is strict"""
+        # given
+        writer = RunArchiveWriter(tmp_path / "run.zip", {"target_date": "2025-03-01T00:00:00"})
+        blob = writer.add_blob(b"\x89PNG", ".png")
+        writer.add(Interaction("llm:FilterResult", "a", 1.0, data={"passed": True}))
+        writer.add(Interaction("llm:FilterResult", "b", 2.0, data={"passed": False}))
+        writer.close()
+
+        # when
+        reader = RunArchiveReader(tmp_path / "run.zip")
+        second = reader.take("llm:FilterResult", "b")
+        changed = reader.take("llm:FilterResult", "edited prompt")
+        strict = RunArchiveReader(tmp_path / "run.zip", strict=True)
+
+        # then
+        assert second.data == {"passed": False}
+        assert changed.data == {"passed": True}
+        assert reader.fallbacks == 1
+        assert reader.blob(blob) == b"\x89PNG"
+        with pytest.raises(ReplayMismatchError):
+            strict.take("llm:FilterResult", "edited prompt")
+
+    async def test_replays_repairs_of_invalid_answers_strictly(self, tmp_path: Path):
+        """Repair prompts rebuilt from a recorded invalid answer match the recorded repair call"""
+        # given
+        invalid = {**VALID_PROBLEM, "main_pain": "x" * 600}
+        chat_model = ScriptedChatModel([tool_call_answer(invalid), tool_call_answer(VALID_PROBLEM)])
+        recorded = ProblemRetrieverAgent(chat_model, HedgedLlmInvoker())
+        writer = RunArchiveWriter(tmp_path / "run.zip", {"target_date": "2025-03-01T00:00:00"})
+        recorded.llm = RecordingRunnable(recorded.llm, writer, "BusinessProblem")
+        await recorded.retrieve_problem_from_text("Book meetings without the back and forth")
+        writer.close()
+
+        # when
+        reader = RunArchiveReader(tmp_path / "run.zip", strict=True)
+        replayed = ProblemRetrieverAgent(ReplayChatModel(reader, latency_scale=0.0), HedgedLlmInvoker())
+        problem = await replayed.retrieve_problem_from_text("Book meetings without the back and forth")
+
+        # then
+        assert problem == BusinessProblem(**VALID_PROBLEM)
+        assert chat_model.calls == 2
+        assert reader.fallbacks == 0
+        assert replayed.repair_metrics() == recorded.repair_metrics()
+        assert replayed.repair_metrics()["problem_retriever_text"]["input_tokens_saved"] == 1500
+
+    async def test_replays_metadata_fallback_of_failed_scrapes(self, tmp_path: Path):
+        """Posts whose website failed are analyzed from their listing on replay too, as in the recorded run"""
+        # given
+        chat_model = FakeChatModel(pass_rate=0.5)
+        invoker = HedgedLlmInvoker()
+        telegram = FakeTelegramService()
+        use_case = TelegramProductsResearchUseCase(
+            product_hunt_service=FakeProductHuntService("http://127.0.0.1:9", max_posts=10),
+            problem_retriever_agent=ProblemRetrieverAgent(chat_model, invoker),
+            scraper_service=UnreachableScraperService(),
+            analyzed_products_telegram_channel_service=telegram,
+            product_filter_agent=ProductFilterAgent(chat_model, invoker),
+            metadata_fallback=True,
+        )
+        recorder = RunRecorder(use_case, tmp_path / "recordings")
+        await recorder.execute(datetime(2025, 3, 1))
+
+        # when
+        report = await RunReplayer(recorder.last_archive, latency_scale=0.0, strict=True).run()
+
+        # then
+        assert telegram.sent and telegram.sent[0]
+        assert report.published == report.recorded_published == telegram.sent
+        assert report.fallbacks == 0
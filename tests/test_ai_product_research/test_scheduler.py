@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from ai_product_research.scheduler import DailyScheduler
+from ai_product_research.soak.fakes import FakeClock
+from ai_product_research.warm_up import WarmUp, first_post_overhead
+
+
+class FakeWarmUpService:
+    def __init__(self, error: Exception | None = None, delay: float = 0.0):
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def warm_up(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+
+    async def start(self) -> None:
+        await self.warm_up()
+
+
+class TestDailyScheduler:
+    async def test_warms_up_once_before_each_run(self):
+        """The warm-up runs the configured lead time before every due run"""
+        # given
+        tz = ZoneInfo("Europe/Paris")
+        clock = FakeClock(datetime(2025, 3, 1, 12, 0, tzinfo=tz))
+        events = []
+
+        async def warm_up() -> None:
+            events.append(("warm_up", clock.now(tz).strftime("%d %H:%M")))
+
+        async def job(target_date: datetime) -> None:
+            events.append(("run", clock.now(tz).strftime("%d %H:%M")))
+
+        scheduler = DailyScheduler(job, tz=tz, clock=clock.now, sleep=clock.sleep, poll_interval=24 * 3600.0,
+                                   warm_up=warm_up, warm_up_lead=600.0)
+
+        # when
+        await scheduler.run(max_runs=2)
+
+        # then
+        assert events == [("warm_up", "02 05:50"), ("run", "02 06:00"), ("warm_up", "03 05:50"), ("run", "03 06:00")]
+
+
+class TestWarmUp:
+    async def test_times_every_step_and_survives_failures(self):
+        """A failing step is reported without stopping the other steps"""
+        # given
+        scraper, product_hunt, telegram = FakeWarmUpService(), FakeWarmUpService(), \
+            FakeWarmUpService(ConnectionError("unreachable"))
+        warm_up = WarmUp(scraper, product_hunt, telegram, hosts=("localhost",), modules=("json", "missing_module"))
+
+        # when
+        report = await warm_up.run()
+        await warm_up.connect()
+
+        # then
+        assert set(report.step_seconds) == {"imports", "dns", "product_hunt", "telegram", "openai", "browser"}
+        assert report.errors == {"telegram": "ConnectionError: unreachable"}
+        assert (scraper.calls, product_hunt.calls, telegram.calls) == (1, 1, 1)
+        assert first_post_overhead([5.0, 1.0, 2.0, 3.0]) == 3.0
+
+    async def test_opens_connections_only_right_before_the_run(self):
+        """Connections are left to the last moment, as pooled ones idle out before a run minutes away"""
+        # given
+        scraper, product_hunt, telegram = FakeWarmUpService(), FakeWarmUpService(), FakeWarmUpService()
+        warm_up = WarmUp(scraper, product_hunt, telegram, hosts=("localhost",), modules=())
+
+        # when
+        report = await warm_up.run()
+        connections_ahead = (product_hunt.calls, telegram.calls)
+        await warm_up.connect()
+
+        # then
+        assert connections_ahead == (0, 0)
+        assert (scraper.calls, product_hunt.calls, telegram.calls) == (1, 1, 1)
+        assert warm_up.last_report is report
+
+    async def test_reports_the_elapsed_time_of_concurrent_steps(self):
+        """Steps running side by side count once in the warm-up time, not once per step"""
+        # given
+        scraper, product_hunt, telegram = FakeWarmUpService(), FakeWarmUpService(delay=0.2), \
+            FakeWarmUpService(delay=0.2)
+        warm_up = WarmUp(scraper, product_hunt, telegram, hosts=("localhost",), modules=())
+
+        # when
+        await warm_up.run()
+        report = await warm_up.connect()
+
+        # then
+        assert report.step_seconds["product_hunt"] >= 0.2 and report.step_seconds["telegram"] >= 0.2
+        assert report.wall_seconds < 0.35
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from ai_product_research.services.domain_failures import DomainFailureStore, domain_of
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDomainFailureStore:
+    def test_blocks_longer_for_repeated_failures_and_decays(self):
+        """Each failure doubles the block, failures long ago count less"""
+        # given
+        clock = FakeClock()
+        store = DomainFailureStore(base_ttl=6 * HOUR, half_life=7 * DAY, clock=clock)
+
+        # when
+        first = store.record_failure("slow.example", "timeout", 30.0).blocked_until - clock.now
+        clock.now += 7 * HOUR
+        unblocked = store.blocked("slow.example")
+        second = store.record_failure("slow.example", "timeout", 40.0).blocked_until - clock.now
+        clock.now += 70 * DAY
+        decayed = store.record_failure("slow.example", "timeout", 50.0).blocked_until - clock.now
+
+        # then
+        assert first == 6 * HOUR
+        assert unblocked is None
+        assert 11 * HOUR < second < 12 * HOUR
+        assert 6 * HOUR <= decayed < 6.1 * HOUR
+        failure = store.blocked("slow.example", {"timeout"})
+        assert failure.failures == 3 and failure.average_seconds == 40.0
+        assert store.blocked("slow.example", {"network"}) is None
+
+    def test_persists_failures_and_forgets_domains_that_recover(self, tmp_path: Path):
+        """Failures survive a reload, a successful scrape unblocks the domain"""
+        # given
+        clock = FakeClock()
+        path = tmp_path / "domain_failures.json"
+        DomainFailureStore(path, clock=clock).record_failure(domain_of("https://www.bot-check.example/x"),
+                                                              "blocked", 5.0, "HTTP 403 bot check")
+
+        # when
+        store = DomainFailureStore.load(path, clock=clock)
+        blocked = store.blocked("bot-check.example")
+        store.record_success("bot-check.example")
+
+        # then
+        assert blocked.failure_class == "blocked" and blocked.message == "HTTP 403 bot check"
+        assert store.blocked("bot-check.example") is None
+        assert DomainFailureStore.load(path, clock=clock).failures == {}
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from ai_product_research.services.job_queue import SqliteJobQueue
+
+
+class TestSqliteJobQueue:
+    async def test_expired_lease_is_taken_over_by_another_worker(self, tmp_path: Path):
+        """A job leased by a dead worker becomes available again once its lease expires"""
+        # given
+        queue = SqliteJobQueue(tmp_path / "jobs.sqlite3", lease_seconds=0.0)
+        await queue.enqueue("run", [{"post": "a"}])
+        abandoned = await queue.lease("dead-worker")
+
+        # when
+        job = await queue.lease("live-worker")
+        await queue.complete(job, {"ok": True})
+
+        # then
+        assert abandoned.id == job.id
+        assert job.attempts == 2
+        assert [(result.status, result.result) for result in await queue.results("run")] == [("done", {"ok": True})]
+        assert await queue.lease("live-worker") is None
+
+    async def test_failed_job_is_retried_until_out_of_attempts(self, tmp_path: Path):
+        """Failed jobs return to the queue, then stay failed after max attempts"""
+        # given
+        queue = SqliteJobQueue(tmp_path / "jobs.sqlite3", max_attempts=2)
+        await queue.enqueue("run", [{"post": "a"}, {"post": "b"}])
+
+        # when
+        first = await queue.lease("worker")
+        await queue.fail(first, "boom")
+        retry = await queue.lease("worker")
+        await queue.fail(retry, "boom again")
+        await queue.cancel_pending("run")
+
+        # then
+        assert first.payload == retry.payload == {"post": "a"}
+        assert [(result.status, result.error) for result in await queue.results("run")] == [
+            ("failed", "boom again"),
+            ("cancelled", None),
+        ]
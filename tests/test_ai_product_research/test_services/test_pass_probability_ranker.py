@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from ai_product_research.domain import ProductHuntPost
+from ai_product_research.services.pass_probability_ranker import PassProbabilityRanker
+
+
+def make_post(post_id: str, tagline: str, topics: list[str], votes: int) -> ProductHuntPost:
+    return ProductHuntPost(
+        id=post_id,
+        name=f"Product {post_id}",
+        tagline=tagline,
+        description=tagline,
+        votesCount=votes,
+        url=f"https://www.producthunt.com/posts/{post_id}",
+        website=f"https://example.com/{post_id}",
+        topics=topics,
+    )
+
+
+class TestPassProbabilityRanker:
+    def test_ranks_likely_passes_above_more_voted_likely_fails(self, tmp_path: Path):
+        """Learned topic and keyword outcomes outweigh a moderate vote lead"""
+        # given
+        ranker = PassProbabilityRanker(tmp_path / "pass_history.json")
+        for i in range(10):
+            ranker.record(make_post(f"ai-{i}", "AI agent writes sales emails", ["Artificial Intelligence"], 100), True)
+            ranker.record(make_post(f"timer-{i}", "Minimal pomodoro timer", ["Productivity"], 100), False)
+        ranker.save()
+        loaded = PassProbabilityRanker.load(tmp_path / "pass_history.json")
+        timer = make_post("timer", "Beautiful pomodoro timer for your menu bar", ["Productivity"], 500)
+        agent = make_post("agent", "AI agent that books your meetings", ["Artificial Intelligence"], 300)
+
+        # when
+        ranked = loaded.rank([timer, agent])
+
+        # then
+        assert [post.id for post in ranked] == ["agent", "timer"]
+        assert loaded.pass_probability(agent) > 0.9
+        assert loaded.pass_probability(timer) < 0.1
+
+    def test_reports_average_processed_per_published(self):
+        """Run counters accumulate into an average of posts processed per published post"""
+        # given
+        ranker = PassProbabilityRanker()
+
+        # when
+        ranker.record_run(processed_posts=6, published_posts=3)
+        ranker.record_run(processed_posts=3, published_posts=3)
+
+        # then
+        assert ranker.average_processed_per_published() == 1.5
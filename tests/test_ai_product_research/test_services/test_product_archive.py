@@ -0,0 +1,88 @@
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem, FilterResult, ProductHuntPost, \
+    ProductResearchRecord
+from ai_product_research.services.product_archive import ProductArchive
+
+TOPICS = ["Artificial Intelligence", "Productivity", "Developer Tools", "Marketing", "Health & Fitness"]
+
+
+def make_record(day: date, i: int, rng: random.Random) -> ProductResearchRecord:
+    post = ProductHuntPost(
+        id=f"{day.isoformat()}-{i}",
+        name=f"Product {i}",
+        tagline=f"Tagline {i}",
+        description="An assistant for scheduling meetings" if i == 0 else f"Description {i}",
+        votesCount=rng.randint(1, 1000),
+        url=f"https://www.producthunt.com/posts/{day.isoformat()}-{i}",
+        website=f"https://example.com/{i}",
+        topics=[TOPICS[i % len(TOPICS)]],
+    )
+    analyzed = i % 4 != 3
+    product = AnalyzedProduct(
+        origin_url=post.url,
+        product_url=post.website,
+        name=post.name,
+        problem=BusinessProblem(
+            primary_customer="Founders",
+            core_job="Book meetings",
+            main_pain="Manual scheduling",
+            success_metric="Book more meetings",
+        ),
+    ) if analyzed else None
+    filter_result = FilterResult(passed=i % 2 == 0, reason="Uses AI" if i % 2 == 0 else "No AI") if analyzed else None
+    return ProductResearchRecord(
+        run_id=f"run-{day.isoformat()}",
+        target_date=day,
+        post=post,
+        product=product,
+        filter_result=filter_result,
+        published=i < 3,
+    )
+
+
+class TestProductArchive:
+    def test_round_trips_records_with_filters(self, tmp_path: Path):
+        """Archived records come back unchanged and combine date, pass, topic and text filters"""
+        # given
+        rng = random.Random(1)
+        archive = ProductArchive(tmp_path)
+        days = [date(2025, 1, 1) + timedelta(days=i) for i in range(3)]
+        records = [make_record(day, i, rng) for day in days for i in range(8)]
+        archive.append(records)
+
+        # when
+        everything = list(archive.query())
+        passed_ai = list(archive.query(start=days[1], passed=True, topic="artificial intelligence"))
+        scheduling = list(archive.query(end=days[0], text="SCHEDULING MEETINGS"))
+
+        # then
+        assert sorted(everything, key=lambda record: record.post.id) == sorted(records, key=lambda r: r.post.id)
+        assert {record.post.id for record in passed_ai} == {f"{day.isoformat()}-0" for day in days[1:]}
+        assert [record.post.id for record in scheduling] == ["2025-01-01-0"]
+
+    def test_scans_a_year_of_history_in_under_a_second(self, tmp_path: Path):
+        """Filtered queries over a year of daily partitions stream back in well under a second"""
+        # given
+        rng = random.Random(2)
+        archive = ProductArchive(tmp_path)
+        start = date(2025, 1, 1)
+        for offset in range(365):
+            day = start + timedelta(days=offset)
+            archive.append([make_record(day, i, rng) for i in range(20)])
+
+        # when
+        started = time.perf_counter()
+        passed = sum(batch.num_rows for batch in archive.scan(passed=True, columns=["post_id"]))
+        matches = list(archive.query(start=start, end=start + timedelta(days=364), text="scheduling meetings"))
+        elapsed = time.perf_counter() - started
+
+        print(f"\nProduct archive: scanned a year of history in {elapsed * 1000:.0f}ms")
+
+        # then
+        assert passed == 365 * 10
+        assert len(matches) == 365
+        assert elapsed < 1.0
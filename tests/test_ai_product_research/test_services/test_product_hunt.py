@@ -0,0 +1,192 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+
+import pytest
+
+from ai_product_research.services.product_hunt import ProductHuntApiError, ProductHuntService, \
+    ProductHuntSnapshotStore, RateLimitState
+
+RESPONSE = {
+    "data": {
+        "posts": {
+            "edges": [
+                {
+                    "node": {
+                        "id": "1",
+                        "name": "TimeTuna",
+                        "tagline": "Branded scheduling pages",
+                        "description": "Scheduling pages that look like your brand",
+                        "votesCount": 321,
+                        "url": "https://www.producthunt.com/posts/timetuna",
+                        "website": "https://www.producthunt.com/r/timetuna",
+                    }
+                }
+            ]
+        }
+    }
+}
+
+
+class TestProductHuntService:
+    async def test_serves_reruns_of_past_days_from_snapshot(self, tmp_path: Path):
+        """A past day is fetched once with only the requested fields and then served locally"""
+        # given
+        service = ProductHuntService("token", snapshot_store=ProductHuntSnapshotStore(tmp_path))
+        queries = []
+
+        async def execute_query(query: str, variables: dict) -> dict:
+            queries.append(query)
+            return RESPONSE
+
+        service._execute_query = execute_query
+        posted_after = datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+        # when
+        first = await service.get_posts(posted_after, posted_after + timedelta(days=1))
+        second = await service.get_posts(posted_after, posted_after + timedelta(days=1))
+
+        # then
+        assert first == second
+        assert first[0].name == "TimeTuna"
+        assert len(queries) == 1
+        assert "thumbnail" not in queries[0]
+        assert "topics" not in queries[0]
+
+    async def test_does_not_snapshot_open_time_range(self, tmp_path: Path):
+        """Posts of a day still in progress are always fetched from the API"""
+        # given
+        service = ProductHuntService("token", snapshot_store=ProductHuntSnapshotStore(tmp_path))
+        queries = []
+
+        async def execute_query(query: str, variables: dict) -> dict:
+            queries.append(query)
+            return RESPONSE
+
+        service._execute_query = execute_query
+        posted_after = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        # when
+        await service.get_posts(posted_after, posted_after + timedelta(days=1), fields=("topics",))
+        await service.get_posts(posted_after, posted_after + timedelta(days=1), fields=("topics",))
+
+        # then
+        assert len(queries) == 2
+        assert "topics" in queries[0]
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_gets_single_post_by_id(self):
+        """A post is looked up by ID, an unknown ID is None"""
+        # given
+        service = ProductHuntService("token")
+        node = RESPONSE["data"]["posts"]["edges"][0]["node"]
+        variables_seen = []
+
+        async def execute_query(query: str, variables: dict) -> dict:
+            variables_seen.append(variables)
+            return {"data": {"post": node if variables["id"] == "1" else None}}
+
+        service._execute_query = execute_query
+
+        # when
+        post = await service.get_post("1")
+        missing = await service.get_post("404")
+
+        # then
+        assert post.name == "TimeTuna" and post.website == node["website"]
+        assert missing is None
+        assert variables_seen == [{"id": "1"}, {"id": "404"}]
+
+
+def bulk_response(variables: dict) -> dict:
+    """Aliased response with one post named after the day of every window"""
+    days = [key.removeprefix("postedAfter") for key in variables if key.startswith("postedAfter")]
+    node = RESPONSE["data"]["posts"]["edges"][0]["node"]
+    return {"data": {
+        f"day{i}": {"edges": [{"node": {**node, "name": variables[f"postedAfter{i}"][:10]}}]} for i in days
+    }}
+
+
+class TestProductHuntServiceBulk:
+    async def test_fetches_month_in_few_aliased_requests_grouped_by_day(self, tmp_path: Path):
+        """Days are batched under the complexity limit and snapshots are shared with get_posts"""
+        # given
+        service = ProductHuntService("token", snapshot_store=ProductHuntSnapshotStore(tmp_path))
+        queries = []
+
+        async def execute_query(query: str, variables: dict) -> dict:
+            queries.append(query)
+            return bulk_response(variables)
+
+        service._execute_query = execute_query
+        start = datetime(2025, 11, 1, tzinfo=timezone.utc)
+        days = [start + timedelta(days=i) for i in range(30)]
+
+        # when
+        posts_by_day = await service.get_posts_bulk(days, limit=20, fields=("topics",))
+        single_day = await service.get_posts(days[10], days[11], fields=("topics",))
+
+        # then
+        assert list(posts_by_day) == [day.date() for day in days]
+        assert all(posts[0].name == day.strftime("%Y-%m-%d") for day, posts in zip(days, posts_by_day.values()))
+        # 221 estimated complexity per day with topics, 4 days per query and no query for the rerun
+        assert len(queries) == 8
+        assert "day3: posts(" in queries[0]
+        assert single_day == posts_by_day[days[10].date()]
+
+    async def test_splits_query_rejected_as_too_complex(self):
+        """A complexity error halves the batch until the API accepts it"""
+        # given
+        service = ProductHuntService("token")
+        batch_sizes = []
+
+        async def execute_query(query: str, variables: dict) -> dict:
+            batch_size = len([key for key in variables if key.startswith("postedAfter")])
+            batch_sizes.append(batch_size)
+            if batch_size > 2:
+                raise ProductHuntApiError([{"message": "Query has complexity of 1050, which exceeds max complexity"}])
+            return bulk_response(variables)
+
+        service._execute_query = execute_query
+        start = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+        # when
+        posts_by_day = await service.get_posts_bulk([start + timedelta(days=i) for i in range(4)], limit=5)
+
+        # then
+        assert len(posts_by_day) == 4
+        assert batch_sizes == [4, 2, 2]
+
+    async def test_raises_other_api_errors(self):
+        """Errors unrelated to complexity aren't retried"""
+        # given
+        service = ProductHuntService("token")
+
+        async def execute_query(query: str, variables: dict) -> dict:
+            raise ProductHuntApiError([{"message": "Invalid token"}])
+
+        service._execute_query = execute_query
+
+        # when / then
+        with pytest.raises(ProductHuntApiError):
+            await service.get_posts_bulk([datetime(2025, 11, 1, tzinfo=timezone.utc)])
+
+
+class TestRateLimitState:
+    def test_throttles_until_reset_when_remaining_is_low(self):
+        """The service waits for the window reset once remaining complexity drops below the floor"""
+        # given
+        state = RateLimitState()
+
+        # when
+        state.update(httpx.Headers({
+            "X-Rate-Limit-Limit": "6250",
+            "X-Rate-Limit-Remaining": "50",
+            "X-Rate-Limit-Reset": "120",
+        }))
+
+        # then
+        assert state.limit == 6250
+        assert 119 < state.wait_time(min_remaining=100) <= 120
+        assert state.wait_time(min_remaining=10) == 0
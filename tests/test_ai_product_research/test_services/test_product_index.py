@@ -0,0 +1,107 @@
+import random
+import time
+from pathlib import Path
+
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem, ProductHuntPost
+from ai_product_research.services.product_index import ProductEmbeddingIndex
+
+WORDS = (
+    "ai agent meeting scheduler video editor crm sales email outreach fitness coach budget finance "
+    "developer api gateway deploy monitor analytics dashboard design figma notes writing chat bot "
+    "voice transcription recruiting hiring invoice tax legal contract security password browser"
+).split()
+
+
+def make_post(post_id: str, name: str, tagline: str, description: str) -> ProductHuntPost:
+    return ProductHuntPost(
+        id=post_id,
+        name=name,
+        tagline=tagline,
+        description=description,
+        votesCount=100,
+        url=f"https://www.producthunt.com/posts/{post_id}",
+        website=f"https://example.com/{post_id}",
+    )
+
+
+def make_product(post: ProductHuntPost) -> AnalyzedProduct:
+    return AnalyzedProduct(
+        origin_url=post.url,
+        product_url=post.website,
+        name=post.name,
+        problem=BusinessProblem(
+            primary_customer="Founders",
+            core_job=post.tagline,
+            main_pain="Manual work",
+            success_metric="Save time",
+        ),
+    )
+
+
+def random_post(rng: random.Random, i: int) -> ProductHuntPost:
+    words = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+    return make_post(str(i), f"Product {i} {words(1)}", words(6), words(30))
+
+
+class TestProductEmbeddingIndex:
+    def test_finds_relaunch_of_analyzed_product(self, tmp_path: Path):
+        """A relaunch with the same pitch is a duplicate and survives a save/load round-trip"""
+        # given
+        original = make_post(
+            "1", "TimeTuna",
+            "Branded scheduling pages for founders",
+            "TimeTuna lets founders create beautiful branded booking pages and share them with prospects.",
+        )
+        relaunch = make_post(
+            "2", "TimeTuna 2.0",
+            "Branded scheduling pages for founders and teams",
+            "TimeTuna lets founders and teams create beautiful branded booking pages and share them with prospects.",
+        )
+        unrelated = make_post(
+            "3", "Ledgerly",
+            "Bookkeeping for freelancers",
+            "Automatically categorize expenses and prepare quarterly tax reports.",
+        )
+        index = ProductEmbeddingIndex(tmp_path, similarity_threshold=0.85)
+        index.add(original, make_product(original), passed=True)
+        index.save()
+
+        # when
+        loaded = ProductEmbeddingIndex.load(tmp_path, similarity_threshold=0.85)
+        duplicate = loaded.find_duplicate(relaunch)
+        not_duplicate = loaded.find_duplicate(unrelated)
+
+        # then
+        assert len(loaded) == 1
+        assert duplicate is not None
+        assert duplicate.entry.post_id == "1"
+        assert duplicate.entry.passed is True
+        assert not_duplicate is None
+
+    def test_benchmark_build_and_query(self):
+        """Benchmark index build and top-k query over a year-scale history of products"""
+        # given
+        rng = random.Random(42)
+        posts = [random_post(rng, i) for i in range(10_000)]
+        products = [make_product(post) for post in posts]
+        index = ProductEmbeddingIndex()
+
+        # when
+        started = time.perf_counter()
+        for post, product in zip(posts, products):
+            index.add(post, product)
+        build_seconds = time.perf_counter() - started
+
+        queries = 200
+        started = time.perf_counter()
+        for post in posts[:queries]:
+            matches = index.query(f"{post.name}\n{post.tagline}\n{post.description}", k=5)
+            assert matches[0].entry.post_id == post.id
+        query_ms = (time.perf_counter() - started) / queries * 1000
+
+        print(f"\nProduct index: build {len(index)} products in {build_seconds:.2f}s, "
+              f"query {query_ms:.2f}ms per top-5 lookup")
+
+        # then
+        assert build_seconds < 30
+        assert query_ms < 50
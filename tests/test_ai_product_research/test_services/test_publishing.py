@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem
+from ai_product_research.services import AnalyzedProductTelegramChannelService, MultiDestinationPublisher
+from ai_product_research.services.message_rendering import JsonRenderer, TelegramMarkdownRenderer
+from ai_product_research.services.publishing import FileDestination, PublishRoute, TelegramDestination
+from ai_product_research.soak.fakes import FakeTelegramServer
+
+
+def make_products(count: int) -> list[AnalyzedProduct]:
+    return [
+        AnalyzedProduct(
+            origin_url=f"https://www.producthunt.com/posts/product-{i}",
+            product_url=f"https://product-{i}.example.com",
+            name=f"Product {i}",
+            problem=BusinessProblem(
+                primary_customer="Sales teams",
+                core_job="Book meetings",
+                main_pain="Back-and-forth emails",
+                success_metric="More meetings booked",
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+class OnePerProductRenderer:
+    key = "one-per-product"
+
+    def render_products(self, products):
+        return [product.name for product in products]
+
+    def render_weekly_digest(self, digest):
+        return [digest.week]
+
+
+class FakeDestination:
+    """Destination taking ``delay`` seconds per message, failing them all if ``fail`` is set"""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.renderer = OnePerProductRenderer()
+        self.delay = delay
+        self.fail = fail
+        self.delivered: list[tuple[str, float]] = []
+
+    async def deliver(self, message):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("sink is down")
+        self.delivered.append((message, time.perf_counter()))
+
+
+class TestMultiDestinationPublisher:
+    async def test_renders_once_per_format_for_every_destination(self, tmp_path: Path, monkeypatch):
+        """Channels sharing a language share one rendering, other languages and the file sink get their own"""
+        # given
+        renders = []
+        render_telegram = TelegramMarkdownRenderer.render_products
+        render_json = JsonRenderer.render_products
+        monkeypatch.setattr(TelegramMarkdownRenderer, "render_products",
+                            lambda self, products: renders.append(self.key) or render_telegram(self, products))
+        monkeypatch.setattr(JsonRenderer, "render_products",
+                            lambda self, products: renders.append(self.key) or render_json(self, products))
+        telegram = FakeTelegramServer()
+        await telegram.start()
+        services = [
+            AnalyzedProductTelegramChannelService(channel, "token", api_url=telegram.url, language=language)
+            for channel, language in (("@en-1", "en"), ("@en-2", "en"), ("@fr", "fr"))
+        ]
+        sink = tmp_path / "published.jsonl"
+        publisher = MultiDestinationPublisher(
+            [PublishRoute(TelegramDestination(service)) for service in services]
+            + [PublishRoute(FileDestination(sink))]
+        )
+
+        # when
+        try:
+            await publisher.send_updates(make_products(3))
+        finally:
+            await publisher.close()
+            await telegram.stop()
+
+        # then
+        texts = dict(telegram.sent)
+        assert sorted(renders) == ["json", "telegram-markdown-v2:en:4096", "telegram-markdown-v2:fr:4096"]
+        assert texts["@en-1"] == texts["@en-2"]
+        assert "*Job to be Done:* Book meetings" in texts["@en-1"]
+        assert "*Tâche à accomplir:* Book meetings" in texts["@fr"]
+        assert "Back\\-and\\-forth emails" in texts["@fr"]
+        published = [json.loads(line) for line in sink.read_text(encoding="utf-8").splitlines()]
+        assert [product["name"] for product in published[0]["products"]] == ["Product 0", "Product 1", "Product 2"]
+        assert all(stats["sent"] == 1 and stats["failed"] == 0 for stats in publisher.metrics().values())
+
+    async def test_slow_and_failing_destinations_do_not_hold_back_others(self):
+        """A stuck sink runs out of its own time budget and a broken one is cut off, the fast one is unaffected"""
+        # given
+        fast = FakeDestination("fast")
+        slow = FakeDestination("slow", delay=10.0)
+        broken = FakeDestination("broken", fail=True)
+        publisher = MultiDestinationPublisher([
+            PublishRoute(fast),
+            PublishRoute(slow, timeout=0.3),
+            PublishRoute(broken, max_consecutive_failures=2),
+        ])
+
+        # when
+        started = time.perf_counter()
+        await publisher.send_updates(make_products(4))
+        elapsed = time.perf_counter() - started
+
+        # then
+        metrics = publisher.metrics()
+        assert [message for message, _ in fast.delivered] == ["Product 0", "Product 1", "Product 2", "Product 3"]
+        assert fast.delivered[-1][1] - started < 0.1
+        assert elapsed < 1.0
+        assert metrics["fast"] | {"last_seconds": None} == {
+            "publishes": 1, "sent": 4, "failed": 0, "skipped": 0, "timeouts": 0, "last_seconds": None,
+        }
+        assert (metrics["slow"]["timeouts"], metrics["slow"]["skipped"]) == (1, 4)
+        assert (metrics["broken"]["failed"], metrics["broken"]["skipped"]) == (2, 2)
+
+    async def test_paces_each_destination_on_its_own_rate(self):
+        """A rate limited destination spaces its messages while an unlimited one sends right away"""
+        # given
+        paced = FakeDestination("paced")
+        unlimited = FakeDestination("unlimited")
+        publisher = MultiDestinationPublisher([PublishRoute(paced, rate=20.0, burst=1), PublishRoute(unlimited)])
+
+        # when
+        started = time.perf_counter()
+        await publisher.send_updates(make_products(4))
+
+        # then
+        assert paced.delivered[-1][1] - started >= 0.14
+        assert unlimited.delivered[-1][1] - started < 0.05
@@ -0,0 +1,91 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem, FilterResult, ProductHuntPost, \
+    ProductResearchRecord
+from ai_product_research.services import AnalyzedProductTelegramChannelService
+from ai_product_research.services.trend_aggregates import TrendAggregator, customer_segments, week_key
+
+
+def make_record(day: date, i: int, votes: int, topic: str, passed: bool, customer: str) -> ProductResearchRecord:
+    post = ProductHuntPost(
+        id=f"{day}-{i}",
+        name=f"Product {i}",
+        tagline="tagline",
+        description="description",
+        votesCount=votes,
+        url=f"https://www.producthunt.com/posts/{day}-{i}",
+        website=f"https://example.com/{i}",
+        topics=[topic],
+    )
+    return ProductResearchRecord(
+        run_id="run",
+        target_date=day,
+        post=post,
+        product=AnalyzedProduct(
+            origin_url=post.url,
+            product_url=post.website,
+            name=post.name,
+            problem=BusinessProblem(primary_customer=customer, core_job="job", main_pain="pain", success_metric="m"),
+        ),
+        filter_result=FilterResult(passed=passed, reason=""),
+    )
+
+
+class TestTrendAggregator:
+    def test_builds_weekly_digest_incrementally_and_replaces_reruns(self, tmp_path: Path):
+        """Daily runs roll up into the week, and rerunning a day replaces its contribution"""
+        # given
+        monday = date(2025, 1, 6)
+        aggregator = TrendAggregator(tmp_path / "trends.json")
+        for offset in range(7):
+            day = monday + timedelta(days=offset)
+            aggregator.record_run(day, [
+                make_record(day, 0, 400, "Artificial Intelligence", True, "Developers and founders who ship fast"),
+                make_record(day, 1, 40, "Productivity", False, "Remote teams"),
+            ])
+        sunday = monday + timedelta(days=6)
+        aggregator.record_run(sunday, [
+            make_record(sunday, 0, 400, "Artificial Intelligence", True, "Developers"),
+        ])
+        aggregator.save()
+
+        # when
+        digest = TrendAggregator.load(tmp_path / "trends.json").weekly_digest(week_key(sunday))
+
+        # then
+        assert digest.week == "2025-W02"
+        assert digest.posts == 13
+        assert digest.passed == 7
+        assert digest.pass_rate == 7 / 13
+        assert [(topic.topic, topic.posts, topic.pass_rate) for topic in digest.top_topics] == [
+            ("Artificial Intelligence", 7, 1.0),
+            ("Productivity", 6, 0.0),
+        ]
+        assert digest.top_customers[0] == ("developers", 7)
+        assert digest.median_votes_bucket == "256-511"
+
+    def test_renders_digest_as_telegram_message(self):
+        """The digest renders into an escaped MarkdownV2 message"""
+        # given
+        day = date(2025, 1, 12)
+        aggregator = TrendAggregator()
+        aggregator.record_run(day, [make_record(day, 0, 120, "Developer Tools", True, "Software engineers")])
+        service = AnalyzedProductTelegramChannelService(channel_id="channel", telegram_bot_token="token")
+
+        # when
+        message = service._format_weekly_digest(aggregator.weekly_digest(week_key(day)))
+
+        # then
+        assert "2025\\-W02" in message
+        assert "Developer Tools: 1 posts, 100% passed" in message
+        assert "software engineers \\(1\\)" in message
+
+
+class TestCustomerSegments:
+    def test_splits_description_into_short_segments(self):
+        # when
+        segments = customer_segments("Content creators and social media marketers who produce short-form videos.")
+
+        # then
+        assert segments == ["content creators", "social media marketers"]
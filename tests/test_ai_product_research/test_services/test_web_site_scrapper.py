@@ -0,0 +1,390 @@
+import asyncio
+import base64
+import os
+import subprocess
+import sys
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import pytest
+
+from ai_product_research.admin.http import HttpRequest, HttpResponse, start_http_server
+from ai_product_research.domain import Screenshot
+from ai_product_research.services.domain_failures import DomainFailureStore
+from ai_product_research.services.web_site_scrapper import RetryableScrapeError, ScrapeFailedError, \
+    WebSiteScrapperService
+
+# Rough size of a compressed PNG row of a 1920px wide landing page
+PNG_BYTES_PER_ROW = 400
+
+# Prints how much a capture and encode of a 30,000px page raises the peak RSS of a fresh process
+RSS_SCRIPT = """
+import asyncio, os, resource, sys
+from pathlib import Path
+from ai_product_research.services.web_site_scrapper import WebSiteScrapperService
+
+class FakePage:
+    def __init__(self, page_height):
+        self.page_height = page_height
+
+    async def evaluate(self, expression):
+        return self.page_height
+
+    async def screenshot(self, path, full_page, clip, type):
+        data = os.urandom(clip["height"] * %(bytes_per_row)d)
+        Path(path).write_bytes(data)
+        return data
+
+def peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+async def capture(scraper, page_height):
+    with await scraper._capture(FakePage(page_height)) as screenshot:
+        data_url = screenshot.to_data_url()
+        del data_url
+
+async def main():
+    scraper = WebSiteScrapperService(max_page_height=%(max_page_height)d)
+    await capture(scraper, 1080)
+    before = peak_rss()
+    await capture(scraper, 30000)
+    print(peak_rss() - before)
+
+asyncio.run(main())
+"""
+
+
+def data_url_size(png_size: int) -> int:
+    return len(Screenshot.DATA_URL_PREFIX) + 4 * ((png_size + 2) // 3)
+
+
+class FakePage:
+    """Playwright page stand-in which writes a PNG-sized payload for the clipped height"""
+
+    def __init__(self, page_height: int):
+        self.page_height = page_height
+        self.clip = None
+
+    async def evaluate(self, expression: str) -> int:
+        return self.page_height
+
+    async def screenshot(self, path: str, full_page: bool, clip: dict, type: str) -> bytes:
+        self.clip = clip
+        data = os.urandom(clip["height"] * PNG_BYTES_PER_ROW)
+        Path(path).write_bytes(data)
+        return data
+
+
+class TestScreenshot:
+    def test_data_url_matches_standard_base64(self, tmp_path: Path):
+        """Incremental encoding must produce exactly the same data URL as a one-shot encode"""
+        # given
+        data = os.urandom(1_000_003)
+
+        # when
+        with Screenshot.from_bytes(data, directory=str(tmp_path)) as screenshot:
+            data_url = screenshot.to_data_url()
+            path = screenshot.path
+
+        # then
+        assert data_url == f"data:image/png;base64,{base64.standard_b64encode(data).decode('ascii')}"
+        assert not path.exists()
+
+
+class TestWebSiteScrapperService:
+    @pytest.mark.parametrize("page_height", [1080, 8000, 15000, 30000])
+    async def test_peak_memory_is_bounded_for_tall_pages(self, tmp_path: Path, page_height: int):
+        """
+        Capturing and encoding a page of any height must stay under a fixed memory ceiling.
+
+        Python heap allocations are traced with tracemalloc. The bytes Playwright hands back are
+        dropped before encoding, so the peak is the two copies encoding needs, the encoded buffer
+        and the returned string, at the maximum height whatever the height of the page.
+        """
+        # given
+        scraper = WebSiteScrapperService(max_page_height=8000, spool_dir=str(tmp_path))
+        page = FakePage(page_height)
+        ceiling = 2 * data_url_size(scraper.max_page_height * PNG_BYTES_PER_ROW) + 512 * 1024
+
+        # when
+        tracemalloc.start()
+        try:
+            screenshot = await scraper._capture(page)
+            with screenshot:
+                data_url = screenshot.to_data_url()
+                del data_url
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # then
+        assert page.clip["height"] == min(page_height, scraper.max_page_height)
+        assert peak < ceiling, f"Peak memory {peak} bytes exceeds ceiling {ceiling} bytes"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_peak_rss_of_a_tall_page_is_bounded(self):
+        """A 30,000px page raises the peak RSS of a fresh process by two encoded copies of the clipped page"""
+        # given
+        max_page_height = 8000
+        script = RSS_SCRIPT % {"bytes_per_row": PNG_BYTES_PER_ROW, "max_page_height": max_page_height}
+        ceiling = 2 * data_url_size(max_page_height * PNG_BYTES_PER_ROW) + 2 * 1024 * 1024
+
+        # when
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        growth = int(result.stdout)
+
+        # then
+        assert growth < ceiling, f"Peak RSS grew by {growth} bytes, over the ceiling of {ceiling} bytes"
+
+    async def test_captures_one_viewport_of_pages_without_a_height(self, tmp_path: Path):
+        """A page whose document reports no scroll height is captured at the viewport height"""
+        # given
+        scraper = WebSiteScrapperService(spool_dir=str(tmp_path))
+        page = FakePage(None)
+
+        # when
+        with await scraper._capture(page):
+            pass
+
+        # then
+        assert page.clip["height"] == 1080
+
+
+class TestWebSiteScrapperServiceRetries:
+    async def test_retries_retryable_failures_and_reports_per_host(self, tmp_path: Path):
+        """Transient failures are retried with backoff and counted per host"""
+        # given
+        scraper = WebSiteScrapperService(max_retries=2, backoff_base=0.001, rate_limit=1000)
+        attempts = []
+
+        async def scrape_once(url: str) -> Screenshot:
+            attempts.append(url)
+            if len(attempts) < 3:
+                raise RetryableScrapeError("HTTP 503")
+            return Screenshot.from_bytes(b"png", directory=str(tmp_path))
+
+        scraper._scrape_once = scrape_once
+
+        # when
+        screenshot = await scraper.scrape("https://flaky.example.com/")
+
+        # then
+        assert screenshot is not None
+        screenshot.close()
+        assert len(attempts) == 3
+        assert scraper.retry_report() == {"flaky.example.com": {"retries": 2, "failures": 0}}
+
+    async def test_gives_up_after_max_retries(self):
+        """A host that keeps failing is dropped after the configured number of retries"""
+        # given
+        scraper = WebSiteScrapperService(max_retries=1, backoff_base=0.001, rate_limit=1000)
+
+        async def scrape_once(url: str) -> Screenshot:
+            raise RetryableScrapeError("net::ERR_CONNECTION_RESET")
+
+        scraper._scrape_once = scrape_once
+
+        # when
+        screenshot = await scraper.scrape("https://down.example.com/")
+
+        # then
+        assert screenshot is None
+        assert scraper.retry_report() == {"down.example.com": {"retries": 1, "failures": 1}}
+
+    async def test_limits_concurrent_scrapes_per_host(self):
+        """Concurrent scrapes of the same host never exceed the per-host limit"""
+        # given
+        scraper = WebSiteScrapperService(per_host_concurrency=2, rate_limit=1000, rate_burst=100)
+        active: Counter[str] = Counter()
+        peak: Counter[str] = Counter()
+
+        async def scrape_once(url: str) -> None:
+            host = url.split("/")[2]
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+        scraper._scrape_once = scrape_once
+
+        # when
+        await asyncio.gather(*[
+            scraper.scrape(f"https://{host}/{i}")
+            for i in range(10)
+            for host in ("a.example.com", "b.example.com")
+        ])
+
+        # then
+        assert peak == {"a.example.com": 2, "b.example.com": 2}
+
+
+SERVER_RENDERED_PAGE = "<html><head><title>Invoicer</title><meta name='description' content='Invoices in seconds'>" \
+                       "</head><body><h1>Send invoices in seconds</h1>" + \
+                       "<p>Freelancers create, send and track invoices without spreadsheets.</p>" * 20 + "</body></html>"
+SPA_SHELL_PAGE = "<html><head><title>App</title><script src='/main.js'></script></head><body><div id='root'></div>" \
+                 "<noscript>You need to enable JavaScript to run this app.</noscript></body></html>"
+
+
+class TestWebSiteScrapperServiceFastPath:
+    async def test_server_rendered_pages_skip_the_browser_and_spa_shells_escalate(self, tmp_path: Path):
+        """Meaningful HTML is returned as text, SPA shells fall back to a browser screenshot"""
+        # given
+        pages = {"/ssr": SERVER_RENDERED_PAGE, "/spa": SPA_SHELL_PAGE}
+
+        async def handle(request: HttpRequest) -> HttpResponse:
+            return HttpResponse(200, pages[request.path].encode("utf-8"), {"Content-Type": "text/html"})
+
+        server = await start_http_server(handle, "127.0.0.1", 0)
+        base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        scraper = WebSiteScrapperService(rate_limit=1000, min_text_words=50)
+        browser_urls = []
+
+        async def scrape(url: str) -> Screenshot:
+            browser_urls.append(url)
+            return Screenshot.from_bytes(b"png", directory=str(tmp_path))
+
+        scraper.scrape = scrape
+
+        # when
+        try:
+            with await scraper.fetch(f"{base_url}/ssr") as ssr, await scraper.fetch(f"{base_url}/spa") as spa:
+                ssr_strategy, ssr_text = ssr.strategy, ssr.text
+                spa_strategy, spa_screenshot = spa.strategy, spa.screenshot
+        finally:
+            await scraper.close()
+            server.close()
+            await server.wait_closed()
+
+        # then
+        assert ssr_strategy == "http"
+        assert ssr_text.startswith("Title: Invoicer\n\nDescription: Invoices in seconds\n\nSend invoices in seconds")
+        assert "enable JavaScript" not in ssr_text
+        assert spa_strategy == "browser" and spa_screenshot is not None
+        assert browser_urls == [f"{base_url}/spa"]
+        report = scraper.fetch_report()
+        assert (report["http"], report["browser"], report["http_share"]) == (1, 1, 0.5)
+
+
+class TestWebSiteScrapperServiceFailureStore:
+    async def test_skips_domains_known_to_fail(self, tmp_path: Path):
+        """A bot check blocks the domain for the next fetch, a timed out domain isn't even requested"""
+        # given
+        requests = []
+
+        async def handle(request: HttpRequest) -> HttpResponse:
+            requests.append(request.path)
+            return HttpResponse(200, SPA_SHELL_PAGE.encode("utf-8"), {"Content-Type": "text/html"})
+
+        server = await start_http_server(handle, "127.0.0.1", 0)
+        base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        store = DomainFailureStore(tmp_path / "domain_failures.json")
+        scraper = WebSiteScrapperService(rate_limit=1000, failure_store=store)
+
+        async def bot_check(url: str) -> Screenshot:
+            raise ScrapeFailedError("HTTP 403 bot check", "blocked")
+
+        scraper._scrape_with_retries = bot_check
+
+        # when
+        try:
+            first = await scraper.fetch(f"{base_url}/a")
+            second = await scraper.fetch(f"{base_url}/b")
+            store.record_failure("127.0.0.1", "timeout", 30.0)
+            third = await scraper.fetch(f"{base_url}/c")
+        finally:
+            await scraper.close()
+            server.close()
+            await server.wait_closed()
+
+        # then
+        assert (first, second, third) == (None, None, None)
+        assert requests == ["/a", "/b"]
+        assert store.blocked("127.0.0.1", {"blocked"}).failures == 1
+        report = scraper.fetch_report()
+        assert report["failure_skips"] == 2
+        assert report["failure_seconds_avoided"] >= 30.0
+
+    async def test_records_failures_under_the_product_domain_not_the_redirect_link(self, tmp_path: Path):
+        """A slow site behind a Product Hunt link is blocked by its own domain, the next post's link still works"""
+        # given
+        def handle(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "www.producthunt.com":
+                return httpx.Response(302, headers={"Location": f"https://{request.url.path.split('/')[-1]}.example.com/"})
+            if request.url.host == "slow.example.com":
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(200, text=SERVER_RENDERED_PAGE, headers={"Content-Type": "text/html"})
+
+        store = DomainFailureStore(tmp_path / "domain_failures.json")
+        scraper = WebSiteScrapperService(rate_limit=1000, min_text_words=50, failure_store=store)
+        scraper._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handle), follow_redirects=True,
+                                                 event_hooks={"request": [scraper._check_domain]})
+
+        async def timeout(url: str) -> Screenshot:
+            raise ScrapeFailedError("Timeout 30000ms exceeded", "timeout")
+
+        scraper._scrape_with_retries = timeout
+
+        # when
+        try:
+            slow = await scraper.fetch("https://www.producthunt.com/r/slow")
+            fine = await scraper.fetch("https://www.producthunt.com/r/fine")
+            again = await scraper.fetch("https://www.producthunt.com/r/slow")
+        finally:
+            await scraper.close()
+
+        # then
+        assert slow is None and again is None
+        assert fine is not None and fine.strategy == "http"
+        assert store.blocked("slow.example.com") is not None
+        assert store.blocked("producthunt.com") is None
+        assert scraper.fetch_report()["failure_skips"] == 1
+
+    async def test_limits_and_counts_scrapes_by_the_product_host_behind_redirect_links(self):
+        """Product Hunt links to different products don't share one host limit or one retry counter"""
+        # given
+        def handle(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "www.producthunt.com":
+                host = request.url.path.split("/")[-1].split("-")[0]
+                return httpx.Response(302, headers={"Location": f"https://{host}.example.com{request.url.path}"})
+            return httpx.Response(200, text=SPA_SHELL_PAGE, headers={"Content-Type": "text/html"})
+
+        scraper = WebSiteScrapperService(per_host_concurrency=1, rate_limit=1000, rate_burst=100,
+                                         backoff_base=0.001)
+        scraper._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handle), follow_redirects=True)
+        active: Counter[str] = Counter()
+        peak: Counter[str] = Counter()
+        attempts: Counter[str] = Counter()
+
+        async def scrape_once(url: str) -> Screenshot:
+            host = url.split("/")[2]
+            attempts[url] += 1
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            peak["all"] = max(peak["all"], sum(active[name] for name in ("a.example.com", "b.example.com")))
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+            if attempts[url] == 1:
+                raise RetryableScrapeError("HTTP 503")
+            return Screenshot.from_bytes(b"png")
+
+        scraper._scrape_once = scrape_once
+
+        # when
+        try:
+            pages = await asyncio.gather(*[
+                scraper.fetch(f"https://www.producthunt.com/r/{host}-{i}") for i in range(3) for host in ("a", "b")
+            ])
+        finally:
+            await scraper.close()
+
+        # then
+        for page in pages:
+            page.close()
+        assert all(page.strategy == "browser" for page in pages)
+        assert (peak["a.example.com"], peak["b.example.com"], peak["all"]) == (1, 1, 2)
+        assert scraper.retry_report() == {
+            "a.example.com": {"retries": 3, "failures": 0},
+            "b.example.com": {"retries": 3, "failures": 0},
+        }
@@ -0,0 +1,65 @@
+from datetime import date, datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from ai_product_research.scheduler import DailyScheduler
+from ai_product_research.soak import GrowthLimit, SoakConfig, SoakHarness, check_growth
+from ai_product_research.soak.fakes import FakeClock
+from ai_product_research.soak.report import SoakSample
+from ai_product_research.soak.resources import ResourceSample
+
+
+def make_samples(rss_mib: list[float]) -> list[SoakSample]:
+    return [SoakSample(i, date(2025, 1, 1), 10, 0.1, ResourceSample(int(rss * 2 ** 20), 10, 0))
+            for i, rss in enumerate(rss_mib)]
+
+
+class TestSoakHarness:
+    async def test_scheduler_fast_forwards_one_run_per_day(self):
+        """Each run happens at 06:00 for the previous day"""
+        # given
+        tz = ZoneInfo("Europe/Paris")
+        clock = FakeClock(datetime(2025, 3, 1, 12, 0, tzinfo=tz))
+        runs = []
+
+        async def job(target_date: datetime) -> None:
+            runs.append((clock.now(tz).strftime("%d %H:%M"), target_date.date()))
+
+        scheduler = DailyScheduler(job, tz=tz, clock=clock.now, sleep=clock.sleep, poll_interval=24 * 3600.0)
+
+        # when
+        await scheduler.run(max_runs=3)
+
+        # then
+        assert runs == [("02 06:00", date(2025, 3, 1)), ("03 06:00", date(2025, 3, 2)), ("04 06:00", date(2025, 3, 3))]
+
+    def test_flags_only_steady_growth(self):
+        """Warm-up growth and noise pass, a steady upward trend fails"""
+        # given
+        limits = [GrowthLimit("rss_mib", 32.0)]
+        warming_up = make_samples([100, 150, 200] + [200 + (i % 3) for i in range(50)])
+        leaking = make_samples([100 + i for i in range(50)])
+
+        # when
+        warming_up_violations = check_growth(warming_up, limits)
+        leaking_violations = check_growth(leaking, limits)
+
+        # then
+        assert warming_up_violations == []
+        assert len(leaking_violations) == 1
+        assert leaking_violations[0].startswith("rss_mib grows by 100.00 per 100 runs")
+
+    async def test_writes_resource_series_for_every_simulated_day(self, tmp_path: Path):
+        """A short soak run against the local fakes records one sample per day"""
+        # given
+        harness = SoakHarness(SoakConfig(days=3, max_posts=20, pass_rate=0.2, scraper="http", output_dir=tmp_path))
+
+        # when
+        report = await harness.run()
+
+        # then
+        assert [sample.target_date for sample in report.samples] == [date(2024, 12, 31), date(2025, 1, 1),
+                                                                     date(2025, 1, 2)]
+        assert all(sample.resources.rss_bytes > 0 and sample.posts > 0 for sample in report.samples)
+        assert len(report.csv_path.read_text().splitlines()) == 4
+        assert report.chart_path.read_text().count("<polyline") == 4
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import logging
+import queue
+
+from ai_product_research.structured_logging import ContextFilter, JsonFormatter, NonBlockingQueueHandler, \
+    log_context, log_stage
+
+
+class ExpensivePayload:
+    def __init__(self):
+        self.reprs = 0
+
+    def __repr__(self) -> str:
+        self.reprs += 1
+        return "x" * 10_000
+
+
+def make_logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test_structured_logging.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+class TestStructuredLogging:
+    async def test_records_carry_context_of_their_task(self):
+        """Run, post and stage set around concurrent tasks end up on their own records"""
+        # given
+        log_queue = queue.Queue()
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(ContextFilter())
+        logger = make_logger(handler)
+
+        async def research(post_id: str) -> None:
+            with log_context(post_id=post_id), log_stage(logger, "scrape"):
+                await asyncio.sleep(0.01)
+
+        # when
+        with log_context(run_id="run-1"):
+            await asyncio.gather(research("a"), research("b"))
+
+        # then
+        entries = [json.loads(JsonFormatter().format(log_queue.get_nowait())) for _ in range(log_queue.qsize())]
+        assert sorted(entry["post_id"] for entry in entries) == ["a", "b"]
+        assert all(entry["run_id"] == "run-1" and entry["stage"] == "scrape" for entry in entries)
+        assert all(entry["duration"] >= 0.01 for entry in entries)
+
+    def test_truncates_messages_and_samples_payloads(self):
+        """Large messages are cut and payloads are only rendered for sampled records"""
+        # given
+        log_queue = queue.Queue()
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(ContextFilter(max_chars=100, payload_sample_rate=0.0))
+        logger = make_logger(handler)
+        payload = ExpensivePayload()
+
+        # when
+        logger.info("%s", "y" * 500, extra={"payload": payload})
+
+        # then
+        entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+        assert entry["message"].startswith("y" * 100)
+        assert entry["message"].endswith("[400 chars truncated]")
+        assert "payload" not in entry
+        assert payload.reprs == 0
+
+    def test_drops_records_instead_of_blocking_when_queue_is_full(self):
+        """A stalled writer costs records, never a blocked caller"""
+        # given
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+        logger = make_logger(handler)
+
+        # when
+        for i in range(5):
+            logger.info(f"message {i}")
+
+        # then
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_serializes_exception_with_the_record(self):
+        """Tracebacks are rendered before queueing and kept as a JSON field"""
+        # given
+        log_queue = queue.Queue()
+        logger = make_logger(NonBlockingQueueHandler(log_queue))
+
+        # when
+        try:
+            raise ValueError("broken page")
+        except ValueError:
+            logger.error("Scrape failed", exc_info=True)
+
+        # then
+        entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+        assert entry["message"] == "Scrape failed"
+        assert "ValueError: broken page" in entry["exception"]
+        assert entry["run_id"] is None
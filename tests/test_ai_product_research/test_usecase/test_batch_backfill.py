@@ -0,0 +1,47 @@
+from datetime import datetime
+from pathlib import Path
+
+from ai_product_research.agents import BatchLlmRunner, BusinessProblem, HedgedLlmInvoker, LocalFileBatchProvider, \
+    ProblemRetrieverAgent, ProductFilterAgent
+from ai_product_research.domain import FilterResult
+from ai_product_research.services import ProductArchive, TrendAggregator, WebSiteScrapperService
+from ai_product_research.soak.fakes import FakeChatModel, FakeProductHuntService, LocalSiteServer
+from ai_product_research.usecase import BatchBackfillUseCase, TelegramProductsResearchUseCase
+
+
+class TestBatchBackfillUseCase:
+    async def test_researches_days_with_two_batch_jobs(self, tmp_path: Path):
+        """Every post of the range is analyzed and filtered through one problem and one filter batch"""
+        # given
+        site = LocalSiteServer()
+        await site.start()
+        chat_model = FakeChatModel(pass_rate=0.3)
+        invoker = HedgedLlmInvoker()
+        scraper = WebSiteScrapperService(rate_limit=1000.0, rate_burst=100)
+        archive = ProductArchive(tmp_path / "archive")
+        use_case = TelegramProductsResearchUseCase(
+            product_hunt_service=FakeProductHuntService(site.url, max_posts=10),
+            problem_retriever_agent=ProblemRetrieverAgent(chat_model, invoker),
+            scraper_service=scraper,
+            analyzed_products_telegram_channel_service=None,
+            product_filter_agent=ProductFilterAgent(chat_model, invoker),
+            archive=archive,
+            trends=TrendAggregator(),
+        )
+        provider = LocalFileBatchProvider(tmp_path / "provider", chat_model, [BusinessProblem, FilterResult])
+        backfill = BatchBackfillUseCase(use_case, BatchLlmRunner(provider, tmp_path / "batches"))
+
+        # when
+        try:
+            report = await backfill.execute(datetime(2025, 3, 1), days=3)
+        finally:
+            await scraper.close()
+            await site.stop()
+
+        # then
+        assert report.posts > 0
+        assert report.analyzed == report.posts == report.pages["http"]
+        assert 0 < report.passed < report.posts
+        assert provider.submitted == 2
+        assert not report.errors
+        assert len(use_case.trends.days) == 3
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem, FilterResult, ProductHuntPost, \
+    ProductResearchRecord
+from ai_product_research.services import SqliteJobQueue
+from ai_product_research.usecase import DistributedResearchCoordinator, PostResearchWorker
+
+
+def make_post(name: str) -> ProductHuntPost:
+    return ProductHuntPost(
+        id=name,
+        name=name,
+        tagline=name,
+        description=name,
+        votesCount=10,
+        url=f"https://www.producthunt.com/posts/{name}",
+        website=f"https://example.com/{name}",
+    )
+
+
+class FakeResearchUseCase:
+    def __init__(self, posts: list[ProductHuntPost], passing: set[str]):
+        self.posts = posts
+        self.passing = passing
+        self.product_index = None
+        self.ranker = None
+        self.researched: list[str] = []
+        self.finished: list[ProductResearchRecord] = []
+
+    def start_run(self) -> str:
+        return "run"
+
+    async def fetch_posts(self, target_date: datetime) -> list[ProductHuntPost]:
+        return self.posts
+
+    async def publish_settled(self, records: list[ProductResearchRecord]) -> None:
+        pass
+
+    async def research_post(self, post: ProductHuntPost) -> tuple[AnalyzedProduct, FilterResult]:
+        self.researched.append(post.name)
+        await asyncio.sleep(0.05)
+        product = AnalyzedProduct(
+            origin_url=post.url,
+            product_url=post.website,
+            name=post.name,
+            problem=BusinessProblem(primary_customer="a", core_job="b", main_pain="c", success_metric="d"),
+        )
+        return product, FilterResult(passed=post.name in self.passing, reason="")
+
+    async def finish_run(self, target_date: datetime, records: list[ProductResearchRecord]) -> None:
+        self.finished = records
+
+
+class TestDistributedResearch:
+    async def test_workers_research_posts_until_enough_leading_posts_passed(self, tmp_path: Path):
+        """Records are gathered in ranked order and unneeded jobs are cancelled"""
+        # given
+        posts = [make_post(f"post-{i}") for i in range(10)]
+        use_case = FakeResearchUseCase(posts, passing={"post-0", "post-2", "post-3", "post-5"})
+        queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+        coordinator = DistributedResearchCoordinator(use_case, queue, poll_interval=0.01)
+        workers = [PostResearchWorker(use_case, queue, worker_id=f"worker-{i}", poll_interval=0.01) for i in range(2)]
+        worker_tasks = [asyncio.create_task(worker.run()) for worker in workers]
+
+        # when
+        try:
+            await coordinator.execute(datetime(2025, 1, 1))
+        finally:
+            for task in worker_tasks:
+                task.cancel()
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+
+        # then
+        assert [record.post.name for record in use_case.finished] == ["post-0", "post-1", "post-2", "post-3"]
+        assert [record.filter_result.passed for record in use_case.finished] == [True, False, True, True]
+        statuses = [result.status for result in await queue.results(use_case.finished[0].run_id)]
+        assert statuses[:4] == ["done"] * 4
+        assert "cancelled" in statuses
+        assert len(use_case.researched) < len(posts)
+        assert "pending" not in statuses
@@ -0,0 +1,59 @@
+from datetime import date
+
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem, FilterResult, ProductHuntPost, \
+    ProductResearchRecord
+from ai_product_research.usecase import select_products
+
+
+def make_record(name: str, votes: int, passed: bool | None) -> ProductResearchRecord:
+    post = ProductHuntPost(
+        id=name,
+        name=name,
+        tagline=name,
+        description=name,
+        votesCount=votes,
+        url=f"https://www.producthunt.com/posts/{name}",
+        website=f"https://example.com/{name}",
+    )
+    product = None
+    filter_result = None
+    if passed is not None:
+        product = AnalyzedProduct(
+            origin_url=post.url,
+            product_url=post.website,
+            name=name,
+            problem=BusinessProblem(primary_customer="a", core_job="b", main_pain="c", success_metric="d"),
+        )
+        filter_result = FilterResult(passed=passed, reason="")
+    return ProductResearchRecord(run_id="run", target_date=date(2025, 1, 1), post=post, product=product,
+                                 filter_result=filter_result)
+
+
+class TestSelectProducts:
+    def test_backfills_with_most_voted_analyzed_products_without_duplicates(self):
+        """Passed products come first, then the most voted analyzed ones that aren't selected yet"""
+        # given
+        records = [
+            make_record("top", 500, passed=True),
+            make_record("second", 400, passed=False),
+            make_record("broken", 450, passed=None),
+            make_record("third", 100, passed=False),
+            make_record("fourth", 300, passed=False),
+        ]
+
+        # when
+        selected = select_products(records, limit=3)
+
+        # then
+        assert [record.post.name for record in selected] == ["top", "second", "fourth"]
+
+    def test_keeps_only_limit_passed_products(self):
+        """Once enough products passed no backfill happens"""
+        # given
+        records = [make_record(f"p{i}", 100 - i, passed=True) for i in range(5)]
+
+        # when
+        selected = select_products(records, limit=3)
+
+        # then
+        assert [record.post.name for record in selected] == ["p0", "p1", "p2"]
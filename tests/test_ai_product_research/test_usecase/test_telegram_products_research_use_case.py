@@ -0,0 +1,280 @@
+import asyncio
+from datetime import datetime
+
+from langchain_core.messages import AIMessage
+
+from ai_product_research.agents import HedgedLlmInvoker, ProductFilterAgent
+from ai_product_research.deadlines import deadline_scope
+from ai_product_research.domain import AnalyzedProduct, BusinessProblem, FilterResult, ProductHuntPost, ScrapedPage
+from ai_product_research.usecase import TelegramProductsResearchUseCase
+
+
+def make_post(name: str, votes: int) -> ProductHuntPost:
+    return ProductHuntPost(
+        id=name,
+        name=name,
+        tagline=name,
+        description=name,
+        votesCount=votes,
+        url=f"https://www.producthunt.com/posts/{name}",
+        website=f"https://example.com/{name}",
+    )
+
+
+class FakeProductHuntService:
+    def __init__(self, posts: list[ProductHuntPost]):
+        self.posts = posts
+
+    async def get_posts(self, posted_after, posted_before, limit=20, fields=(), refresh=False):
+        return self.posts
+
+
+class FakeScraperService:
+    def retry_report(self) -> dict:
+        return {}
+
+    def fetch_report(self) -> dict:
+        return {}
+
+
+class FakeTelegramService:
+    """Records the products of every send and how many posts were researched by then"""
+
+    def __init__(self, researched: list[str]):
+        self.researched = researched
+        self.sends: list[tuple[list[str], int]] = []
+
+    async def send_updates(self, products: list[AnalyzedProduct]) -> None:
+        self.sends.append(([product.name for product in products], len(self.researched)))
+
+
+class FakeRanker:
+    def __init__(self):
+        self.runs: list[tuple[int, int]] = []
+
+    def rank(self, posts: list[ProductHuntPost]) -> list[ProductHuntPost]:
+        return posts
+
+    def record(self, post: ProductHuntPost, passed: bool) -> None:
+        pass
+
+    def record_run(self, processed_posts: int, published_posts: int) -> None:
+        self.runs.append((processed_posts, published_posts))
+
+    def save(self) -> None:
+        pass
+
+
+class FakeResearchUseCase(TelegramProductsResearchUseCase):
+    passing: set[str] = set()
+    researched: list[str] = []
+
+    async def research_post(self, post: ProductHuntPost) -> tuple[AnalyzedProduct, FilterResult]:
+        self.researched.append(post.name)
+        product = AnalyzedProduct(
+            origin_url=post.url,
+            product_url=post.website,
+            name=post.name,
+            problem=BusinessProblem(primary_customer="a", core_job="b", main_pain="c", success_metric="d"),
+        )
+        return product, FilterResult(passed=post.name in self.passing, reason="")
+
+
+def make_use_case(posts: list[ProductHuntPost], passing: set[str], publish_mode: str,
+                  use_case_class: type[FakeResearchUseCase] = FakeResearchUseCase,
+                  **kwargs) -> tuple[FakeResearchUseCase, FakeTelegramService]:
+    researched: list[str] = []
+    telegram = FakeTelegramService(researched)
+    use_case = use_case_class(
+        product_hunt_service=FakeProductHuntService(posts),
+        problem_retriever_agent=None,
+        scraper_service=FakeScraperService(),
+        analyzed_products_telegram_channel_service=telegram,
+        product_filter_agent=None,
+        publish_mode=publish_mode,
+        **kwargs,
+    )
+    use_case.passing = passing
+    use_case.researched = researched
+    return use_case, telegram
+
+
+class TestTelegramProductsResearchUseCasePublishing:
+    async def test_streams_passed_products_as_soon_as_they_settle(self):
+        """Each passed product is sent right after its research, nothing is left for the end"""
+        # given
+        posts = [make_post(f"post-{i}", votes=100 - i) for i in range(6)]
+        use_case, telegram = make_use_case(posts, {"post-1", "post-3", "post-4"}, publish_mode="stream")
+
+        # when
+        await use_case.execute(datetime(2025, 1, 1))
+
+        # then
+        assert telegram.sends == [(["post-1"], 2), (["post-3"], 4), (["post-4"], 5)]
+        assert use_case.first_message_seconds is not None
+
+    async def test_counts_streamed_products_as_published(self):
+        """The ranker's published count includes the products streamed during the run"""
+        # given
+        posts = [make_post(f"post-{i}", votes=100 - i) for i in range(6)]
+        ranker = FakeRanker()
+        use_case, telegram = make_use_case(posts, {"post-1", "post-3", "post-4"}, publish_mode="stream",
+                                           ranker=ranker)
+
+        # when
+        await use_case.execute(datetime(2025, 1, 1))
+
+        # then
+        assert ranker.runs == [(5, 3)]
+
+    async def test_backfills_top_voted_products_in_one_batch_at_the_end(self):
+        """Backfilled products depend on the whole run, they follow the streamed ones together"""
+        # given
+        posts = [make_post("low", 10), make_post("passed", 20), make_post("top", 300), make_post("second", 200)]
+        use_case, telegram = make_use_case(posts, {"passed"}, publish_mode="stream")
+
+        # when
+        await use_case.execute(datetime(2025, 1, 1))
+
+        # then
+        assert telegram.sends == [(["passed"], 2), (["top", "second"], 4)]
+
+    async def test_batch_mode_sends_selection_once_at_the_end(self):
+        """Without streaming the whole selection goes out after the last post"""
+        # given
+        posts = [make_post(f"post-{i}", votes=100 - i) for i in range(6)]
+        use_case, telegram = make_use_case(posts, {"post-1", "post-3", "post-4"}, publish_mode="batch")
+
+        # when
+        await use_case.execute(datetime(2025, 1, 1))
+
+        # then
+        assert telegram.sends == [(["post-1", "post-3", "post-4"], 5)]
+
+
+class FakeUnreachableScraperService(FakeScraperService):
+    async def fetch(self, url: str) -> None:
+        return None
+
+
+class FakeProblemRetrieverAgent:
+    def __init__(self):
+        self.texts: list[str] = []
+
+    async def retrieve_problem_from_text(self, page_text: str) -> BusinessProblem:
+        self.texts.append(page_text)
+        return BusinessProblem(primary_customer="a", core_job="b", main_pain="c", success_metric="d")
+
+
+class TestTelegramProductsResearchUseCaseMetadataFallback:
+    async def test_analyzes_product_hunt_texts_when_the_website_fails(self):
+        """A post whose website can't be fetched is analyzed from its listing instead of being dropped"""
+        # given
+        agent = FakeProblemRetrieverAgent()
+        post = make_post("invoicer", 10).model_copy(update={"tagline": "Invoices in seconds", "topics": ["Fintech"]})
+        use_case = TelegramProductsResearchUseCase(
+            product_hunt_service=FakeProductHuntService([]),
+            problem_retriever_agent=agent,
+            scraper_service=FakeUnreachableScraperService(),
+            analyzed_products_telegram_channel_service=None,
+            product_filter_agent=None,
+            metadata_fallback=True,
+        )
+
+        # when
+        product = await use_case.analyze_post(post)
+        use_case.metadata_fallback = False
+        skipped = await use_case.analyze_post(post)
+
+        # then
+        assert product.name == "invoicer" and product.problem.core_job == "b"
+        assert agent.texts == ["Title: invoicer\n\nDescription: Invoices in seconds\n\ninvoicer\n\nTopics: Fintech"]
+        assert skipped is None
+
+
+class SlowResearchUseCase(FakeResearchUseCase):
+    async def research_post(self, post: ProductHuntPost) -> tuple[AnalyzedProduct, FilterResult]:
+        await asyncio.sleep(0.05)
+        return await super().research_post(post)
+
+
+class StuckPostUseCase(TelegramProductsResearchUseCase):
+    async def _research_post(self, post: ProductHuntPost) -> tuple[AnalyzedProduct, FilterResult]:
+        await asyncio.sleep(10.0)
+        raise AssertionError("unreachable")
+
+
+class TestTelegramProductsResearchUseCaseDeadlines:
+    async def test_publishes_what_is_ready_when_the_run_deadline_passes(self):
+        """Research stops before the deadline's publish reserve and the passed products still go out"""
+        # given
+        posts = [make_post(f"post-{i}", votes=100 - i) for i in range(10)]
+        use_case, telegram = make_use_case(posts, {"post-0", "post-8"}, publish_mode="batch",
+                                           use_case_class=SlowResearchUseCase, publish_reserve_seconds=0.1)
+
+        # when
+        with deadline_scope(0.22):
+            await use_case.execute(datetime(2025, 1, 1))
+
+        # then
+        assert 1 <= len(use_case.researched) <= 3
+        assert telegram.sends[0][0][0] == "post-0"
+
+    async def test_post_out_of_time_is_left_without_product(self):
+        """A post exceeding its own deadline is given up, the run goes on"""
+        # given
+        use_case = StuckPostUseCase(
+            product_hunt_service=FakeProductHuntService([]),
+            problem_retriever_agent=None,
+            scraper_service=FakeScraperService(),
+            analyzed_products_telegram_channel_service=None,
+            product_filter_agent=None,
+            post_deadline_seconds=0.05,
+        )
+
+        # when
+        result = await use_case.research_post(make_post("stuck", 10))
+
+        # then
+        assert result == (None, None)
+
+
+class FakeTextScraperService(FakeScraperService):
+    async def fetch(self, url: str) -> ScrapedPage:
+        return ScrapedPage(url=url, strategy="http", text=f"Website of {url.rsplit('/', 1)[-1]}")
+
+
+class SlowFilterChatModel:
+    """Passes every product, taking a second to answer about the slow one"""
+
+    def with_structured_output(self, schema, method=None, include_raw=False):
+        return self
+
+    async def ainvoke(self, messages):
+        if "slow" in str(messages[-1].content):
+            await asyncio.sleep(1.0)
+        return {"raw": AIMessage(content=""), "parsed": FilterResult(passed=True, reason="Uses AI"),
+                "parsing_error": None}
+
+
+class TestTelegramProductsResearchUseCaseFilterFailures:
+    async def test_filter_call_timing_out_drops_only_its_post(self):
+        """A filter call past the invoker deadline leaves its post without product and the rest get published"""
+        # given
+        posts = [make_post("fast-1", 30), make_post("slow", 20), make_post("fast-2", 10)]
+        telegram = FakeTelegramService([])
+        use_case = TelegramProductsResearchUseCase(
+            product_hunt_service=FakeProductHuntService(posts),
+            problem_retriever_agent=FakeProblemRetrieverAgent(),
+            scraper_service=FakeTextScraperService(),
+            analyzed_products_telegram_channel_service=telegram,
+            product_filter_agent=ProductFilterAgent(SlowFilterChatModel(), HedgedLlmInvoker(deadline=0.2)),
+            post_deadline_seconds=300.0,
+        )
+
+        # when
+        await use_case.execute(datetime(2025, 1, 1))
+
+        # then
+        assert telegram.sends == [(["fast-1", "fast-2"], 0)]
+        assert len(use_case.post_seconds) == 3